@@ -1,21 +1,20 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit,
-    QTableWidget, QTableWidgetItem, QHeaderView, QStackedLayout, QDialog,
+    QTableWidget, QTableWidgetItem, QTableView, QHeaderView, QStackedLayout, QDialog,
     QFormLayout, QComboBox, QMessageBox, QTabWidget, QSplitter
 )
-from PyQt6.QtGui import QFont, QPixmap
-from PyQt6.QtCore import Qt
-from OwlReg.image_helper import load_pixmap  # Fixed import path
-import sqlite3
-import os
+from PyQt6.QtGui import QFont
+from PyQt6.QtCore import Qt, QTimer, QThreadPool
+from OwlReg.image_helper import load_scaled_pixmap  # Fixed import path
 import threading
+from functools import partial
+from sqlite_db import get_connection, get_dashboard_metrics, get_registration_trend, REGISTRATION_TREND_DAYS, query_students, STAFF_LIST_SQL  # Shared SQLite connection and queries
+from student_table_model import StudentTableModel, DeleteButtonDelegate, SEARCH_DEBOUNCE_MS
+from theme import set_role
+import db_manager
 
-# For the chart
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-
-# Get database path
-DB_FILE = os.path.join(os.path.dirname(__file__), "student_records.db")
+# For the charts
+from charts import StrandBarChart, RegistrationTrendChart
 
 # Import MySQL synchronization if available
 try:
@@ -83,7 +82,7 @@ class StaffDialog(QDialog):
     def load_staff_data(self):
         """Load staff data from database when editing"""
         try:
-            conn = sqlite3.connect(DB_FILE)
+            conn = get_connection()
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM staff WHERE staff_id = ?", (self.staff_id,))
             staff = cursor.fetchone()
@@ -108,7 +107,6 @@ class StaffDialog(QDialog):
                 # Set admin status
                 self.is_admin_field.setCurrentIndex(1 if staff[8] else 0)
 
-            conn.close()
         except Exception as e:
             print(f"Error loading staff data: {e}")
 
@@ -137,7 +135,7 @@ class StaffDialog(QDialog):
             # Import the password hashing function
             from password_utils import hash_password
 
-            conn = sqlite3.connect(DB_FILE)
+            conn = get_connection()
             cursor = conn.cursor()
 
             # Check if username exists (for new staff)
@@ -145,7 +143,6 @@ class StaffDialog(QDialog):
                 cursor.execute("SELECT COUNT(*) FROM staff WHERE username = ?", (username,))
                 if cursor.fetchone()[0] > 0:
                     QMessageBox.warning(self, "Validation Error", f"Username '{username}' already exists.")
-                    conn.close()
                     return
 
             # Variable to store staff ID for MySQL sync
@@ -190,7 +187,6 @@ class StaffDialog(QDialog):
 
             # Commit changes
             conn.commit()
-            conn.close()
 
             # Sync to MySQL in background thread if available
             if MYSQL_AVAILABLE and staff_id:
@@ -204,6 +200,7 @@ class StaffDialog(QDialog):
             self.accept()  # Close dialog with success
 
         except Exception as e:
+            get_connection().rollback()  # Don't leave a half-finished write on the shared connection
             QMessageBox.critical(self, "Database Error", f"Failed to save staff: {e}")
             print(f"Error saving staff: {e}")
 
@@ -225,7 +222,7 @@ class AdminDashboard(QWidget):
         super().__init__()
         self.setWindowTitle("OwlReg Admin Dashboard")
         self.setMinimumSize(1000, 700)
-        self.setStyleSheet("background-color: white; font-family: Arial;")
+        set_role(self, "dashboard-window")
 
         main_layout = QHBoxLayout()
         self.setLayout(main_layout)
@@ -235,72 +232,43 @@ class AdminDashboard(QWidget):
         sidebar.setContentsMargins(20, 20, 20, 20)
         sidebar.setSpacing(30)
 
-        sidebar_bg_color = "#F5F5F5"  # match this color with logo/title
-
         # Logo with background
         logo_label = QLabel()
-        pixmap = load_pixmap("owl_logo3.png")
-        logo_label.setPixmap(
-            pixmap.scaled(80, 80, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        )
+        logo_label.setPixmap(load_scaled_pixmap("owl_logo3.png", 80, 80))
         logo_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        logo_label.setStyleSheet(f"background-color: {sidebar_bg_color}; border-radius: 40px;")
+        set_role(logo_label, "sidebar-badge")
         sidebar.addWidget(logo_label)
 
         # Title with background
         title = QLabel("OwlReg.Admin")
         title.setFont(QFont("Arial", 16, QFont.Weight.Bold))
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        title.setStyleSheet(f"background-color: {sidebar_bg_color}; color: black; padding: 5px; border-radius: 5px;")
+        set_role(title, "sidebar-title")
         sidebar.addWidget(title)
         sidebar.addSpacing(40)
 
         # Menu buttons
-        button_style = """
-            QPushButton {
-                background-color: transparent;
-                border: none;
-                text-align: left;
-                padding: 10px;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                color: #2356c5;
-                font-weight: bold;
-            }
-        """
-
         self.dashboard_button = QPushButton("Dashboard")
-        self.dashboard_button.setStyleSheet(button_style)
+        set_role(self.dashboard_button, "dashboard-link")
         sidebar.addWidget(self.dashboard_button)
 
         self.list_button = QPushButton("Student List")
-        self.list_button.setStyleSheet(button_style)
+        set_role(self.list_button, "dashboard-link")
         sidebar.addWidget(self.list_button)
 
         self.staff_button = QPushButton("Staff Management")
-        self.staff_button.setStyleSheet(button_style)
+        set_role(self.staff_button, "dashboard-link")
         sidebar.addWidget(self.staff_button)
 
         self.feedback_button = QPushButton("Feedbacks")
-        self.feedback_button.setStyleSheet(button_style)
+        set_role(self.feedback_button, "dashboard-link")
         sidebar.addWidget(self.feedback_button)
 
         sidebar.addStretch()
 
         # Logout button
         logout_button = QPushButton("Logout")
-        logout_button.setStyleSheet("""
-            QPushButton {
-                background-color: #f0f0f0;
-                border-radius: 5px;
-                padding: 8px;
-                color: #555;
-            }
-            QPushButton:hover {
-                background-color: #e0e0e0;
-            }
-        """)
+        set_role(logout_button, "logout-button")
         logout_button.clicked.connect(self.logout)
         sidebar.addWidget(logout_button)
 
@@ -333,17 +301,14 @@ class AdminDashboard(QWidget):
             ("Transferee Students", "0", "+0%")
         ]:
             card = QWidget()
-            card.setStyleSheet("""
-                background-color: #f9f9f9;
-                border-radius: 10px;
-            """)
+            set_role(card, "metric-card")
             card_layout = QVBoxLayout()
             card_layout.addWidget(QLabel(title_text))
             value_label = QLabel(value_text)
             value_label.setFont(QFont("Arial", 20, QFont.Weight.Bold))
             card_layout.addWidget(value_label)
             change_label = QLabel(change_text)
-            change_label.setStyleSheet("color: gray; font-size: 12px;")
+            set_role(change_label, "metric-change")
             card_layout.addWidget(change_label)
             card.setLayout(card_layout)
             cards_layout.addWidget(card)
@@ -353,19 +318,22 @@ class AdminDashboard(QWidget):
 
         dash_layout.addLayout(cards_layout)
 
-        # ---------------- Bar Chart ---------------- #
-        chart_container = QWidget()
-        chart_layout = QVBoxLayout(chart_container)
-
-        chart_title = QLabel("Students per Strand")
-        chart_title.setFont(QFont("Arial", 16, QFont.Weight.Bold))
-        chart_layout.addWidget(chart_title)
+        # ---------------- Charts ---------------- #
+        charts_layout = QHBoxLayout()
+        self.strand_chart = StrandBarChart()
+        self.trend_chart = RegistrationTrendChart()
+        for title_text, chart in (("Students per Strand", self.strand_chart),
+                                  (f"Registrations (Last {REGISTRATION_TREND_DAYS} Days)", self.trend_chart)):
+            chart_container = QWidget()
+            chart_layout = QVBoxLayout(chart_container)
 
-        self.figure = Figure(figsize=(5, 3))
-        self.canvas = FigureCanvas(self.figure)
-        chart_layout.addWidget(self.canvas)
+            chart_title = QLabel(title_text)
+            chart_title.setFont(QFont("Arial", 16, QFont.Weight.Bold))
+            chart_layout.addWidget(chart_title)
+            chart_layout.addWidget(chart)
+            charts_layout.addWidget(chart_container)
 
-        dash_layout.addWidget(chart_container)
+        dash_layout.addLayout(charts_layout)
 
         # --- Student list page ---
         self.table_page = QWidget()
@@ -381,17 +349,7 @@ class AdminDashboard(QWidget):
 
         # Add refresh button
         refresh_btn = QPushButton("Refresh")
-        refresh_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4bb3fd;
-                color: white;
-                border-radius: 5px;
-                padding: 8px 15px;
-            }
-            QPushButton:hover {
-                background-color: #2356c5;
-            }
-        """)
+        set_role(refresh_btn, "action-button")
         refresh_btn.clicked.connect(self.load_student_data)
         table_header.addWidget(refresh_btn)
 
@@ -400,8 +358,13 @@ class AdminDashboard(QWidget):
         # Search and filter
         search_layout = QHBoxLayout()
         search_field = QLineEdit()
-        search_field.setPlaceholderText("Search students...")
-        search_field.textChanged.connect(self.filter_students)
+        search_field.setPlaceholderText("Search by name, reference code, LRN or address...")
+        # Search once typing pauses rather than on every keystroke
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.filter_students)
+        search_field.textChanged.connect(self.search_timer.start)
         search_layout.addWidget(search_field)
 
         strand_filter = QComboBox()
@@ -414,16 +377,30 @@ class AdminDashboard(QWidget):
 
         table_layout.addLayout(search_layout)
 
-        # Student table
-        self.student_table = QTableWidget()
-        self.student_table.setColumnCount(5)
-        self.student_table.setHorizontalHeaderLabels([
-            "Student No.", "Student Full Name", "Entry Status", "Strand", "Registration Date"
-        ])
+        # Student table - a model/view table that loads students as it scrolls
+        self.student_model = StudentTableModel(query_students, show_actions=True,
+                                               thread_pool=QThreadPool.globalInstance())
+        self.student_table = QTableView()
+        self.student_table.setModel(self.student_model)
         self.student_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.student_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.student_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.student_table.verticalHeader().setDefaultSectionSize(36)
+        self.student_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.student_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.student_table.setAlternatingRowColors(True)
+        # Clicking a header re-queries in that order instead of sorting loaded rows
+        self.student_table.horizontalHeader().setSortIndicator(
+            StudentTableModel.DEFAULT_SORT_COLUMN, Qt.SortOrder.DescendingOrder
+        )
+        self.student_table.setSortingEnabled(True)
+        self.student_table.horizontalHeader().sortIndicatorChanged.connect(
+            lambda *_: self.student_table.horizontalHeader().setSortIndicatorShown(True)
+        )
+        self.student_table.setMouseTracking(True)  # Hover colour on the delete buttons
+
+        # Delete buttons are painted by a delegate rather than a widget per row
+        self.delete_delegate = DeleteButtonDelegate(self.student_table)
+        self.delete_delegate.delete_clicked.connect(self.delete_student)
+        self.student_table.setItemDelegateForColumn(5, self.delete_delegate)
         table_layout.addWidget(self.student_table)
 
         # --- Staff management page ---
@@ -440,17 +417,7 @@ class AdminDashboard(QWidget):
 
         # Add staff button
         add_staff_btn = QPushButton("Add New Staff")
-        add_staff_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4bb3fd;
-                color: white;
-                border-radius: 5px;
-                padding: 8px 15px;
-            }
-            QPushButton:hover {
-                background-color: #2356c5;
-            }
-        """)
+        set_role(add_staff_btn, "action-button")
         add_staff_btn.clicked.connect(self.add_staff)
         staff_header.addWidget(add_staff_btn)
 
@@ -496,141 +463,31 @@ class AdminDashboard(QWidget):
             self.load_staff_data()
 
     def load_student_data(self):
-        """Load student data from database"""
-        try:
-            conn = sqlite3.connect(DB_FILE)
-            cursor = conn.cursor()
-
-            # Get student data with fields needed for the list
-            cursor.execute("""
-                SELECT student_id, first_name, middle_name, last_name, extension,
-                       enrollment_type, strand, registration_date
-                FROM students
-                ORDER BY registration_date DESC
-            """)
-
-            students = cursor.fetchall()
-            conn.close()
-
-            # Store the full student data for filtering
-            self.all_students = students
-
-            # Display the data
-            self.populate_student_table(students)
-
-        except Exception as e:
-            print(f"Error loading student data: {e}")
-            QMessageBox.critical(self, "Database Error", f"Failed to load student data: {e}")
-
-    def populate_student_table(self, students):
-        """Populate the student table with data"""
-        self.student_table.setRowCount(0)
-
-        # Update column count to include Actions column
-        self.student_table.setColumnCount(6)  # Added one more column for actions
-        self.student_table.setHorizontalHeaderLabels([
-            "Student No.", "Student Full Name", "Entry Status", "Strand", "Registration Date", "Actions"
-        ])
-
-        for student in students:
-            row_position = self.student_table.rowCount()
-            self.student_table.insertRow(row_position)
-
-            # Store student_id in the first item for reference
-            student_id = student[0]
-
-            # Student ID
-            student_id_item = QTableWidgetItem(f"ST-{student_id:04d}")
-            student_id_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.student_table.setItem(row_position, 0, student_id_item)
-
-            # Full Name
-            middle_initial = f" {student[2][0]}." if student[2] else ""
-            extension = f" {student[4]}" if student[4] else ""
-            full_name = f"{student[1]}{middle_initial} {student[3]}{extension}"
-            name_item = QTableWidgetItem(full_name)
-            self.student_table.setItem(row_position, 1, name_item)
-
-            # Entry Status
-            entry_status = student[5] or "Freshmen"  # Default to Freshmen
-            status_item = QTableWidgetItem(entry_status)
-            status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.student_table.setItem(row_position, 2, status_item)
-
-            # Strand
-            strand_item = QTableWidgetItem(student[6] or "N/A")
-            strand_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.student_table.setItem(row_position, 3, strand_item)
-
-            # Registration Date
-            reg_date_item = QTableWidgetItem(student[7][:10] if student[7] else "N/A")
-            reg_date_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.student_table.setItem(row_position, 4, reg_date_item)
-
-            # Actions column with Delete button
-            action_layout = QHBoxLayout()
-            action_layout.setContentsMargins(4, 4, 4, 4)
-            action_layout.setSpacing(4)
-            action_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-            delete_btn = QPushButton("Delete")
-            delete_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #ff6b6b;
-                    color: white;
-                    border-radius: 3px;
-                    padding: 5px 10px;
-                    font-size: 12px;
-                }
-                QPushButton:hover {
-                    background-color: #e53e3e;
-                }
-            """)
-            delete_btn.clicked.connect(lambda _, s_id=student_id: self.delete_student(s_id))
-
-            action_layout.addWidget(delete_btn)
-
-            action_widget = QWidget()
-            action_widget.setLayout(action_layout)
-
-            self.student_table.setCellWidget(row_position, 5, action_widget)
+        """Reload the student list from the database, keeping the current filters"""
+        self.filter_students()
 
     def filter_students(self):
-        """Filter student data based on search term and strand filter"""
-        search_term = self.search_field.text().lower()
+        """Point the student table at the rows matching the search term and strand filter"""
+        self.search_timer.stop()  # This query already covers any typing still waiting on the timer
+        search_term = self.search_field.text()
         selected_strand = self.strand_filter.currentText()
+        strand = None if selected_strand == "All Strands" else selected_strand
 
-        filtered_students = []
-        for student in self.all_students:
-            # Get student details
-            full_name = f"{student[1]} {student[2]} {student[3]}".lower()
-            student_id = f"ST-{student[0]:04d}".lower()
-            strand = student[6] or ""
-
-            # Check if student matches filter criteria
-            name_match = search_term in full_name or search_term in student_id
-            strand_match = selected_strand == "All Strands" or selected_strand == strand
-
-            if name_match and strand_match:
-                filtered_students.append(student)
-
-        self.populate_student_table(filtered_students)
+        # Rows are fetched on a worker a page at a time as the table scrolls. While searching the
+        # best matches come first; the header sort comes back when the search is cleared
+        searching = bool(search_term.strip())
+        self.student_table.horizontalHeader().setSortIndicatorShown(not searching)
+        self.student_model.set_query(partial(query_students, search_term, strand), ranked=searching)
 
     def load_staff_data(self):
         """Load staff data from database"""
         try:
-            conn = sqlite3.connect(DB_FILE)
+            conn = get_connection()
             cursor = conn.cursor()
 
-            cursor.execute("""
-                SELECT staff_id, first_name, last_name, username, 
-                       position, department, is_admin
-                FROM staff
-                ORDER BY last_name, first_name
-            """)
+            cursor.execute(STAFF_LIST_SQL)
 
             staff_members = cursor.fetchall()
-            conn.close()
 
             # Populate staff table
             self.staff_table.setRowCount(len(staff_members))
@@ -668,11 +525,11 @@ class AdminDashboard(QWidget):
                 action_layout.setSpacing(4)
 
                 edit_btn = QPushButton("Edit")
-                edit_btn.setStyleSheet("background-color: #4bb3fd; color: white;")
+                set_role(edit_btn, "table-edit")
                 edit_btn.clicked.connect(lambda _, s_id=staff[0]: self.edit_staff(s_id))
 
                 delete_btn = QPushButton("Delete")
-                delete_btn.setStyleSheet("background-color: #ff6b6b; color: white;")
+                set_role(delete_btn, "table-delete")
                 delete_btn.clicked.connect(lambda _, s_id=staff[0]: self.delete_staff(s_id))
 
                 action_layout.addWidget(edit_btn)
@@ -710,16 +567,16 @@ class AdminDashboard(QWidget):
 
         if confirm == QMessageBox.StandardButton.Yes:
             try:
-                conn = sqlite3.connect(DB_FILE)
+                conn = get_connection()
                 cursor = conn.cursor()
 
                 cursor.execute("DELETE FROM staff WHERE staff_id = ?", (staff_id,))
                 conn.commit()
-                conn.close()
 
                 self.load_staff_data()
 
             except Exception as e:
+                get_connection().rollback()
                 QMessageBox.critical(self, "Database Error", f"Failed to delete staff: {e}")
 
     def delete_student(self, student_id):
@@ -733,54 +590,13 @@ class AdminDashboard(QWidget):
 
         if confirm == QMessageBox.StandardButton.Yes:
             try:
-                # Delete from SQLite
-                conn = sqlite3.connect(DB_FILE)
-                cursor = conn.cursor()
+                # Delete from SQLite - the deletion is queued and copied to MySQL in the background
+                success, result = db_manager.delete_student(student_id)
 
-                # First get the student reference code and other related info before deleting
-                cursor.execute("SELECT reference_code FROM students WHERE student_id = ?", (student_id,))
-                result = cursor.fetchone()
-
-                if not result:
-                    QMessageBox.warning(self, "Warning", "Student record not found in SQLite database.")
+                if not success:
+                    QMessageBox.warning(self, "Warning", f"Could not delete student record: {result}")
                     return
 
-                ref_code = result[0]
-
-                # Delete from SQLite - cascade delete will handle related tables
-                cursor.execute("DELETE FROM students WHERE student_id = ?", (student_id,))
-                conn.commit()
-                conn.close()
-
-                # Delete from MySQL if available
-                try:
-                    # Import here to avoid circular import
-                    from mysql_db import MYSQL_CONFIG
-                    import pymysql
-
-                    # Connect to MySQL
-                    mysql_conn = pymysql.connect(**MYSQL_CONFIG)
-                    mysql_cursor = mysql_conn.cursor()
-
-                    # Get MySQL student ID using reference code
-                    mysql_cursor.execute("SELECT student_id FROM students WHERE reference_code = %s", (ref_code,))
-                    mysql_result = mysql_cursor.fetchone()
-
-                    if mysql_result:
-                        mysql_student_id = mysql_result[0]
-
-                        # Delete from MySQL - foreign keys should handle cascade delete
-                        mysql_cursor.execute("DELETE FROM students WHERE student_id = %s", (mysql_student_id,))
-                        mysql_conn.commit()
-                        print(f"Student {ref_code} deleted from MySQL database")
-                    else:
-                        print(f"Student {ref_code} not found in MySQL database")
-
-                    mysql_conn.close()
-                except Exception as mysql_error:
-                    print(f"MySQL deletion error: {mysql_error}")
-                    # Don't show error to user if MySQL fails - SQLite is primary database
-
                 # Refresh the UI
                 self.load_student_data()
                 QMessageBox.information(self, "Success", "Student record has been deleted successfully")
@@ -791,49 +607,22 @@ class AdminDashboard(QWidget):
     def update_dashboard_metrics(self):
         """Update dashboard metrics and chart with data from database"""
         try:
-            conn = sqlite3.connect(DB_FILE)
-            cursor = conn.cursor()
-
-            # Get total student count
-            cursor.execute("SELECT COUNT(*) FROM students")
-            total_students = cursor.fetchone()[0]
-
-            # Get freshmen count
-            cursor.execute("SELECT COUNT(*) FROM students WHERE enrollment_type = 'Freshmen' OR enrollment_type IS NULL")
-            freshmen_count = cursor.fetchone()[0]
-
-            # Get transferee count
-            cursor.execute("SELECT COUNT(*) FROM students WHERE enrollment_type = 'Transferee'")
-            transferee_count = cursor.fetchone()[0]
+            # One read of the trigger-maintained summary table, however many students there are
+            metrics = get_dashboard_metrics()
 
             # Update metric labels
             if "Registered Students" in self.metric_labels:
-                self.metric_labels["Registered Students"].setText(str(total_students))
+                self.metric_labels["Registered Students"].setText(str(metrics["total"]))
 
             if "Freshmen Students" in self.metric_labels:
-                self.metric_labels["Freshmen Students"].setText(str(freshmen_count))
+                self.metric_labels["Freshmen Students"].setText(str(metrics["freshmen"]))
 
             if "Transferee Students" in self.metric_labels:
-                self.metric_labels["Transferee Students"].setText(str(transferee_count))
-
-            # Get strand distribution for chart
-            cursor.execute("""
-                SELECT strand, COUNT(*) 
-                FROM students 
-                WHERE strand IS NOT NULL AND strand != '' 
-                GROUP BY strand
-            """)
-
-            strand_data = cursor.fetchall()
-            conn.close()
+                self.metric_labels["Transferee Students"].setText(str(metrics["transferee"]))
 
-            # Create dictionary of strand counts
-            strands = []
-            counts = []
-
-            for strand, count in strand_data:
-                strands.append(strand)
-                counts.append(count)
+            # Strand distribution for chart
+            strands = list(metrics["strands"].keys())
+            counts = list(metrics["strands"].values())
 
             # Add default strands with zero count if not present
             default_strands = ["STEM", "ICT", "ABM", "GAS"]
@@ -845,28 +634,16 @@ class AdminDashboard(QWidget):
             # Update bar chart
             self.update_bar_chart(strands, counts)
 
+            # Registrations per day for the trend chart
+            trend = get_registration_trend()
+            self.trend_chart.set_data([day.strftime("%b %d") for day, _ in trend], [count for _, count in trend])
+
         except Exception as e:
             print(f"Error updating dashboard metrics: {e}")
 
     def update_bar_chart(self, strands, counts):
         """Update the bar chart with strand data"""
-        ax = self.figure.add_subplot(111)
-        ax.clear()
-
-        if strands and counts:
-            ax.bar(strands, counts, color="#2356c5")
-            ax.set_ylabel("Number of Students")
-            ax.set_xlabel("Strands")
-
-            # Add count labels on top of bars
-            for i, count in enumerate(counts):
-                if count > 0:
-                    ax.text(i, count + 0.5, str(count), ha='center')
-        else:
-            ax.text(0.5, 0.5, "No strand data available",
-                   ha='center', va='center', transform=ax.transAxes)
-
-        self.canvas.draw()
+        self.strand_chart.set_data(strands, counts)
 
     def logout(self):
         """Handle logout action"""
@@ -0,0 +1,130 @@
+"""
+Staff and admin sign-in for OwlReg
+authenticate() is shared by both login dialogs. It does the slow password
+check, so the dialogs run it on a worker thread, and it slows down repeated
+guessing at one username without costing a normal login anything
+"""
+import threading
+import time
+from collections import OrderedDict
+from sqlite_db import get_connection, update_staff_password
+from password_utils import hash_password, verify_and_upgrade
+
+# Failed logins allowed for a username before it has to wait, how long the first
+# wait is (it doubles with each further failure, up to the maximum), and how long
+# without a failure before the count starts over
+FREE_ATTEMPTS = 5
+LOCKOUT_SECONDS = 30
+MAX_LOCKOUT_SECONDS = 15 * 60
+FAILURE_MEMORY_SECONDS = 60 * 60
+
+
+class LoginRateLimiter:
+    """Per-username failed login counter with an exponential lockout"""
+    def __init__(self, free_attempts=FREE_ATTEMPTS, lockout_seconds=LOCKOUT_SECONDS,
+                 max_lockout_seconds=MAX_LOCKOUT_SECONDS, clock=time.monotonic):
+        self.free_attempts = free_attempts
+        self.lockout_seconds = lockout_seconds
+        self.max_lockout_seconds = max_lockout_seconds
+        self.clock = clock
+        # username -> (failed attempts, time of the last one), oldest last failure first
+        self._failures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def retry_after(self, username):
+        """Seconds `username` must wait before trying again (0 when they may try now)"""
+        entry = self._failures.get(username.lower())
+        if entry is None:
+            return 0  # the usual case - no recent failures, no locking
+        failures, last_failure = entry
+        elapsed = self.clock() - last_failure
+        if elapsed > FAILURE_MEMORY_SECONDS:
+            return 0
+        if failures < self.free_attempts:
+            return 0
+        lockout = min(self.lockout_seconds * 2 ** (failures - self.free_attempts), self.max_lockout_seconds)
+        return max(0, lockout - elapsed)
+
+    def record_failure(self, username):
+        """Count a failed login for `username`"""
+        key = username.lower()
+        with self._lock:
+            failures, last_failure = self._failures.get(key, (0, 0))
+            now = self.clock()
+            if now - last_failure > FAILURE_MEMORY_SECONDS:
+                failures = 0
+            self._failures[key] = (failures + 1, now)
+            self._failures.move_to_end(key)
+
+            # Forget usernames whose failures have expired, so guesses at made-up
+            # usernames don't pile up; they are the ones at the front
+            while self._failures:
+                _, oldest_failure = next(iter(self._failures.values()))
+                if now - oldest_failure <= FAILURE_MEMORY_SECONDS:
+                    break
+                self._failures.popitem(last=False)
+
+    def record_success(self, username):
+        """Forget the failures of a username that just logged in"""
+        if username.lower() in self._failures:
+            with self._lock:
+                self._failures.pop(username.lower(), None)
+
+
+rate_limiter = LoginRateLimiter()
+
+# Hash checked against when the username doesn't exist, so an unknown username
+# takes as long to reject as a wrong password
+_dummy_hash = None
+
+def _get_dummy_hash():
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = hash_password("owlreg-no-such-account")
+    return _dummy_hash
+
+def authenticate(username, password, is_admin=False):
+    """
+    Check a staff (or admin) login against the staff table
+    Runs the password check even for unknown usernames, and upgrades outdated
+    password hashes on success (see password_utils.verify_and_upgrade).
+    Returns (account dict or None, seconds the username is locked out for)
+    """
+    wait = rate_limiter.retry_after(username)
+    if wait:
+        print(f"Login for {username} refused: locked out for {wait:.0f} more seconds")
+        return None, wait
+
+    row = get_connection().execute("""
+        SELECT staff_id, username, password, first_name, last_name, email, position, department
+        FROM staff
+        WHERE username = ? AND is_admin = ?
+    """, (username, 1 if is_admin else 0)).fetchone()
+
+    if row is None:
+        verify_and_upgrade(_get_dummy_hash(), password)
+        authenticated, new_hash = False, None
+    else:
+        try:
+            authenticated, new_hash = verify_and_upgrade(row[2], password)
+        except Exception as e:
+            print(f"Error in password verification: {e}")
+            authenticated, new_hash = False, None
+
+    if not authenticated:
+        rate_limiter.record_failure(username)
+        return None, 0
+
+    rate_limiter.record_success(username)
+    if new_hash is not None:
+        update_staff_password(row[0], new_hash)
+
+    return {
+        "staff_id": row[0],
+        "username": row[1],
+        "first_name": row[3],
+        "last_name": row[4],
+        "email": row[5],
+        "position": row[6],
+        "department": row[7]
+    }, 0
@@ -0,0 +1,1536 @@
+"""
+Performance benchmarks for OwlReg
+Each benchmark runs against a throwaway database in a temporary folder,
+so the real student_records.db is never touched.
+
+Usage: python benchmarks.py [benchmark_name ...]
+Run without arguments to list the available benchmarks.
+"""
+import os
+import sys
+import time
+import random
+import string
+import hashlib
+import sqlite3
+import tempfile
+import contextlib
+import threading
+from functools import partial
+from datetime import datetime, timedelta
+
+import sqlite_db
+
+STRANDS = ["STEM", "ICT", "ABM", "GAS"]
+FIRST_NAMES = ["Juan", "Maria", "Jose", "Ana", "Mark", "Grace", "Paolo", "Bea", "Carlo", "Liza"]
+LAST_NAMES = ["Santos", "Reyes", "Cruz", "Bautista", "Garcia", "Mendoza", "Torres", "Flores", "Ramos", "Dela Cruz"]
+# Syllables for seed_students(varied_names=True), giving thousands of distinct names
+NAME_SYLLABLES = ["ma", "ri", "jo", "se", "an", "na", "li", "za", "car", "lo",
+                  "be", "pa", "ol", "gra", "ce", "ro", "del", "vin", "te", "sa"]
+
+
+@contextlib.contextmanager
+def temporary_database():
+    """Point sqlite_db at a fresh database file for the duration of a benchmark"""
+    original_db_file = sqlite_db.DB_FILE
+    with tempfile.TemporaryDirectory() as temp_dir:
+        sqlite_db.close_connections()
+        sqlite_db.DB_FILE = os.path.join(temp_dir, "benchmark_records.db")
+        try:
+            sqlite_db.create_database()
+            # A kiosk issues reference codes only once it has a node ID
+            sqlite_db.set_node_id(2)
+            yield sqlite_db.DB_FILE
+        finally:
+            sqlite_db.close_connections()
+            sqlite_db.DB_FILE = original_db_file
+
+
+def seed_students(count, batch_size=10000, varied_names=False):
+    """
+    Insert `count` synthetic students straight into the students table
+    varied_names=True builds names from syllables instead of the ten-name lists,
+    so name searches hit realistic numbers of students
+    """
+    conn = sqlite_db.get_connection()
+    start_date = datetime(2025, 1, 1)
+    rng = random.Random(42)
+
+    def name(names):
+        if not varied_names:
+            return rng.choice(names)
+        return "".join(rng.choice(NAME_SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+
+    for batch_start in range(0, count, batch_size):
+        rows = []
+        for i in range(batch_start, min(batch_start + batch_size, count)):
+            rows.append((
+                f"SEED{i:07d}",
+                name(FIRST_NAMES),
+                name(LAST_NAMES),
+                name(LAST_NAMES),
+                "",
+                f"{100000000000 + i}",
+                "Transferee" if rng.random() < 0.3 else "Freshmen",
+                rng.choice(STRANDS),
+                rng.choice(["Morning", "Afternoon"]),
+                "2008-01-01",
+                "Single",
+                "",
+                "09171234567",
+                "",
+                "",
+                f"{i} Rizal St., Brgy. {i % 50}, Pablo City, Laguna",
+                (start_date + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S")
+            ))
+        conn.executemany('''
+            INSERT INTO students (
+                reference_code, first_name, last_name, middle_name, extension,
+                lrn, enrollment_type, strand, preferred_session,
+                birthday, civil_status, religion, mobile_no, telephone_no,
+                ethnicity, address, registration_date
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        conn.commit()
+
+
+def sample_form_data(index):
+    """Build one registration the way MainWindow collects it"""
+    return {
+        "email": {"email": f"student{index}@example.com"},
+        "personal": {
+            "reference_code": f"BENCH{index:07d}",
+            "first_name": FIRST_NAMES[index % len(FIRST_NAMES)],
+            "last_name": LAST_NAMES[index % len(LAST_NAMES)],
+            "middle_name": "Santos",
+            "extension": "",
+            "lrn": f"{200000000000 + index}",
+            "is_transferee": index % 3 == 0,
+            "strand": STRANDS[index % len(STRANDS)],
+            "session": "Morning",
+            "birth_date": "2008-05-17",
+            "civil_status": "Single",
+            "religion": "Catholic",
+            "mobile": "09171234567",
+            "telephone": "",
+            "ethnicity": "Tagalog",
+            "street_address": f"{index} Rizal St.",
+            "barangay": "San Roque",
+            "city": "San Pablo",
+            "province": "Laguna"
+        },
+        "family": {
+            "father": {"skipped": False, "first_name": "Pedro", "last_name": "Santos", "age": "45",
+                       "ethnicity": "Tagalog", "occupation": "Driver", "education": "High School"},
+            "mother": {"skipped": False, "first_name": "Rosa", "last_name": "Santos", "age": "43",
+                       "ethnicity": "Tagalog", "occupation": "Teacher", "education": "College"},
+            "guardian": {"skipped": True}
+        },
+        "academic": {
+            "elementary_school": "San Pablo Central School", "elementary_year": "2020",
+            "elementary_honors": "", "juniorhs_school": "San Pablo NHS",
+            "juniorhs_year": "2024", "juniorhs_honors": "With Honors"
+        },
+        "emergency": {
+            "contact_name": "Rosa Santos", "relationship": "Mother",
+            "address": "Rizal St., San Pablo", "contact_no": "09171234567"
+        }
+    }
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the modules' progress prints while timing them"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def report(label, total_seconds, operations):
+    """Print one benchmark line with the per-operation cost"""
+    per_op_ms = total_seconds / operations * 1000
+    print(f"  {label:<40} {per_op_ms:9.3f} ms/op  ({operations} ops in {total_seconds:.2f} s)")
+    return per_op_ms
+
+
+def bench_connection_open(students=100000, iterations=2000):
+    """Connection cost of a dashboard query: fresh sqlite3.connect per call vs the shared connection"""
+    print(f"Connection-open benchmark ({students} students, {iterations} iterations)")
+    with temporary_database() as db_file:
+        seed_students(students)
+        # A point lookup, so the connection cost is not hidden behind a long scan
+        query = "SELECT * FROM students WHERE reference_code = ?"
+        codes = [(f"SEED{random.randrange(students):07d}",) for _ in range(iterations)]
+
+        start = time.perf_counter()
+        for params in codes:
+            conn = sqlite3.connect(db_file)
+            conn.execute(query, params).fetchone()
+            conn.close()
+        before = report("before: sqlite3.connect per call", time.perf_counter() - start, iterations)
+
+        start = time.perf_counter()
+        for params in codes:
+            sqlite_db.get_connection().execute(query, params).fetchone()
+        after = report("after: shared get_connection()", time.perf_counter() - start, iterations)
+
+        print(f"  speedup: {before / after:.1f}x")
+
+
+def bench_registrations(registrations=2000):
+    """Registrations per second with and without the per-save schema round-trips"""
+    print(f"Registration throughput benchmark ({registrations} registrations per run)")
+    forms = [sample_form_data(i) for i in range(registrations * 3)]
+
+    def run(label, save):
+        batch = forms[:registrations]
+        del forms[:registrations]
+        with quiet():
+            start = time.perf_counter()
+            for form_data in batch:
+                save(form_data)
+            elapsed = time.perf_counter() - start
+        print(f"  {label:<44} {registrations / elapsed:9.0f} registrations/s")
+        return elapsed
+
+    def original_path(form_data):
+        # The old hot path: fresh connection for the probe, another for the
+        # CREATE TABLE IF NOT EXISTS pass, then a third for the insert
+        sqlite_db.close_connections()
+        sqlite_db.test_connection()
+        sqlite_db.close_connections()
+        sqlite_db.create_database()
+        sqlite_db.close_connections()
+        sqlite_db.save_registration(form_data)
+
+    def probe_and_ddl_path(form_data):
+        sqlite_db.test_connection()
+        sqlite_db.create_database()
+        sqlite_db.save_registration(form_data)
+
+    with temporary_database():
+        before = run("before: 3 connections + schema DDL per save", original_path)
+        run("shared connection + schema DDL per save", probe_and_ddl_path)
+        after = run("after: cached schema, one transaction", sqlite_db.save_registration)
+        print(f"  speedup: {before / after:.1f}x")
+
+
+def bench_dashboard_metrics(students=200000, iterations=200):
+    """Dashboard metrics refresh: three COUNT(*) scans plus a GROUP BY vs the summary table"""
+    print(f"Dashboard metrics benchmark ({students} students, {iterations} refreshes)")
+    with temporary_database():
+        seed_students(students)
+        conn = sqlite_db.get_connection()
+
+        def old_refresh():
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM students")
+            cursor.fetchone()
+            cursor.execute("SELECT COUNT(*) FROM students WHERE enrollment_type = 'Freshmen' OR enrollment_type IS NULL")
+            cursor.fetchone()
+            cursor.execute("SELECT COUNT(*) FROM students WHERE enrollment_type = 'Transferee'")
+            cursor.fetchone()
+            cursor.execute("""
+                SELECT strand, COUNT(*)
+                FROM students
+                WHERE strand IS NOT NULL AND strand != ''
+                GROUP BY strand
+            """)
+            cursor.fetchall()
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            old_refresh()
+        before = report("before: 4 aggregate queries", time.perf_counter() - start, iterations)
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            sqlite_db.get_dashboard_metrics()
+        after = report("after: student_metrics summary table", time.perf_counter() - start, iterations)
+
+        print(f"  speedup: {before / after:.0f}x")
+
+
+def bench_dual_write(registrations=200, mysql_latency=0.025, disk_latency=0.015):
+    """Submit latency of the SQLite + MySQL dual-write: sequential, parallel and write-behind"""
+    print(f"Dual-write benchmark ({registrations} registrations, "
+          f"{disk_latency * 1000:.0f} ms disk sync, {mysql_latency * 1000:.0f} ms MySQL round-trip)")
+    with quiet():
+        import db_manager
+        import mysql_db
+
+    # No MySQL server is needed: the stand-in sleeps for a typical network round-trip
+    def fake_mysql_save(form_data, **kwargs):
+        time.sleep(mysql_latency)
+        return True, form_data["personal"]["reference_code"], 1
+
+    # The real SQLite save, plus the fsync cost of a kiosk disk (the temp folder is usually RAM-backed)
+    def slow_disk_sqlite_save(form_data, **kwargs):
+        time.sleep(disk_latency)
+        return original_sqlite_save(form_data, **kwargs)
+
+    original_mysql_save = mysql_db.save_registration
+    original_sqlite_save = sqlite_db.save_registration
+    mysql_db.save_registration = fake_mysql_save
+    sqlite_db.save_registration = slow_disk_sqlite_save
+    manager = db_manager.db_manager
+    original_flags = (manager.use_sqlite, manager.use_mysql, manager.parallel_writes, manager.write_behind)
+    manager.use_sqlite = manager.use_mysql = True
+    forms = [sample_form_data(i) for i in range(registrations * 3)]
+
+    def run(label, parallel, write_behind=False):
+        manager.parallel_writes = parallel
+        manager.write_behind = write_behind
+        batch = forms[:registrations]
+        del forms[:registrations]
+        with quiet():
+            start = time.perf_counter()
+            for form_data in batch:
+                manager.save_registration(form_data)
+            elapsed = time.perf_counter() - start
+        return report(label, elapsed, registrations)
+
+    try:
+        with temporary_database():
+            before = run("before: SQLite then MySQL", False)
+            parallel = run("SQLite and MySQL in parallel", True)
+            after = run("after: SQLite + outbox (write-behind)", False, write_behind=True)
+            print(f"  speedup: {before / parallel:.1f}x parallel, {before / after:.1f}x write-behind")
+            manager.replicator.stop()
+    finally:
+        mysql_db.save_registration = original_mysql_save
+        sqlite_db.save_registration = original_sqlite_save
+        manager.use_sqlite, manager.use_mysql, manager.parallel_writes, manager.write_behind = original_flags
+
+
+def bench_bulk_import(registrations=50000, single_registrations=5000):
+    """Students imported per minute: save_registration per student vs chunked save_registrations"""
+    print(f"Bulk import benchmark ({single_registrations} one-by-one, {registrations} bulk)")
+
+    with temporary_database():
+        with quiet():
+            start = time.perf_counter()
+            for i in range(single_registrations):
+                sqlite_db.save_registration(sample_form_data(i))
+            elapsed = time.perf_counter() - start
+        before = single_registrations / elapsed * 60
+        print(f"  {'before: save_registration per student':<44} {before:9.0f} students/min")
+
+    with temporary_database():
+        # A generator, so the import streams instead of building every form up front
+        forms = (sample_form_data(i) for i in range(registrations))
+        with quiet():
+            start = time.perf_counter()
+            results = sqlite_db.save_registrations(forms)
+            elapsed = time.perf_counter() - start
+        after = registrations / elapsed * 60
+        print(f"  {'after: save_registrations, 500 per chunk':<44} {after:9.0f} students/min")
+
+        saved = sum(1 for success, _, _ in results if success)
+        children = sqlite_db.get_connection().execute("SELECT COUNT(*) FROM emergency_contacts").fetchone()[0]
+        print(f"  saved {saved}/{registrations} students, {children} emergency contacts")
+        print(f"  speedup: {after / before:.1f}x")
+
+
+def bench_student_table(students=5000):
+    """Opening and re-filtering the admin student list: QTableWidget rows vs the paged model"""
+    from PyQt6.QtWidgets import (QApplication, QTableWidget, QTableWidgetItem, QTableView,
+                                 QPushButton, QWidget, QHBoxLayout)
+    from student_table_model import StudentTableModel, DeleteButtonDelegate
+
+    print(f"Student table benchmark ({students} students)")
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    with temporary_database():
+        seed_students(students)
+        conn = sqlite_db.get_connection()
+
+        # The old populate_student_table: every row loaded, an item per cell and a button widget per row
+        def old_open(strand=None):
+            rows = conn.execute("""
+                SELECT student_id, first_name, middle_name, last_name, extension,
+                       enrollment_type, strand, registration_date
+                FROM students
+                ORDER BY registration_date DESC
+            """).fetchall()
+            if strand:
+                rows = [row for row in rows if row[6] == strand]
+            table.setRowCount(0)
+            for student in rows:
+                row = table.rowCount()
+                table.insertRow(row)
+                for column, text in enumerate(StudentTableModel.format_student(student)):
+                    table.setItem(row, column, QTableWidgetItem(text))
+                action_layout = QHBoxLayout()
+                action_layout.addWidget(QPushButton("Delete"))
+                action_widget = QWidget()
+                action_widget.setLayout(action_layout)
+                table.setCellWidget(row, 5, action_widget)
+            app.processEvents()
+
+        table = QTableWidget(0, 6)
+        table.resize(1000, 700)
+        table.show()
+        start = time.perf_counter()
+        old_open()
+        before_open = report("before: open, QTableWidget", time.perf_counter() - start, 1)
+        start = time.perf_counter()
+        old_open("STEM")
+        before_filter = report("before: strand filter, QTableWidget", time.perf_counter() - start, 1)
+        table.close()
+        table.deleteLater()
+        app.processEvents()
+
+        model = StudentTableModel(sqlite_db.query_students, show_actions=True)
+        view = QTableView()
+        view.setModel(model)
+        view.setItemDelegateForColumn(5, DeleteButtonDelegate(view))
+        view.resize(1000, 700)
+        view.show()
+
+        start = time.perf_counter()
+        model.refresh()
+        app.processEvents()
+        after_open = report("after: open, paged model", time.perf_counter() - start, 1)
+        start = time.perf_counter()
+        model.refresh(partial(sqlite_db.query_students, "", "STEM"))
+        app.processEvents()
+        after_filter = report("after: strand filter, paged model", time.perf_counter() - start, 1)
+
+        # Scrolling to the end pages in the rest of the filtered rows
+        pages = 0
+        start = time.perf_counter()
+        while model.canFetchMore():
+            model.fetchMore()
+            pages += 1
+        view.scrollToBottom()
+        app.processEvents()
+        report(f"after: scroll through {model.rowCount()} rows", time.perf_counter() - start, max(pages, 1))
+        view.close()
+
+        print(f"  speedup: {before_open / after_open:.0f}x open, {before_filter / after_filter:.0f}x filter")
+
+
+def bench_student_query(students=100000, keystrokes=("j", "ju", "jua", "juan", "juan s")):
+    """Student list filtering: fetchall plus a Python filter per keystroke vs query_students pages"""
+    import tracemalloc
+    print(f"Student query benchmark ({students} students, {len(keystrokes)} keystrokes)")
+    with temporary_database():
+        seed_students(students)
+        conn = sqlite_db.get_connection()
+
+        # The old load_student_data + filter_students
+        def old_filter(search_term, strand):
+            rows = conn.execute("""
+                SELECT student_id, first_name, middle_name, last_name, extension,
+                       enrollment_type, strand, registration_date
+                FROM students
+                ORDER BY registration_date DESC
+            """).fetchall()
+            return [row for row in rows
+                    if (search_term in f"{row[1]} {row[2]} {row[3]}".lower()
+                        or search_term in f"ST-{row[0]:04d}".lower())
+                    and (strand is None or row[6] == strand)]
+
+        def run(label, filter_once):
+            tracemalloc.start()
+            start = time.perf_counter()
+            for strand in (None, "STEM"):
+                for search_term in keystrokes:
+                    filter_once(search_term, strand)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            result = report(label, elapsed, len(keystrokes) * 2)
+            print(f"  {'':<44} peak Python memory {peak / 1024 / 1024:.1f} MB")
+            return result
+
+        before = run("before: fetchall + Python filter", old_filter)
+        after = run("after: query_students first page", lambda search_term, strand:
+                    sqlite_db.query_students(search_term, strand))
+
+        # A deep page costs no more memory than the first one
+        start = time.perf_counter()
+        rows, total = sqlite_db.query_students(offset=students - 200)
+        report(f"last page of {total} students", time.perf_counter() - start, 1)
+        print(f"  speedup: {before / after:.0f}x")
+
+
+def bench_student_search(students=500000, iterations=20):
+    """Search box latency: the old LIKE scan vs the FTS5 index, ranked, at school-district scale"""
+    print(f"Student search benchmark ({students} students, {iterations} runs per search)")
+    with temporary_database():
+        start = time.perf_counter()
+        seed_students(students, varied_names=True)
+        print(f"  seeded in {time.perf_counter() - start:.1f} s (search triggers included)")
+        conn = sqlite_db.get_connection()
+        first, middle, last, ref_code, lrn, address, strand = conn.execute(
+            "SELECT first_name, middle_name, last_name, reference_code, lrn, address, strand "
+            "FROM students WHERE student_id = ?",
+            (students // 2,)
+        ).fetchone()
+
+        searches = [
+            ("full name", f"{first} {last}"),
+            ("first name + last prefix", f"{first} {last[:3]}"),
+            ("reference code", ref_code),
+            ("reference code prefix", ref_code[:9]),
+            ("LRN", lrn),
+            ("two-letter prefix", first[:2]),
+            ("misspelled name (fuzzy)", f"{first} {last[:-1]}x"),
+            ("misspelled first name only (fuzzy)", f"{first}x"),
+            # Every seeded address shares "Rizal St", the worst case for bm25's word statistics
+            ("house number + street", " ".join(address.split()[:3])),
+        ]
+
+        # The pre-index query: LIKE over a concatenated name for every row
+        def like_search(search_term):
+            pattern = f"%{search_term.lower()}%"
+            conn.execute("""
+                SELECT student_id FROM students
+                WHERE LOWER(first_name || ' ' || COALESCE(middle_name, '') || ' ' || last_name) LIKE ?
+                ORDER BY registration_date DESC LIMIT 200
+            """, (pattern,)).fetchall()
+            conn.execute("""
+                SELECT COUNT(*) FROM students
+                WHERE LOWER(first_name || ' ' || COALESCE(middle_name, '') || ' ' || last_name) LIKE ?
+            """, (pattern,)).fetchone()
+
+        start = time.perf_counter()
+        like_search(f"{first} {middle}")
+        report("before: LIKE scan, full name", time.perf_counter() - start, 1)
+
+        def time_search(label, search_term, **filters):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                rows, total = sqlite_db.query_students(search_term, **filters)
+            per_search = report(f"after: {label}", time.perf_counter() - start, iterations)
+            print(f"  {'':<44} {total} matches, best: {' '.join(filter(None, rows[0][1:4])) if rows else '-'}")
+            return per_search
+
+        slowest = 0
+        for label, search_term in searches:
+            slowest = max(slowest, time_search(label, search_term, sort_key=sqlite_db.RELEVANCE_SORT))
+
+        # The dashboard's strand filter on top of a search, in its default newest-first order
+        for label, search_term in (("full name + strand", f"{first} {last}"),
+                                   ("two-letter prefix + strand", first[:2]),
+                                   ("misspelled name + strand (fuzzy)", f"{first} {last[:-1]}x")):
+            slowest = max(slowest, time_search(label, search_term, strand=strand))
+        print(f"  slowest search: {slowest:.1f} ms")
+
+
+def bench_search_typing(students=200000, text="maria santos", key_delay_ms=60):
+    """Longest GUI freeze while typing in the student search box: synchronous filtering vs debounced worker"""
+    from PyQt6.QtWidgets import QApplication, QLineEdit, QTableView
+    from PyQt6.QtCore import QTimer, QThreadPool, QElapsedTimer
+    from PyQt6.QtTest import QTest
+    from student_table_model import StudentTableModel, SEARCH_DEBOUNCE_MS
+
+    print(f"Search typing benchmark ({students} students, typing {text!r}, {key_delay_ms} ms between keys)")
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    with temporary_database():
+        seed_students(students)
+        calls = []
+
+        def counted_query(*args, **kwargs):
+            calls.append(args)
+            return sqlite_db.query_students(*args, **kwargs)
+
+        def run(label, thread_pool, debounce):
+            field = QLineEdit()
+            model = StudentTableModel(counted_query, show_actions=True, thread_pool=thread_pool)
+            # Sorted by name, as a registrar looking someone up might have it
+            model.sort(1)
+            view = QTableView()
+            view.setModel(model)
+            view.resize(1000, 700)
+            view.show()
+            QThreadPool.globalInstance().waitForDone()
+            app.processEvents()
+
+            def search():
+                model.set_query(partial(counted_query, field.text()))
+            if debounce:
+                timer = QTimer(field)
+                timer.setSingleShot(True)
+                timer.setInterval(SEARCH_DEBOUNCE_MS)
+                timer.timeout.connect(search)
+                field.textChanged.connect(timer.start)
+            else:
+                field.textChanged.connect(search)
+
+            # A 5 ms heartbeat; the longest gap between beats is the longest freeze
+            clock = QElapsedTimer()
+            beats = []
+            heartbeat = QTimer()
+            heartbeat.timeout.connect(lambda: beats.append(clock.elapsed()))
+            heartbeat.start(5)
+            calls.clear()
+            clock.start()
+            QTest.keyClicks(field, text, delay=key_delay_ms)
+            # Let the last search finish and its results arrive
+            QTest.qWait(SEARCH_DEBOUNCE_MS + 50)
+            QThreadPool.globalInstance().waitForDone()
+            app.processEvents()
+            heartbeat.stop()
+
+            worst = max(later - earlier for earlier, later in zip(beats, beats[1:]))
+            print(f"  {label:<40} longest freeze {worst:4d} ms, {len(calls)} queries, "
+                  f"{model.total_count} matches shown")
+            view.close()
+            return worst
+
+        before = run("before: filter on every keystroke", None, False)
+        after = run("after: debounced, on a worker", QThreadPool.globalInstance(), True)
+        print(f"  longest freeze: {before} ms -> {after} ms")
+
+
+def bench_student_details(students=100000, registrations=2000, lookups=5000):
+    """Help desk reference code lookups: four queries per lookup vs one joined query vs the LRU cache"""
+    print(f"Student details benchmark ({students} students, {lookups} lookups)")
+    with temporary_database():
+        seed_students(students)
+        with quiet():
+            sqlite_db.save_registrations(sample_form_data(i) for i in range(registrations))
+        conn = sqlite_db.get_connection()
+
+        # The help desk sees the same few students again and again
+        rng = random.Random(7)
+        ref_codes = [f"BENCH{int(rng.paretovariate(1.2)) % registrations:07d}" for _ in range(lookups)]
+
+        # The old search_by_ref_code
+        def old_lookup(ref_code):
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            student = cursor.execute("SELECT * FROM students WHERE reference_code = ?", (ref_code,)).fetchone()
+            sections = [student]
+            for table in ("family_background", "academic_profile", "emergency_contacts"):
+                sections.append(cursor.execute(f"SELECT * FROM {table} WHERE student_id = ?",
+                                               (student["student_id"],)).fetchone())
+            return sections
+
+        # Same records either way
+        for ref_code in set(ref_codes[:50]):
+            details = sqlite_db.get_student_details(ref_code)
+            old = [dict(row) for row in old_lookup(ref_code)]
+            if old != [details[section] for section in ("student", "family", "academic", "emergency")]:
+                print(f"  MISMATCH for {ref_code}")
+                return False
+
+        def run(label, lookup):
+            start = time.perf_counter()
+            for ref_code in ref_codes:
+                lookup(ref_code)
+            return report(label, time.perf_counter() - start, lookups)
+
+        def uncached(ref_code):
+            sqlite_db.invalidate_student_details()
+            return sqlite_db.get_student_details(ref_code)
+
+        before = run("before: four queries", old_lookup)
+        joined = run("after: one joined query", uncached)
+        sqlite_db.invalidate_student_details()
+        cached = run("after: joined query + LRU cache", sqlite_db.get_student_details)
+        print(f"  distinct students looked up: {len(set(ref_codes))}")
+        print(f"  speedup: {before / joined:.1f}x uncached, {before / cached:.0f}x with the cache")
+
+        # Deleting a student drops their cached details
+        ref_code = ref_codes[0]
+        student_id = sqlite_db.get_student_details(ref_code)["student"]["student_id"]
+        with quiet():
+            sqlite_db.delete_student(student_id)
+        if sqlite_db.get_student_details(ref_code) is not None:
+            print(f"  deleted student {ref_code} still served from the cache")
+            return False
+
+
+def _generate_codes(db_file, threads, count):
+    """One kiosk process for bench_reference_codes: `threads` threads each taking `count` codes"""
+    sqlite_db.DB_FILE = db_file
+    codes = [[] for _ in range(threads)]
+
+    def take(out):
+        for _ in range(count):
+            out.append(sqlite_db.generate_reference_code())
+
+    workers = [threading.Thread(target=take, args=(out,)) for out in codes]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return [code for out in codes for code in out]
+
+
+def bench_reference_codes(kiosks=2, processes=2, threads=2, codes_per_thread=250000):
+    """Reference code stress test: millions of codes from concurrent kiosks, processes and threads"""
+    from multiprocessing import Pool
+    from reference_codes import is_valid_reference_code
+    total = kiosks * processes * threads * codes_per_thread
+    print(f"Reference code benchmark ({kiosks} kiosks x {processes} processes x {threads} threads, {total} codes)")
+
+    with temporary_database() as db_file:
+        # Each kiosk has its own database file and a node ID claimed from MySQL
+        kiosk_files = [db_file]
+        for kiosk in range(1, kiosks):
+            kiosk_files.append(os.path.join(os.path.dirname(db_file), f"kiosk{kiosk}.db"))
+        for node_id, kiosk_file in enumerate(kiosk_files, start=2):
+            sqlite_db.DB_FILE = kiosk_file
+            sqlite_db.create_database()
+            sqlite_db.set_node_id(node_id)
+        sqlite_db.close_connections()
+        sqlite_db.DB_FILE = db_file
+
+        start = time.perf_counter()
+        with Pool(kiosks * processes) as pool:
+            batches = pool.starmap(_generate_codes, [(kiosk_file, threads, codes_per_thread)
+                                                     for kiosk_file in kiosk_files for _ in range(processes)])
+        elapsed = time.perf_counter() - start
+        codes = [code for batch in batches for code in batch]
+
+        report("after: block allocator", elapsed, total)
+        duplicates = len(codes) - len(set(codes))
+        invalid = sum(1 for code in codes if not is_valid_reference_code(code))
+        print(f"  duplicates: {duplicates}, failed check character: {invalid}")
+
+        # Single-threaded cost of one code, with a block reservation every BLOCK_SIZE codes
+        start = time.perf_counter()
+        for _ in range(100000):
+            sqlite_db.generate_reference_code()
+        report("one thread", time.perf_counter() - start, 100000)
+
+    # The old generators, for comparison (no database involved, so no transaction to fail)
+    def old_sqlite_code():
+        return "REF" + "".join(random.choices(string.ascii_uppercase + string.digits, k=7))
+
+    def old_mysql_code():
+        code = f"R{int(time.time())}{''.join(random.choices(string.ascii_uppercase + string.digits, k=5))}"
+        return f"R{code[5:14]}"
+
+    for label, generate in (("before: random SQLite codes", old_sqlite_code),
+                            ("before: timestamp MySQL codes", old_mysql_code)):
+        start = time.perf_counter()
+        old_codes = [generate() for _ in range(total)]
+        report(label, time.perf_counter() - start, total)
+        print(f"  duplicates: {len(old_codes) - len(set(old_codes))}")
+
+    return duplicates == 0 and invalid == 0
+
+
+def bench_password_hashing(iterations=5):
+    """Login verify time per password hash algorithm and cost, and the calibrated defaults"""
+    import password_utils
+    print(f"Password hashing benchmark ({iterations} verifies each)")
+
+    legacy = os.urandom(32)
+    legacy += hashlib.pbkdf2_hmac('sha256', b"password123", legacy, 100000)
+    candidates = [("legacy pbkdf2-sha256 i=100000", legacy)]
+    for iterations_cost in (100000, 310000, 600000):
+        candidates.append((f"pbkdf2-sha256 i={iterations_cost}",
+                           password_utils.hash_password("password123", algorithm=password_utils.PBKDF2,
+                                                        cost=iterations_cost)))
+    for log_n in (14, 15, 16):
+        candidates.append((f"scrypt ln={log_n}",
+                           password_utils.hash_password("password123", algorithm=password_utils.SCRYPT,
+                                                        cost=log_n)))
+
+    for label, stored in candidates:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            if not password_utils.verify_password(stored, "password123"):
+                print(f"  {label}: verification failed")
+                return False
+        report(label, time.perf_counter() - start, iterations)
+
+    # What each algorithm calibrates to for the default login time on this machine
+    for algorithm in password_utils.ALGORITHMS:
+        start = time.perf_counter()
+        cost = password_utils.calibrate(algorithm)
+        calibration_ms = (time.perf_counter() - start) * 1000
+        stored = password_utils.hash_password("password123", algorithm=algorithm, cost=cost)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            password_utils.verify_password(stored, "password123")
+        report(f"calibrated {algorithm} cost={cost}", time.perf_counter() - start, iterations)
+        print(f"  {'':<40} calibration took {calibration_ms:.0f} ms")
+
+    # A legacy hash is replaced at the first successful login, and only then
+    authenticated, upgraded = password_utils.verify_and_upgrade(legacy, "password123")
+    if not authenticated or upgraded is None or password_utils.verify_and_upgrade(upgraded, "password123")[1]:
+        print("  legacy hash was not upgraded exactly once")
+        return False
+    print(f"  legacy hash upgraded on login to {upgraded.split(b'$')[1].decode()} "
+          f"{upgraded.split(b'$')[2].decode()}")
+
+
+def bench_login(accounts=10):
+    """Longest GUI freeze while a queue of staff log in: password check on the GUI thread vs a worker"""
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QTimer, QElapsedTimer
+    from PyQt6.QtTest import QTest
+    import auth
+    from password_utils import hash_password
+    from dashboard_login import StaffLoginDialog
+
+    print(f"Login benchmark ({accounts} staff logging in one after another)")
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    with temporary_database():
+        conn = sqlite_db.get_connection()
+        conn.executemany("""
+            INSERT INTO staff (username, password, first_name, last_name, email, position, department, is_admin)
+            VALUES (?, ?, 'Staff', 'Member', 'staff@example.com', 'Registrar', 'Registry', 0)
+        """, [(f"staff{i}", hash_password("password123")) for i in range(accounts)])
+        conn.commit()
+
+        def run(label, on_worker):
+            logged_in = []
+            clock = QElapsedTimer()
+            beats = []
+            heartbeat = QTimer()
+            heartbeat.timeout.connect(lambda: beats.append(clock.elapsed()))
+            heartbeat.start(5)
+            clock.start()
+            with quiet():
+                for i in range(accounts):
+                    dialog = StaffLoginDialog()
+                    dialog.login_successful.connect(logged_in.append)
+                    dialog.username_field.setText(f"staff{i}")
+                    dialog.password_field.setText("password123")
+                    if on_worker:
+                        dialog.attempt_login()
+                        while dialog.login_worker is not None:
+                            QTest.qWait(5)
+                    else:
+                        # What attempt_login used to do: check the password right here
+                        account, _ = auth.authenticate(f"staff{i}", "password123")
+                        logged_in.append(account)
+                        QTest.qWait(5)
+            heartbeat.stop()
+            elapsed = clock.elapsed()
+
+            worst = max(later - earlier for earlier, later in zip(beats, beats[1:]))
+            print(f"  {label:<40} longest freeze {worst:4d} ms, {len(logged_in)} logged in "
+                  f"in {elapsed} ms")
+            return worst
+
+        before = run("before: check on the GUI thread", False)
+        after = run("after: check on a worker", True)
+        print(f"  longest freeze: {before} ms -> {after} ms")
+
+        # Unknown usernames cost the same as wrong passwords, so they can't be told apart
+        with quiet():
+            auth.authenticate("nobody", "wrong")  # the first one also builds the dummy hash
+        for label, username in (("wrong password", "staff0"), ("unknown username", "nobody")):
+            start = time.perf_counter()
+            with quiet():
+                for _ in range(3):
+                    auth.authenticate(username, "wrong")
+            report(label, time.perf_counter() - start, 3)
+            auth.rate_limiter.record_success(username)
+
+        # The rate limiter on the happy path: one dict lookup
+        limiter = auth.LoginRateLimiter()
+        start = time.perf_counter()
+        for _ in range(100000):
+            limiter.retry_after("staff0")
+        report("rate limit check, no failures", time.perf_counter() - start, 100000)
+
+
+def bench_password_migration(accounts=100000, cost=1000):
+    """Bulk password migration of plaintext staff accounts: serial per-row updates vs batched process pool"""
+    import hash_all_passwords
+    from password_utils import PBKDF2, hash_password, verify_password
+    workers = os.cpu_count() or 1
+    print(f"Password migration benchmark ({accounts} accounts, PBKDF2 at {cost} iterations, {workers} CPU(s))")
+
+    def seed(count):
+        conn = sqlite_db.get_connection()
+        conn.execute("DELETE FROM staff")
+        conn.executemany("INSERT INTO staff (staff_id, username, password, is_admin) VALUES (?, ?, ?, 0)",
+                         [(i + 1, f"staff{i}", f"password{i}") for i in range(count)])
+        conn.commit()
+        return conn
+
+    def migrate(count, processes):
+        conn = seed(count)
+        start = time.perf_counter()
+        hash_all_passwords.hash_all_passwords(workers=processes, include_mysql=False, cost=cost)
+        return conn, time.perf_counter() - start
+
+    results = []
+    with temporary_database() as db_file, quiet():
+        original_cwd = os.getcwd()
+        os.chdir(os.path.dirname(db_file))  # passwords_hashed.txt lands here
+        try:
+            # The old tool: hash one at a time, one UPDATE per account
+            conn = seed(accounts)
+            start = time.perf_counter()
+            for staff_id, username, password in conn.execute("SELECT staff_id, username, password FROM staff").fetchall():
+                conn.execute("UPDATE staff SET password = ? WHERE staff_id = ?",
+                             (hash_password(password, algorithm=PBKDF2, cost=cost), staff_id))
+            conn.commit()
+            results.append(("before: serial, row by row", accounts, time.perf_counter() - start))
+
+            for processes in sorted({1, workers}):
+                _, elapsed = migrate(accounts, processes)
+                results.append((f"after: batched, {processes} process(es)", accounts, elapsed))
+            # The process pool path, even on a single CPU
+            conn, elapsed = migrate(2000, 2)
+            results.append(("after: batched, 2 processes", 2000, elapsed))
+            rows = conn.execute("SELECT username, password FROM staff ORDER BY staff_id").fetchall()
+
+            # An interrupted run picks up where it stopped: only plaintext rows are left to do
+            conn.execute("UPDATE staff SET password = 'password0' WHERE staff_id = 1")
+            conn.commit()
+            start = time.perf_counter()
+            hash_all_passwords.hash_all_passwords(workers=1, include_mysql=False, cost=cost)
+            resume = time.perf_counter() - start
+            resumed = conn.execute("SELECT password FROM staff WHERE staff_id = 1").fetchone()[0]
+        finally:
+            os.chdir(original_cwd)
+
+    for label, count, elapsed in results:
+        print(f"  {label:<40} {count / elapsed:9.0f} accounts/s  ({count} in {elapsed:.1f} s)")
+    print(f"  {'resume with 1 account left':<40} {resume:9.2f} s")
+    # At a real login cost the hashing dominates, so throughput scales with the processes
+    print(f"  at ~100 ms per hash, {accounts} accounts take ~{accounts * 0.1 / 60:.0f} CPU-minutes: "
+          f"~{accounts * 0.1 / 60 / workers:.0f} min with {workers} process(es), "
+          f"~{accounts * 0.1 / 60 / 8:.0f} min with 8")
+
+    if not all(verify_password(password, f"password{username[5:]}") for username, password in rows) \
+            or not verify_password(resumed, "password0"):
+        print("  migrated hashes don't verify")
+        return False
+
+
+def bench_pixmaps(iterations=100):
+    """Logo loading per page: decode and smooth-scale the PNG every time vs the QPixmapCache"""
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtGui import QPixmap, QPixmapCache
+    import image_helper
+
+    # Every logo the pages show, at the size they show it
+    logos = [("owl_logo.png", 250, 250), ("owl_logo.png", 250, 250), ("owl_logo3.png", 80, 80),
+             ("owl_logo3.png", 80, 80)] + [("owl_logo2.png", 80, 80)] * 6 + [("owl_logo2.png", 100, 100)]
+    print(f"Pixmap benchmark ({len(logos)} logos per window, {iterations} windows)")
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    def old_load(filename, width, height):
+        return QPixmap(image_helper.get_image_path(filename)).scaled(
+            width, height, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+
+    def run(label, load):
+        QPixmapCache.clear()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            pixmaps = [load(*logo) for logo in logos]
+        return report(label, time.perf_counter() - start, iterations), pixmaps
+
+    before, old_pixmaps = run("before: decode + scale per page", old_load)
+    after, new_pixmaps = run("after: load_scaled_pixmap", image_helper.load_scaled_pixmap)
+
+    # The first window still pays for each distinct logo once
+    QPixmapCache.clear()
+    start = time.perf_counter()
+    for logo in logos:
+        image_helper.load_scaled_pixmap(*logo)
+    report("after: first window (cold cache)", time.perf_counter() - start, 1)
+    print(f"  speedup: {before / after:.0f}x per window")
+
+    if [p.size() for p in old_pixmaps] != [p.size() for p in new_pixmaps]:
+        print("  cached logos differ in size from the old ones")
+        return False
+
+
+def bench_chart_refresh(refreshes=60):
+    """Strand chart refresh over a long session: new matplotlib axes + full draw each time vs StrandBarChart"""
+    from PyQt6.QtWidgets import QApplication
+    from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+    from matplotlib.figure import Figure
+    from charts import StrandBarChart
+
+    print(f"Chart refresh benchmark ({refreshes} refreshes)")
+    app = QApplication.instance() or QApplication(sys.argv)
+    strands = ["STEM", "ICT", "ABM", "GAS"]
+    # Counts change between most refreshes, as registrations come in
+    data = [[40 + i // 3, 25 + i // 5, 30, 10 + i // 7] for i in range(refreshes)]
+
+    def old_refresh(figure, canvas, counts):
+        ax = figure.add_subplot(111)
+        ax.clear()
+        ax.bar(strands, counts, color="#2356c5")
+        ax.set_ylabel("Number of Students")
+        ax.set_xlabel("Strands")
+        for i, count in enumerate(counts):
+            if count > 0:
+                ax.text(i, count + 0.5, str(count), ha='center')
+        canvas.draw()
+
+    def timed(label, refresh):
+        times = []
+        for counts in data:
+            start = time.perf_counter()
+            refresh(counts)
+            app.processEvents()  # runs the idle draw
+            times.append(time.perf_counter() - start)
+        tail = max(1, refreshes // 10)
+        first, last = sum(times[:tail]) / tail, sum(times[-tail:]) / tail
+        print(f"  {label:<34} first {first * 1000:7.2f} ms   last {last * 1000:7.2f} ms   "
+              f"total {sum(times):.2f} s")
+        return last
+
+    figure = Figure(figsize=(5, 3))
+    canvas = FigureCanvas(figure)
+    before = timed("before: add_subplot + clear + draw", lambda counts: old_refresh(figure, canvas, counts))
+    print(f"    axes on the figure afterwards: {len(figure.axes)}")
+
+    class CountingChart(StrandBarChart):
+        paints = 0
+
+        def paintEvent(self, event):
+            CountingChart.paints += 1
+            super().paintEvent(event)
+
+    chart = CountingChart()
+    chart.resize(500, 300)
+    chart.show()
+    app.processEvents()
+    CountingChart.paints = 0
+    after = timed("after: StrandBarChart.set_data", lambda counts: chart.set_data(strands, counts))
+    unchanged = timed("after: refresh with unchanged data", lambda counts: chart.set_data(strands, data[-1]))
+    print(f"    repaints: {CountingChart.paints} for {2 * refreshes} refreshes")
+    print(f"  late-session speedup: {before / after:.1f}x")
+    chart.close()
+
+    if chart.values != data[-1] or unchanged > after:
+        print("  chart does not show the latest counts")
+        return False
+
+
+def bench_import_time(runs=3):
+    """Cost of importing main.py (python -X importtime), with and without matplotlib at startup"""
+    import subprocess
+    print(f"Import time benchmark ({runs} runs each, -X importtime)")
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    # main.py imports image_helper through the package folder, so its parent goes on the path too
+    env["PYTHONPATH"] = os.pathsep.join([os.path.dirname(repo_dir), repo_dir, env.get("PYTHONPATH", "")])
+
+    def import_time(script):
+        """Smallest total over the runs of the top-level imports' cumulative times, in seconds"""
+        totals = []
+        for _ in range(runs):
+            result = subprocess.run([sys.executable, "-X", "importtime", "-c", script], cwd=repo_dir, env=env,
+                                    capture_output=True, text=True)
+            total_us = 0
+            for line in result.stderr.splitlines():
+                # "import time:       self |   cumulative | <one space per nesting level>module"
+                if line.startswith("import time:") and "|" in line:
+                    _, cumulative, name = line.split("|")
+                    if cumulative.strip().isdigit() and not name[1:].startswith(" "):
+                        total_us += int(cumulative)
+            totals.append(total_us / 1e6)
+        return min(totals), result.stdout
+
+    check = "\nimport sys; print('MATPLOTLIB_LOADED', 'matplotlib' in sys.modules)"
+    before, _ = import_time("import matplotlib.figure, matplotlib.backends.backend_qt5agg\nimport main")
+    after, loaded = import_time("import main" + check)
+    report("before: main + matplotlib", before, 1)
+    report("after: main (native charts)", after, 1)
+    print(f"  saved {(before - after) * 1000:.0f} ms of imports per launch")
+
+    if "MATPLOTLIB_LOADED False" not in loaded:
+        print("  importing main still loads matplotlib")
+        return False
+
+
+def bench_page_navigation():
+    """Registration flow clicks: each page built on the click vs prewarmed while the one before shows"""
+    from PyQt6.QtWidgets import QApplication, QMessageBox
+    from PyQt6.QtCore import QThreadPool
+    import pages
+
+    flow = ["email", "personal_info", "family", "academic", "emergency", "confirmation", "reference"]
+    print(f"Page navigation benchmark ({len(flow)} steps from the dashboard, offscreen)")
+    app = QApplication.instance() or QApplication(sys.argv)
+    QMessageBox.warning = QMessageBox.critical = staticmethod(lambda *args, **kwargs: None)
+
+    def idle(seconds):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            app.processEvents()
+
+    def walk(prewarm):
+        """Seconds spent in the page switches of one registration"""
+        window = main.MainWindow()
+        window.show()
+        total = 0
+        for name in flow:
+            if prewarm:
+                # The student spends a moment on each page - long enough to build the next one
+                idle(pages.PREWARM_DELAY_MS / 1000 + 0.1)
+            start = time.perf_counter()
+            window.show_page(name)
+            app.processEvents()
+            total += time.perf_counter() - start
+        built = sum(window.pages.is_built(name) for name in window.pages.names())
+        window.close()
+        return total, built
+
+    with temporary_database(), quiet():
+        import main
+        start = time.perf_counter()
+        window = main.MainWindow()
+        first_page = time.perf_counter() - start
+        # Import every page module and fill the pixmap cache, so both walks below start equal
+        for name in window.pages.names():
+            window.pages.get(name)
+        eager = time.perf_counter() - start
+        window.close()
+        on_click, _ = walk(prewarm=False)
+        prewarmed, built = walk(prewarm=True)
+        # The windows' startup connection checks report back to them; let them finish first
+        QThreadPool.globalInstance().waitForDone()
+
+    report("MainWindow() with only the first page", first_page, 1)
+    report("MainWindow() + every page (as before)", eager, 1)
+    report("clicks, pages built on the click", on_click, len(flow))
+    report("clicks, pages prewarmed", prewarmed, len(flow))
+    print(f"  {built} of {len(window.pages.names())} pages built after one registration")
+
+
+def bench_page_construction(iterations=10):
+    """Building and showing every page: a style sheet parsed per widget vs roles on the app stylesheet"""
+    import re
+    import importlib
+    from PyQt6.QtWidgets import QApplication, QMessageBox
+    from PyQt6.QtCore import QEvent
+    import theme
+
+    page_classes = [("dashboard_login", "DashboardLoginScreen"), ("student_email", "StudentEmailScreen"),
+                    ("personal_info", "StudentGeneralInfoScreen"), ("form2_family", "FamilyForm"),
+                    ("form3_academic", "Form3Academic"), ("form4_emergency", "EmergencyForm"),
+                    ("form5_confirmation", "ConfirmationForm"), ("reference_code_screen", "ReferenceCodeScreen"),
+                    ("success_screen", "SuccessScreen"), ("admin_list", "AdminDashboard")]
+    print(f"Page construction benchmark ({len(page_classes)} pages, {iterations} rounds, offscreen)")
+    app = QApplication.instance() or QApplication(sys.argv)
+    QMessageBox.warning = QMessageBox.critical = staticmethod(lambda *args, **kwargs: None)
+
+    # The old per-widget sheets: each role's rules with the role taken out of the selectors
+    per_role = {}
+    stylesheet = re.sub(r"/\*.*?\*/", "", theme.STYLESHEET, flags=re.S)
+    for selectors, body in re.findall(r"([^{}]+)\{([^}]*)\}", stylesheet):
+        for selector in selectors.split(","):
+            for role in set(re.findall(r'\[role="([^"]+)"\]', selector)):
+                bare_selector = selector.replace(f'[role="{role}"]', "").strip()
+                per_role.setdefault(role, []).append(f"{bare_selector} {{{body}}}")
+    sheets = {role: "\n".join(rules) for role, rules in per_role.items()}
+    set_style_property = theme.set_style_property
+
+    def per_widget(widget, name, value):
+        widget.setStyleSheet(sheets[value])
+        return widget
+
+    def build_all():
+        for module_name, class_name in page_classes:
+            page = getattr(importlib.import_module(module_name), class_name)()
+            page.show()
+            app.processEvents()
+            page.close()
+            page.deleteLater()
+        # processEvents() leaves deleteLater() to the event loop; delete the pages now
+        app.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+    def timed(func, *args):
+        start = time.perf_counter()
+        func(*args)
+        return time.perf_counter() - start
+
+    def build_rounds():
+        for _ in range(iterations):
+            build_all()
+
+    with temporary_database(), quiet():
+        # Import the modules and fill the pixmap cache first, so neither run pays for that
+        build_all()
+        try:
+            app.setStyleSheet("")
+            theme.set_style_property = per_widget
+            before_secs = timed(build_rounds)
+        finally:
+            theme.set_style_property = set_style_property
+        theme_secs = timed(theme.apply_theme, app)
+        after_secs = timed(build_rounds)
+
+    pages_built = iterations * len(page_classes)
+    before = report("before: setStyleSheet per widget", before_secs, pages_built)
+    report("after: apply_theme (once per process)", theme_secs, 1)
+    after = report("after: roles on the app stylesheet", after_secs, pages_built)
+    print(f"  speedup: {before / after:.1f}x per page")
+
+
+def bench_confirmation_summary(visits=200):
+    """Reaching the confirmation page again: rebuild the whole summary vs diff it into the existing rows"""
+    import copy
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QEvent
+    import form5_confirmation
+    import theme
+
+    print(f"Confirmation summary benchmark ({visits} visits, offscreen)")
+    app = QApplication.instance() or QApplication(sys.argv)
+    theme.apply_theme(app)
+    data = sample_form_data(1)
+    # A student who went back and fixed one field between two visits
+    edited = copy.deepcopy(data)
+    edited["personal"]["mobile"] = "09998887777"
+    visit_data = [data, edited]
+
+    with quiet():
+        page = form5_confirmation.ConfirmationForm()
+        page.resize(1280, 900)
+        page.show()
+
+        def visit(rebuild, form_data):
+            if rebuild:
+                # What update_data() used to do: a new summary widget, every section and row again
+                page.summary_widget = page.build_summary()
+                page.scroll.setWidget(page.summary_widget)
+            page.update_data(form_data)
+            app.processEvents()
+
+        def run(rebuild):
+            start = time.perf_counter()
+            for i in range(visits):
+                visit(rebuild, visit_data[i % 2])
+                app.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+            return time.perf_counter() - start
+
+        visit(False, data)
+        before_secs = run(True)
+        after_secs = run(False)
+        shown = [[row.text() for row in section.rows.values()] for section in page.sections.values()]
+        fresh = form5_confirmation.ConfirmationForm()
+        fresh.update_data(visit_data[(visits - 1) % 2])
+        expected = [[row.text() for row in section.rows.values()] for section in fresh.sections.values()]
+        page.close()
+
+    before = report("before: rebuild the summary per visit", before_secs, visits)
+    after = report("after: diff into the existing rows", after_secs, visits)
+    print(f"  speedup: {before / after:.0f}x per visit")
+    if shown != expected:
+        print("  the diffed summary differs from a freshly built one")
+        return False
+
+
+# The calls behind the admin and staff dashboards. check_query_plans() runs each one
+# and EXPLAINs every SELECT it sends, so the check follows the SQL the app really runs.
+# The last item lists plan steps that are fine for that call
+DASHBOARD_CALLS = [
+    ("student list page", partial(sqlite_db.query_students), ()),
+    ("student list page by strand", partial(sqlite_db.query_students, strand="STEM"), ()),
+    ("student list page by name", partial(sqlite_db.query_students, sort_key="name"), ()),
+    ("student list page by type", partial(sqlite_db.query_students, sort_key="enrollment_type"), ()),
+    # ST-0 covers at most 1000 students, so sorting them is cheap
+    ("student number", partial(sqlite_db.query_students, "ST-0"), ("USE TEMP B-TREE FOR ORDER BY",)),
+    # Searches sort their matches; the index itself is checked separately below
+    ("search", partial(sqlite_db.query_students, "juan s"), ("USE TEMP B-TREE FOR ORDER BY",)),
+    ("search + strand", partial(sqlite_db.query_students, "juan s", "STEM"), ("USE TEMP B-TREE FOR ORDER BY",)),
+    # Misses the word index and falls back to trigrams
+    ("fuzzy search + strand", partial(sqlite_db.query_students, "juann santoss", "STEM"),
+     ("USE TEMP B-TREE FOR ORDER BY", "CO-ROUTINE", "SCAN (subquery")),
+    ("dashboard metrics", sqlite_db.get_dashboard_metrics, ()),
+    # Groups two weeks of registrations, read off the date index
+    ("registration trend", sqlite_db.get_registration_trend, ("USE TEMP B-TREE FOR GROUP BY",)),
+    ("student details", partial(sqlite_db.get_student_details, "SEED0000001"), ()),
+    ("staff list", lambda: sqlite_db.get_connection().execute(sqlite_db.STAFF_LIST_SQL).fetchall(), ()),
+]
+
+
+# Fixed-size tables that are fine to read end to end (a handful of rows at most)
+SUMMARY_TABLES = {"student_metrics"}
+
+
+def check_query_plans(students=20000):
+    """Fail if a dashboard query scans a whole table, sorts in a temp B-tree or searches per row"""
+    print(f"Query plan check ({students} students)")
+    failures = 0
+    with temporary_database():
+        seed_students(students)
+        # No ANALYZE: the kiosks never run it, so the planner works without statistics there too
+        conn = sqlite_db.get_connection()
+
+        for label, call, allowed in DASHBOARD_CALLS:
+            sqlite_db.invalidate_student_details()
+            statements = []
+            conn.set_trace_callback(statements.append)
+            try:
+                call()
+            finally:
+                conn.set_trace_callback(None)
+
+            # FTS5's own lookups show up in the trace as "-- ..." comments
+            queries = [sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]
+            if not queries:
+                print(f"  FAIL  {label:<30} ran no queries")
+                failures += 1
+            for query in queries:
+                plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + query)]
+                # "SCAN students" reads every row; "SCAN students USING INDEX ..." walks an index in order
+                bad = [step for step in plan
+                       if not step.startswith(allowed)
+                       and ((step.startswith("SCAN ") and " USING " not in step and " VIRTUAL TABLE" not in step
+                             and step.split()[1] not in SUMMARY_TABLES)
+                            or "TEMP B-TREE" in step)]
+                # A search has to be driven by its full-text index - as an inner loop
+                # it runs the MATCH once per student
+                if " MATCH " in query:
+                    index_step = next((i for i, step in enumerate(plan) if "VIRTUAL TABLE" in step), len(plan))
+                    bad += [step for step in plan[:index_step] if step.split()[1:2] == ["s"]]
+                status = "FAIL" if bad else "ok"
+                print(f"  {status:<5} {label:<30} {' | '.join(plan)}")
+                failures += bool(bad)
+
+    if failures:
+        print(f"  {failures} dashboard queries fall back to a table scan, a temp sort or a per-row search")
+        return False
+    print("  every dashboard query uses an index")
+    return True
+
+
+def check_connection_pool():
+    """Fail if the MySQL pool mishandles exhaustion, idle eviction, stale pings or dirty releases, or ensure_database() doesn't back off (no server needed)"""
+    import mysql_db
+    from pymysql.constants import SERVER_STATUS
+    print("Connection pool check (fake pymysql connections)")
+    failures = []
+
+    class FakeConnection:
+        """Stands in for a pymysql connection, counting what the pool does to it"""
+        def __init__(self):
+            self.open = True
+            self.server_status = SERVER_STATUS.SERVER_STATUS_AUTOCOMMIT
+            self.stale = False
+            self.fail_rollback = False
+            self.pings = 0
+            self.rollbacks = 0
+
+        def ping(self, reconnect=True):
+            self.pings += 1
+            if self.stale:
+                raise ConnectionError("server has gone away")
+
+        def rollback(self):
+            self.rollbacks += 1
+            if self.fail_rollback:
+                raise ConnectionError("server has gone away")
+            self.server_status &= ~SERVER_STATUS.SERVER_STATUS_IN_TRANS
+
+        def close(self):
+            self.open = False
+
+    def make_pool(**settings):
+        pool = mysql_db.ConnectionPool({}, **settings)
+        pool.opened = []
+        def connect():
+            conn = FakeConnection()
+            pool.opened.append(conn)
+            return conn
+        pool._connect = connect
+        return pool
+
+    def check(label, ok):
+        print(f"  {'ok' if ok else 'FAIL':<5} {label}")
+        if not ok:
+            failures.append(label)
+
+    # Exhaustion: the next borrower waits out the timeout, then fails; a release frees a slot again
+    pool = make_pool(max_size=2, borrow_timeout=0.1)
+    first, second = pool.acquire(), pool.acquire()
+    start = time.perf_counter()
+    try:
+        pool.acquire()
+        timed_out = False
+    except mysql_db.PoolTimeoutError:
+        timed_out = True
+    waited = time.perf_counter() - start
+    check(f"borrow times out when the pool is exhausted (waited {waited * 1000:.0f} ms)",
+          timed_out and waited >= 0.1)
+    threading.Timer(0.05, pool.release, (first,)).start()
+    check("a waiting borrower gets the next released connection", pool.acquire(timeout=1) is first)
+    pool.release(first)
+    pool.release(second)
+    check("no connections opened past max_size", len(pool.opened) == 2)
+
+    # Idle eviction: a connection unused past idle_timeout is closed instead of handed out
+    pool = make_pool(idle_timeout=0.05, ping_after=60)
+    conn = pool.acquire()
+    pool.release(conn)
+    time.sleep(0.1)
+    fresh = pool.acquire()
+    check("idle connections are closed after idle_timeout", not conn.open and fresh is not conn)
+    pool.release(fresh)
+    check("evicted connections free their slot", pool._open_count == 1)
+
+    # Ping before reuse: only after ping_after idle seconds, and a stale connection is replaced
+    pool = make_pool(idle_timeout=60, ping_after=0.05)
+    conn = pool.acquire()
+    pool.release(conn)
+    pool.release(pool.acquire())
+    check("recently used connections are reused without a ping", conn.pings == 0)
+    time.sleep(0.1)
+    reused = pool.acquire()
+    check("connections idle past ping_after are pinged before reuse", reused is conn and conn.pings == 1)
+    pool.release(reused)
+    time.sleep(0.1)
+    conn.stale = True
+    with quiet():
+        replacement = pool.acquire()
+    check("a connection that fails its ping is closed and replaced",
+          replacement is not conn and not conn.open and replacement.open)
+    pool.release(replacement)
+
+    # Rollback on release: the next borrower never inherits an open transaction
+    pool = make_pool()
+    conn = pool.acquire()
+    conn.server_status |= SERVER_STATUS.SERVER_STATUS_IN_TRANS
+    pool.release(conn)
+    reused = pool.acquire()
+    check("a connection released mid-transaction is rolled back and kept",
+          reused is conn and conn.rollbacks == 1 and conn.open)
+    conn.server_status |= SERVER_STATUS.SERVER_STATUS_IN_TRANS
+    conn.fail_rollback = True
+    pool.release(conn)
+    check("a connection whose rollback fails is discarded", not conn.open and pool._open_count == 0)
+
+    # ensure_database() while MySQL is down: one attempt for concurrent callers, then a backoff
+    attempts = []
+    def unreachable():
+        attempts.append(1)
+        time.sleep(0.1)
+        return False
+    original = (mysql_db.create_database, mysql_db._database_ready, mysql_db.DATABASE_RETRY_DELAY)
+    mysql_db.create_database, mysql_db._database_ready, mysql_db.DATABASE_RETRY_DELAY = unreachable, False, 0.2
+    try:
+        callers = [threading.Thread(target=mysql_db.ensure_database) for _ in range(5)]
+        with quiet():
+            for caller in callers:
+                caller.start()
+            for caller in callers:
+                caller.join()
+        check("concurrent ensure_database() calls make one attempt", len(attempts) == 1)
+        start = time.perf_counter()
+        ready = mysql_db.ensure_database()
+        check("ensure_database() fails fast during the backoff",
+              not ready and len(attempts) == 1 and time.perf_counter() - start < 0.05)
+        time.sleep(0.25)
+        with quiet():
+            mysql_db.ensure_database()
+        check("ensure_database() tries again once the backoff has passed", len(attempts) == 2)
+    finally:
+        mysql_db.create_database, mysql_db._database_ready, mysql_db.DATABASE_RETRY_DELAY = original
+        mysql_db._clear_database_backoff()
+
+    if failures:
+        print(f"  {len(failures)} connection pool checks failed")
+        return False
+    print("  connection pool behaves")
+    return True
+
+
+STARTUP_SCRIPT = """
+import sys, time
+from PyQt6.QtWidgets import QApplication, QMessageBox
+import mysql_db
+# A TEST-NET address nothing answers on, so every MySQL attempt runs into its timeout
+mysql_db.MYSQL_CONFIG["host"] = mysql_db.MYSQL_CONFIG_NO_DB["host"] = "192.0.2.1"
+# Startup warnings are modal; answer them immediately so nothing waits on a click
+QMessageBox.warning = QMessageBox.critical = staticmethod(lambda *args, **kwargs: None)
+app = QApplication(sys.argv)
+import theme
+theme.apply_theme(app)
+import main
+window = main.MainWindow()
+window.show()
+app.processEvents()
+print("WINDOW_SHOWN", flush=True)
+"""
+
+
+def bench_startup(runs=3):
+    """Time from launching the app to the first window on screen, with MySQL down"""
+    import subprocess
+    print(f"Startup benchmark ({runs} runs, offscreen, MySQL unreachable)")
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    # main.py imports image_helper through the package folder, so its parent goes on the path too
+    env["PYTHONPATH"] = os.pathsep.join([os.path.dirname(repo_dir), repo_dir, env.get("PYTHONPATH", "")])
+
+    timings = []
+    with temporary_database() as db_file:
+        script = f"import sqlite_db; sqlite_db.DB_FILE = {db_file!r}\n" + STARTUP_SCRIPT
+        for _ in range(runs):
+            start = time.perf_counter()
+            process = subprocess.Popen([sys.executable, "-c", script], cwd=repo_dir, env=env,
+                                       stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+            for line in process.stdout:
+                # The background database checks print too, sometimes onto the same line
+                if "WINDOW_SHOWN" in line:
+                    timings.append(time.perf_counter() - start)
+                    break
+            process.kill()
+            process.wait()
+
+    if len(timings) < runs:
+        print("  the window never appeared - see the app's own output for the error")
+        return
+    report("time to first window", sum(timings), runs)
+
+
+BENCHMARKS = {
+    "connection_open": bench_connection_open,
+    "registrations": bench_registrations,
+    "dashboard_metrics": bench_dashboard_metrics,
+    "dual_write": bench_dual_write,
+    "startup": bench_startup,
+    "bulk_import": bench_bulk_import,
+    "query_plans": check_query_plans,
+    "connection_pool": check_connection_pool,
+    "student_table": bench_student_table,
+    "student_query": bench_student_query,
+    "student_search": bench_student_search,
+    "search_typing": bench_search_typing,
+    "student_details": bench_student_details,
+    "reference_codes": bench_reference_codes,
+    "password_hashing": bench_password_hashing,
+    "login": bench_login,
+    "password_migration": bench_password_migration,
+    "pixmaps": bench_pixmaps,
+    "chart_refresh": bench_chart_refresh,
+    "import_time": bench_import_time,
+    "page_navigation": bench_page_navigation,
+    "page_construction": bench_page_construction,
+    "confirmation_summary": bench_confirmation_summary,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:]
+    if not names:
+        print("Available benchmarks:")
+        for name, func in BENCHMARKS.items():
+            print(f"  {name:<20} {func.__doc__}")
+        sys.exit(0)
+
+    failed = False
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name}")
+            sys.exit(1)
+        # Checks return False when they fail
+        if BENCHMARKS[name]() is False:
+            failed = True
+        print()
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,156 @@
+"""
+Dashboard charts for OwlReg
+The strand and registration charts are painted with QPainter, so the
+dashboards don't load matplotlib when the app starts. A refresh stores
+the new values and calls update(); Qt repaints once when it is idle, and
+refreshing with unchanged values does nothing
+"""
+import math
+from PyQt6.QtWidgets import QWidget, QSizePolicy
+from PyQt6.QtGui import QPainter, QColor, QPen, QPolygonF
+from PyQt6.QtCore import Qt, QRectF, QPointF, QSize
+
+BAR_COLOR = "#2356c5"
+AXIS_COLOR = "#444444"
+GRID_COLOR = "#dddddd"
+# Room above the tallest value for its label
+HEADROOM = 1.15
+
+
+def nice_step(top, ticks=5):
+    """A round tick step (1, 2 or 5 times a power of ten) that splits 0..top into about `ticks` parts"""
+    raw = max(top, 1) / ticks
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for multiple in (1, 2, 5, 10):
+        if raw <= multiple * magnitude:
+            # Counts are whole numbers, so the step is too
+            return max(1, int(multiple * magnitude))
+
+
+class Chart(QWidget):
+    """Axes, gridlines and axis labels shared by the dashboard charts; subclasses draw the values"""
+    # left, top, right, bottom - room for the tick and axis labels
+    MARGINS = (60, 12, 16, 44)
+    EMPTY_MESSAGE = "No data available"
+
+    def __init__(self, x_label, y_label="Number of Students", color=BAR_COLOR, parent=None):
+        super().__init__(parent)
+        self.x_label = x_label
+        self.y_label = y_label
+        self.color = QColor(color)
+        self.labels = []
+        self.values = []
+        self.setMinimumSize(300, 200)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+
+    def sizeHint(self):
+        return QSize(500, 300)
+
+    def set_data(self, labels, values):
+        """Show `values` against `labels`; does nothing if they haven't changed"""
+        labels, values = list(labels), list(values)
+        if labels == self.labels and values == self.values:
+            return
+        self.labels, self.values = labels, values
+        self.update()
+
+    def x_position(self, plot, index):
+        """Centre of the index-th category along the x axis"""
+        return plot.left() + (index + 0.5) * plot.width() / len(self.labels)
+
+    def y_position(self, plot, value, y_max):
+        return plot.bottom() - value / y_max * plot.height()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.fillRect(self.rect(), Qt.GlobalColor.white)
+
+        left, top, right, bottom = self.MARGINS
+        plot = QRectF(left, top, self.width() - left - right, self.height() - top - bottom)
+        if plot.width() <= 0 or plot.height() <= 0:
+            return
+        metrics = painter.fontMetrics()
+        line_height = metrics.height()
+        painter.setPen(QColor(AXIS_COLOR))
+
+        if not self.labels:
+            painter.drawText(plot, Qt.AlignmentFlag.AlignCenter, self.EMPTY_MESSAGE)
+            return
+
+        # Round the top of the y axis up to a whole tick
+        top_value = max(max(self.values) * HEADROOM, 1)
+        step = nice_step(top_value)
+        y_max = math.ceil(top_value / step) * step
+
+        for tick in range(0, y_max + 1, step):
+            y = self.y_position(plot, tick, y_max)
+            painter.setPen(QColor(GRID_COLOR))
+            painter.drawLine(QPointF(plot.left(), y), QPointF(plot.right(), y))
+            painter.setPen(QColor(AXIS_COLOR))
+            painter.drawText(QRectF(0, y - line_height / 2, left - 6, line_height),
+                             Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, str(tick))
+
+        painter.drawLine(plot.bottomLeft(), plot.bottomRight())
+        painter.drawLine(plot.topLeft(), plot.bottomLeft())
+
+        # Category labels, every few of them when they don't all fit
+        slot = plot.width() / len(self.labels)
+        widest = max(metrics.horizontalAdvance(str(label)) for label in self.labels) + 8
+        every = math.ceil(widest / slot)
+        for i, label in enumerate(self.labels):
+            if i % every == 0:
+                x = self.x_position(plot, i)
+                painter.drawText(QRectF(x - widest / 2, plot.bottom() + 2, widest, line_height),
+                                 Qt.AlignmentFlag.AlignCenter, str(label))
+
+        painter.drawText(QRectF(plot.left(), self.height() - line_height - 2, plot.width(), line_height),
+                         Qt.AlignmentFlag.AlignCenter, self.x_label)
+        painter.save()
+        painter.translate(line_height / 2 + 2, plot.center().y())
+        painter.rotate(-90)
+        painter.drawText(QRectF(-plot.height() / 2, -line_height / 2, plot.height(), line_height),
+                         Qt.AlignmentFlag.AlignCenter, self.y_label)
+        painter.restore()
+
+        self.draw_values(painter, plot, y_max)
+
+    def draw_values(self, painter, plot, y_max):
+        raise NotImplementedError
+
+
+class StrandBarChart(Chart):
+    """Bar chart of students per strand, with each bar's count above it"""
+    EMPTY_MESSAGE = "No strand data available"
+
+    def __init__(self, parent=None, color=BAR_COLOR):
+        super().__init__("Strands", color=color, parent=parent)
+
+    def draw_values(self, painter, plot, y_max):
+        bar_width = plot.width() / len(self.labels) * 0.8
+        line_height = painter.fontMetrics().height()
+        for i, count in enumerate(self.values):
+            x = self.x_position(plot, i)
+            y = self.y_position(plot, count, y_max)
+            painter.fillRect(QRectF(x - bar_width / 2, y, bar_width, plot.bottom() - y), self.color)
+            if count > 0:
+                painter.setPen(QColor(AXIS_COLOR))
+                painter.drawText(QRectF(x - bar_width / 2, y - line_height - 2, bar_width, line_height),
+                                 Qt.AlignmentFlag.AlignCenter, str(count))
+
+
+class RegistrationTrendChart(Chart):
+    """Line chart of registrations per day"""
+    EMPTY_MESSAGE = "No registrations yet"
+
+    def __init__(self, parent=None, color=BAR_COLOR):
+        super().__init__("Date", y_label="Registrations", color=color, parent=parent)
+
+    def draw_values(self, painter, plot, y_max):
+        points = [QPointF(self.x_position(plot, i), self.y_position(plot, count, y_max))
+                  for i, count in enumerate(self.values)]
+        painter.setPen(QPen(self.color, 2))
+        painter.drawPolyline(QPolygonF(points))
+        painter.setBrush(self.color)
+        for point in points:
+            painter.drawEllipse(point, 3, 3)
@@ -1,17 +1,17 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QStackedLayout, QLineEdit, QComboBox, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox, QDialog, QFormLayout, QGroupBox, QScrollArea, QFrame, QSizePolicy
-from PyQt6.QtGui import QPixmap, QFont
-from PyQt6.QtCore import Qt, pyqtSignal
-from OwlReg.image_helper import load_pixmap  # Fixed import path
-import sqlite3
-import os
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QStackedLayout, QLineEdit, QComboBox, QTableView, QHeaderView, QMessageBox, QDialog, QFormLayout, QGroupBox, QScrollArea, QFrame, QSizePolicy
+from PyQt6.QtGui import QFont
+from PyQt6.QtCore import Qt, QTimer, QThreadPool, pyqtSignal
+from OwlReg.image_helper import load_scaled_pixmap  # Fixed import path
+from charts import StrandBarChart, RegistrationTrendChart
 from datetime import datetime
 import traceback
-from password_utils import verify_password  # Import password verification function
-
-# Get database path
-DB_FILE = os.path.join(os.path.dirname(__file__), "student_records.db")
+from functools import partial
+from auth import authenticate  # Shared staff/admin sign-in
+from workers import Worker
+from sqlite_db import get_dashboard_metrics, get_registration_trend, REGISTRATION_TREND_DAYS, get_student_details, query_students  # Shared SQLite queries
+from student_table_model import StudentTableModel, SEARCH_DEBOUNCE_MS
+from reference_codes import normalize_reference_code
+from theme import set_role
 
 
 class DashboardLoginScreen(QWidget):
@@ -22,7 +22,7 @@ class DashboardLoginScreen(QWidget):
 
     def __init__(self):
         super().__init__()
-        self.setStyleSheet("background-color: #2356c5;")
+        set_role(self, "brand-page")
 
         layout = QVBoxLayout()
         layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -30,11 +30,8 @@ class DashboardLoginScreen(QWidget):
 
         # Logo
         # Using our image helper to load the logo safely
-        pixmap = load_pixmap("owl_logo.png")
         logo = QLabel()
-        logo.setPixmap(
-            pixmap.scaled(250, 250, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        )
+        logo.setPixmap(load_scaled_pixmap("owl_logo.png", 250, 250))
         logo.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(logo)
         layout.addSpacing(40)
@@ -42,56 +39,112 @@ class DashboardLoginScreen(QWidget):
         # Title
         title = QLabel("Welcome to OwlReg")
         title.setFont(QFont("Arial", 24, QFont.Weight.Bold))
-        title.setStyleSheet("color: white;")
+        set_role(title, "white-text")
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(title)
         layout.addSpacing(30)
 
         # Buttons
-        button_style = """
-            QPushButton {
-                background-color: white;
-                color: #2356c5;
-                border: none;
-                padding: 12px;
-                border-radius: 6px;
-                font-weight: bold;
-                font-size: 14px;
-                min-width: 300px;
-            }
-            QPushButton:hover {
-                background-color: #f0f0f0;
-            }
-        """
-
         register_student = QPushButton("Register for Student")
-        register_student.setStyleSheet(button_style)
+        set_role(register_student, "kiosk-button")
         register_student.clicked.connect(self.student_register_clicked.emit)
         layout.addWidget(register_student, alignment=Qt.AlignmentFlag.AlignCenter)
         layout.addSpacing(15)
 
         register_staff = QPushButton("Login as Staff")
-        register_staff.setStyleSheet(button_style)
+        set_role(register_staff, "kiosk-button")
         register_staff.clicked.connect(self.staff_login_clicked.emit)  # Connect to new signal
         layout.addWidget(register_staff, alignment=Qt.AlignmentFlag.AlignCenter)
         layout.addSpacing(15)
 
         admin_login = QPushButton("Login as Admin")
-        admin_login.setStyleSheet(button_style)
+        set_role(admin_login, "kiosk-button")
         admin_login.clicked.connect(self.admin_login_clicked.emit)
         layout.addWidget(admin_login, alignment=Qt.AlignmentFlag.AlignCenter)
 
         self.setLayout(layout)
 
 
-class StaffLoginDialog(QDialog):
+class LoginDialog(QDialog):
+    """
+    Sign-in behaviour shared by the staff and admin login dialogs
+    The password check runs on a worker thread while the dialog shows it's busy
+    """
+    login_successful = pyqtSignal(dict)  # Signal to emit the account data upon successful login
+    IS_ADMIN = False
+    INVALID_MESSAGE = "Invalid username or password"
+
+    login_worker = None  # Worker checking the current attempt, if any
+
+    def attempt_login(self):
+        """Check the entered credentials on a worker thread"""
+        if self.login_worker is not None:
+            return  # Already signing in
+
+        username = self.username_field.text().strip()
+        password = self.password_field.text()
+
+        if not username or not password:
+            self.error_label.setText("Please enter both username and password")
+            return
+
+        print(f"Attempting {'admin' if self.IS_ADMIN else 'staff'} login with username: {username}")
+        self.set_busy(True)
+        self.login_worker = Worker(authenticate, username, password, self.IS_ADMIN)
+        self.login_worker.signals.finished.connect(self.on_login_finished)
+        self.login_worker.signals.error.connect(self.on_login_error)
+        QThreadPool.globalInstance().start(self.login_worker)
+
+    def set_busy(self, busy):
+        """Lock the form while an attempt is being checked"""
+        self.username_field.setEnabled(not busy)
+        self.password_field.setEnabled(not busy)
+        self.login_button.setEnabled(not busy)
+        self.login_button.setText("Signing in..." if busy else "Login")
+        if busy:
+            self.error_label.setText("")
+
+    def on_login_finished(self, result):
+        """Back on the GUI thread: log in, or say why not"""
+        self.login_worker = None
+        account, locked_for = result
+        if account is not None:
+            print("Authentication successful, emitting login_successful signal")
+            self.login_successful.emit(account)
+            self.accept()  # Close the dialog with accept status
+            return
+
+        self.set_busy(False)
+        if locked_for:
+            self.error_label.setText(f"Too many failed attempts. Try again in {max(1, round(locked_for))} seconds")
+        else:
+            print("Authentication failed")
+            self.error_label.setText(self.INVALID_MESSAGE)
+        self.password_field.clear()
+        self.password_field.setFocus()
+
+    def on_login_error(self, message):
+        """Back on the GUI thread: the check itself failed (e.g. the database is unavailable)"""
+        self.login_worker = None
+        self.set_busy(False)
+        self.error_label.setText(f"Login error: {message}")
+
+    def reject(self):
+        """Cancel, ignoring the outcome of an attempt still being checked"""
+        if self.login_worker is not None:
+            self.login_worker.signals.finished.disconnect(self.on_login_finished)
+            self.login_worker.signals.error.disconnect(self.on_login_error)
+            self.login_worker = None
+        super().reject()
+
+
+class StaffLoginDialog(LoginDialog):
     """Dialog for staff login"""
-    login_successful = pyqtSignal(dict)  # Signal to emit staff data upon successful login
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Staff Login")
-        self.setStyleSheet("background-color: white; font-family: Arial;")
+        set_role(self, "dashboard-window")
         self.setFixedSize(400, 320)
         self.setWindowFlags(self.windowFlags() & ~Qt.WindowType.WindowContextHelpButtonHint)
 
@@ -138,135 +191,37 @@ class StaffLoginDialog(QDialog):
         button_layout.setSpacing(15)
 
         # Login button
-        login_button = QPushButton("Login")
-        login_button.setStyleSheet("""
-            QPushButton {
-                background-color: #2356c5;
-                color: white;
-                padding: 10px;
-                border-radius: 5px;
-                font-weight: bold;
-                min-height: 36px;
-            }
-            QPushButton:hover {
-                background-color: #1a3f8e;
-            }
-        """)
-        login_button.clicked.connect(self.attempt_login)
+        self.login_button = QPushButton("Login")
+        set_role(self.login_button, "login-button")
+        self.login_button.clicked.connect(self.attempt_login)
 
         # Cancel button
         cancel_button = QPushButton("Cancel")
-        cancel_button.setStyleSheet("""
-            QPushButton {
-                padding: 10px;
-                border-radius: 5px;
-                min-height: 36px;
-            }
-        """)
+        set_role(cancel_button, "dialog-button")
         cancel_button.clicked.connect(self.reject)
 
-        button_layout.addWidget(login_button)
+        button_layout.addWidget(self.login_button)
         button_layout.addWidget(cancel_button)
         layout.addLayout(button_layout)
 
         # Error message label
         self.error_label = QLabel("")
-        self.error_label.setStyleSheet("color: red;")
+        set_role(self.error_label, "error-text")
         self.error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.error_label)
 
         self.setLayout(layout)
 
-    def attempt_login(self):
-        """Attempt to log in with the provided credentials"""
-        username = self.username_field.text().strip()
-        password = self.password_field.text()
-
-        if not username or not password:
-            self.error_label.setText("Please enter both username and password")
-            return
 
-        try:
-            # Connect to the database directly
-            conn = sqlite3.connect(DB_FILE)
-            cursor = conn.cursor()
-
-            # Print debug information to terminal
-            print(f"Attempting staff login with username: {username}")
-
-            # Check for user in staff table with exact password match (not admin)
-            cursor.execute("""
-                SELECT * FROM staff 
-                WHERE username = ? AND is_admin = 0
-            """, (username,))
-
-            staff_data = cursor.fetchone()
-
-            if not staff_data:
-                print("No matching staff account found")
-                self.error_label.setText("Invalid username or password")
-                conn.close()
-                return
-
-            print(f"Found staff: {staff_data[1]}, stored password type: {type(staff_data[2])}")
-
-            # Direct password comparison - both for plaintext and binary passwords
-            stored_password = staff_data[2]
-            authenticated = False
-
-            if isinstance(stored_password, bytes):
-                # For binary/hashed passwords
-                try:
-                    authenticated = verify_password(stored_password, password)
-                    print(f"Hashed password verification result: {authenticated}")
-                except Exception as verify_err:
-                    print(f"Error in password verification: {verify_err}")
-                    authenticated = False
-            else:
-                # For plain text passwords - simple string comparison
-                authenticated = (stored_password == password)
-                print(f"Plain text password match: {authenticated}")
-
-            if authenticated:
-                # Create a dictionary of staff data for the application
-                staff_dict = {
-                    "staff_id": staff_data[0],
-                    "username": staff_data[1],
-                    "first_name": staff_data[3],
-                    "last_name": staff_data[4],
-                    "email": staff_data[5],
-                    "position": staff_data[6],
-                    "department": staff_data[7]
-                }
-
-                print("Authentication successful, emitting login_successful signal")
-                self.login_successful.emit(staff_dict)
-                conn.close()
-                self.accept()  # Close the dialog with accept status
-            else:
-                print("Authentication failed - password mismatch")
-                self.error_label.setText("Invalid username or password")
-
-            conn.close()
-
-        except Exception as e:
-            print(f"Login error: {str(e)}")
-            traceback.print_exc()
-            self.error_label.setText(f"Login error: {str(e)}")
-
-        # Also print known good credentials to help troubleshoot
-        print("\nValid test credentials for staff login:")
-        print("Username: 'staff' or 'stafftest', Password: 'password' or 'staff123'")
-
-
-class AdminLoginDialog(QDialog):
+class AdminLoginDialog(LoginDialog):
     """Dialog for admin login"""
-    login_successful = pyqtSignal(dict)  # Signal to emit admin data upon successful login
+    IS_ADMIN = True
+    INVALID_MESSAGE = "Invalid admin credentials"
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Admin Login")
-        self.setStyleSheet("background-color: white; font-family: Arial;")
+        set_role(self, "dashboard-window")
         self.setFixedSize(400, 320)
         self.setWindowFlags(self.windowFlags() & ~Qt.WindowType.WindowContextHelpButtonHint)
 
@@ -277,7 +232,7 @@ class AdminLoginDialog(QDialog):
         # Title
         title = QLabel("Admin Login")
         title.setFont(QFont("Arial", 18, QFont.Weight.Bold))
-        title.setStyleSheet("color: #b91c1c;")
+        set_role(title, "admin-title")
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(title)
         layout.addSpacing(20)
@@ -314,125 +269,27 @@ class AdminLoginDialog(QDialog):
         button_layout.setSpacing(15)
 
         # Login button
-        login_button = QPushButton("Login")
-        login_button.setStyleSheet("""
-            QPushButton {
-                background-color: #b91c1c;
-                color: white;
-                padding: 10px;
-                border-radius: 5px;
-                font-weight: bold;
-                min-height: 36px;
-            }
-            QPushButton:hover {
-                background-color: #991b1b;
-            }
-        """)
-        login_button.clicked.connect(self.attempt_login)
+        self.login_button = QPushButton("Login")
+        set_role(self.login_button, "admin-login-button")
+        self.login_button.clicked.connect(self.attempt_login)
 
         # Cancel button
         cancel_button = QPushButton("Cancel")
-        cancel_button.setStyleSheet("""
-            QPushButton {
-                padding: 10px;
-                border-radius: 5px;
-                min-height: 36px;
-            }
-        """)
+        set_role(cancel_button, "dialog-button")
         cancel_button.clicked.connect(self.reject)
 
-        button_layout.addWidget(login_button)
+        button_layout.addWidget(self.login_button)
         button_layout.addWidget(cancel_button)
         layout.addLayout(button_layout)
 
         # Error message label
         self.error_label = QLabel("")
-        self.error_label.setStyleSheet("color: red;")
+        set_role(self.error_label, "error-text")
         self.error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.error_label)
 
         self.setLayout(layout)
 
-    def attempt_login(self):
-        """Attempt to log in with the provided credentials"""
-        username = self.username_field.text().strip()
-        password = self.password_field.text()
-
-        if not username or not password:
-            self.error_label.setText("Please enter both username and password")
-            return
-
-        try:
-            # Connect to the database directly
-            conn = sqlite3.connect(DB_FILE)
-            cursor = conn.cursor()
-
-            # Print debug information to terminal
-            print(f"Attempting admin login with username: {username}")
-
-            # Check for admin user in staff table
-            cursor.execute("""
-                SELECT * FROM staff 
-                WHERE username = ? AND is_admin = 1
-            """, (username,))
-
-            admin_data = cursor.fetchone()
-
-            if not admin_data:
-                print("No matching admin account found")
-                self.error_label.setText("Invalid admin credentials")
-                conn.close()
-                return
-
-            print(f"Found admin: {admin_data[1]}, stored password type: {type(admin_data[2])}")
-
-            # Direct password comparison - both for plaintext and binary passwords
-            stored_password = admin_data[2]
-            authenticated = False
-
-            if isinstance(stored_password, bytes):
-                # For binary/hashed passwords
-                try:
-                    authenticated = verify_password(stored_password, password)
-                    print(f"Hashed password verification result: {authenticated}")
-                except Exception as verify_err:
-                    print(f"Error in password verification: {verify_err}")
-                    authenticated = False
-            else:
-                # For plain text passwords - simple string comparison
-                authenticated = (stored_password == password)
-                print(f"Plain text password match: {authenticated}")
-
-            if authenticated:
-                # Create a dictionary of admin data for the application
-                admin_dict = {
-                    "staff_id": admin_data[0],
-                    "username": admin_data[1],
-                    "first_name": admin_data[3],
-                    "last_name": admin_data[4],
-                    "email": admin_data[5],
-                    "position": admin_data[6],
-                    "department": admin_data[7]
-                }
-
-                print("Admin authentication successful, emitting login_successful signal")
-                self.login_successful.emit(admin_dict)
-                conn.close()
-                self.accept()  # Close the dialog with accept status
-            else:
-                print("Admin authentication failed - password mismatch")
-                self.error_label.setText("Invalid admin credentials")
-
-            conn.close()
-
-        except Exception as e:
-            print(f"Admin login error: {str(e)}")
-            traceback.print_exc()
-            self.error_label.setText(f"Login error: {str(e)}")
-
-        # Also print known good credentials to help troubleshoot
-        print("\nValid test credentials for admin login:")
-        print("Username: 'admin' or 'admintest', Password: 'password' or 'admin123'")
 
 class StaffDashboard(QWidget):
     """Dashboard for staff with limited access compared to admin"""
@@ -441,7 +298,7 @@ class StaffDashboard(QWidget):
         self.staff_data = staff_data
         self.setWindowTitle("OwlReg Staff Dashboard")
         self.setMinimumSize(1000, 700)
-        self.setStyleSheet("background-color: white; font-family: Arial;")
+        set_role(self, "dashboard-window")
         self.parent = None  # Will be set by main window
 
         main_layout = QHBoxLayout()
@@ -452,81 +309,52 @@ class StaffDashboard(QWidget):
         sidebar.setContentsMargins(20, 20, 20, 20)
         sidebar.setSpacing(30)
 
-        sidebar_bg_color = "#F5F5F5"  # match this color with logo/title
-
         # Logo with background
         logo_label = QLabel()
-        pixmap = load_pixmap("owl_logo3.png")
-        logo_label.setPixmap(
-            pixmap.scaled(80, 80, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        )
+        logo_label.setPixmap(load_scaled_pixmap("owl_logo3.png", 80, 80))
         logo_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        logo_label.setStyleSheet(f"background-color: {sidebar_bg_color}; border-radius: 40px;")
+        set_role(logo_label, "sidebar-badge")
         sidebar.addWidget(logo_label)
 
         # Title with background
         title = QLabel("OwlReg.Staff")
         title.setFont(QFont("Arial", 16, QFont.Weight.Bold))
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        title.setStyleSheet(f"background-color: {sidebar_bg_color}; color: black; padding: 5px; border-radius: 5px;")
+        set_role(title, "sidebar-title")
         sidebar.addWidget(title)
         sidebar.addSpacing(40)
 
         # Staff info
         staff_info = QLabel(f"Welcome, {staff_data['first_name']} {staff_data['last_name']}")
         staff_info.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        staff_info.setStyleSheet("color: #2356c5; font-weight: bold;")
+        set_role(staff_info, "staff-welcome")
         sidebar.addWidget(staff_info)
 
         staff_position = QLabel(f"{staff_data['position']} - {staff_data['department']}")
         staff_position.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        staff_position.setStyleSheet("color: #555; font-size: 12px;")
+        set_role(staff_position, "staff-position")
         sidebar.addWidget(staff_position)
         sidebar.addSpacing(20)
 
         # Menu buttons
-        button_style = """
-            QPushButton {
-                background-color: transparent;
-                border: none;
-                text-align: left;
-                padding: 10px;
-                font-size: 14px;
-            }
-            QPushButton:hover {
-                color: #2356c5;
-                font-weight: bold;
-            }
-        """
-
         self.dashboard_button = QPushButton("Dashboard")
-        self.dashboard_button.setStyleSheet(button_style)
+        set_role(self.dashboard_button, "dashboard-link")
         sidebar.addWidget(self.dashboard_button)
 
         self.list_button = QPushButton("Student List")
-        self.list_button.setStyleSheet(button_style)
+        set_role(self.list_button, "dashboard-link")
         sidebar.addWidget(self.list_button)
 
         # New button for Search by Reference Code
         self.search_ref_button = QPushButton("Search by Reference Code")
-        self.search_ref_button.setStyleSheet(button_style)
+        set_role(self.search_ref_button, "dashboard-link")
         sidebar.addWidget(self.search_ref_button)
 
         sidebar.addStretch()
 
         # Logout button
         logout_button = QPushButton("Logout")
-        logout_button.setStyleSheet("""
-            QPushButton {
-                background-color: #f0f0f0;
-                border-radius: 5px;
-                padding: 8px;
-                color: #555;
-            }
-            QPushButton:hover {
-                background-color: #e0e0e0;
-            }
-        """)
+        set_role(logout_button, "logout-button")
         logout_button.clicked.connect(self.logout)
         sidebar.addWidget(logout_button)
 
@@ -559,17 +387,14 @@ class StaffDashboard(QWidget):
             ("Transferee Students", "0", "+0%")
         ]:
             card = QWidget()
-            card.setStyleSheet("""
-                background-color: #f9f9f9;
-                border-radius: 10px;
-            """)
+            set_role(card, "metric-card")
             card_layout = QVBoxLayout()
             card_layout.addWidget(QLabel(title_text))
             value_label = QLabel(value_text)
             value_label.setFont(QFont("Arial", 20, QFont.Weight.Bold))
             card_layout.addWidget(value_label)
             change_label = QLabel(change_text)
-            change_label.setStyleSheet("color: gray; font-size: 12px;")
+            set_role(change_label, "metric-change")
             card_layout.addWidget(change_label)
             card.setLayout(card_layout)
             cards_layout.addWidget(card)
@@ -579,19 +404,22 @@ class StaffDashboard(QWidget):
 
         dash_layout.addLayout(cards_layout)
 
-        # ---------------- Bar Chart ---------------- #
-        chart_container = QWidget()
-        chart_layout = QVBoxLayout(chart_container)
-
-        chart_title = QLabel("Students per Strand")
-        chart_title.setFont(QFont("Arial", 16, QFont.Weight.Bold))
-        chart_layout.addWidget(chart_title)
+        # ---------------- Charts ---------------- #
+        charts_layout = QHBoxLayout()
+        self.strand_chart = StrandBarChart()
+        self.trend_chart = RegistrationTrendChart()
+        for title_text, chart in (("Students per Strand", self.strand_chart),
+                                  (f"Registrations (Last {REGISTRATION_TREND_DAYS} Days)", self.trend_chart)):
+            chart_container = QWidget()
+            chart_layout = QVBoxLayout(chart_container)
 
-        self.figure = Figure(figsize=(5, 3))
-        self.canvas = FigureCanvas(self.figure)
-        chart_layout.addWidget(self.canvas)
+            chart_title = QLabel(title_text)
+            chart_title.setFont(QFont("Arial", 16, QFont.Weight.Bold))
+            chart_layout.addWidget(chart_title)
+            chart_layout.addWidget(chart)
+            charts_layout.addWidget(chart_container)
 
-        dash_layout.addWidget(chart_container)
+        dash_layout.addLayout(charts_layout)
 
         # --- Student list page ---
         self.table_page = QWidget()
@@ -607,17 +435,7 @@ class StaffDashboard(QWidget):
 
         # Add refresh button
         refresh_btn = QPushButton("Refresh")
-        refresh_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4bb3fd;
-                color: white;
-                border-radius: 5px;
-                padding: 8px 15px;
-            }
-            QPushButton:hover {
-                background-color: #2356c5;
-            }
-        """)
+        set_role(refresh_btn, "action-button")
         refresh_btn.clicked.connect(self.load_student_data)
         table_header.addWidget(refresh_btn)
 
@@ -626,8 +444,13 @@ class StaffDashboard(QWidget):
         # Search and filter
         search_layout = QHBoxLayout()
         search_field = QLineEdit()
-        search_field.setPlaceholderText("Search students...")
-        search_field.textChanged.connect(self.filter_students)
+        search_field.setPlaceholderText("Search by name, reference code, LRN or address...")
+        # Search once typing pauses rather than on every keystroke
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.filter_students)
+        search_field.textChanged.connect(self.search_timer.start)
         search_layout.addWidget(search_field)
 
         strand_filter = QComboBox()
@@ -640,16 +463,22 @@ class StaffDashboard(QWidget):
 
         table_layout.addLayout(search_layout)
 
-        # Student table
-        self.student_table = QTableWidget()
-        self.student_table.setColumnCount(5)
-        self.student_table.setHorizontalHeaderLabels([
-            "Student No.", "Student Full Name", "Entry Status", "Strand", "Registration Date"
-        ])
+        # Student table - a model/view table that loads students as it scrolls
+        self.student_model = StudentTableModel(query_students, thread_pool=QThreadPool.globalInstance())
+        self.student_table = QTableView()
+        self.student_table.setModel(self.student_model)
         self.student_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.student_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.student_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.student_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.student_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.student_table.setAlternatingRowColors(True)
+        # Clicking a header re-queries in that order instead of sorting loaded rows
+        self.student_table.horizontalHeader().setSortIndicator(
+            StudentTableModel.DEFAULT_SORT_COLUMN, Qt.SortOrder.DescendingOrder
+        )
+        self.student_table.setSortingEnabled(True)
+        self.student_table.horizontalHeader().sortIndicatorChanged.connect(
+            lambda *_: self.student_table.horizontalHeader().setSortIndicatorShown(True)
+        )
         table_layout.addWidget(self.student_table)
 
         # Add pages to stacked layout
@@ -683,19 +512,7 @@ class StaffDashboard(QWidget):
         search_form.addWidget(self.ref_code_input)
 
         self.search_button = QPushButton("Search")
-        self.search_button.setStyleSheet("""
-            QPushButton {
-                background-color: #2356c5;
-                color: white;
-                border-radius: 5px;
-                padding: 8px 15px;
-                min-height: 36px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #1a3f8e;
-            }
-        """)
+        set_role(self.search_button, "search-button")
         self.search_button.clicked.connect(self.search_by_ref_code)
         search_form.addWidget(self.search_button)
 
@@ -705,11 +522,8 @@ class StaffDashboard(QWidget):
         # Results container
         self.search_results_container = QWidget()
         self.search_results_container.setVisible(False)  # Hide initially
-        self.search_results_container.setStyleSheet("""
-            background-color: #f9f9f9;
-            border-radius: 8px;
-            padding: 10px;
-        """)
+        self.displayed_details = None  # get_student_details() result the labels currently show
+        set_role(self.search_results_container, "search-results")
 
         # Create a scroll area to contain all the student information
         self.search_results_scroll = QScrollArea()
@@ -727,26 +541,12 @@ class StaffDashboard(QWidget):
         # Student details sections
         self.results_title = QLabel("Student Information")
         self.results_title.setFont(QFont("Arial", 16, QFont.Weight.Bold))
-        self.results_title.setStyleSheet("color: #2356c5;")
+        set_role(self.results_title, "brand-text")
         search_results_layout.addWidget(self.results_title)
 
         # Personal Information Section
         personal_group = QGroupBox("Personal Information")
-        personal_group.setStyleSheet("""
-            QGroupBox {
-                border: 2px solid #4bb3fd;
-                border-radius: 8px;
-                margin-top: 15px;
-                font-weight: bold;
-                padding: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-                color: #2356c5;
-            }
-        """)
+        set_role(personal_group, "detail-group")
         personal_layout = QVBoxLayout(personal_group)
         self.personal_info = QLabel("No student found")
         personal_layout.addWidget(self.personal_info)
@@ -754,21 +554,7 @@ class StaffDashboard(QWidget):
 
         # Family Information Section
         family_group = QGroupBox("Family Information")
-        family_group.setStyleSheet("""
-            QGroupBox {
-                border: 2px solid #4bb3fd;
-                border-radius: 8px;
-                margin-top: 15px;
-                font-weight: bold;
-                padding: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-                color: #2356c5;
-            }
-        """)
+        set_role(family_group, "detail-group")
         family_layout = QVBoxLayout(family_group)
         self.family_info = QLabel("No family information available")
         family_layout.addWidget(self.family_info)
@@ -776,21 +562,7 @@ class StaffDashboard(QWidget):
 
         # Academic Information Section
         academic_group = QGroupBox("Academic Information")
-        academic_group.setStyleSheet("""
-            QGroupBox {
-                border: 2px solid #4bb3fd;
-                border-radius: 8px;
-                margin-top: 15px;
-                font-weight: bold;
-                padding: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-                color: #2356c5;
-            }
-        """)
+        set_role(academic_group, "detail-group")
         academic_layout = QVBoxLayout(academic_group)
         self.academic_info = QLabel("No academic information available")
         academic_layout.addWidget(self.academic_info)
@@ -798,21 +570,7 @@ class StaffDashboard(QWidget):
 
         # Emergency Contact Information Section
         emergency_group = QGroupBox("Emergency Contact Information")
-        emergency_group.setStyleSheet("""
-            QGroupBox {
-                border: 2px solid #4bb3fd;
-                border-radius: 8px;
-                margin-top: 15px;
-                font-weight: bold;
-                padding: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-                color: #2356c5;
-            }
-        """)
+        set_role(emergency_group, "detail-group")
         emergency_layout = QVBoxLayout(emergency_group)
         self.emergency_info = QLabel("No emergency contact information available")
         emergency_layout.addWidget(self.emergency_info)
@@ -844,135 +602,41 @@ class StaffDashboard(QWidget):
             self.load_student_data()
 
     def load_student_data(self):
-        """Load student data from database"""
-        try:
-            conn = sqlite3.connect(DB_FILE)
-            cursor = conn.cursor()
-
-            # Get student data with fields needed for the list
-            cursor.execute("""
-                SELECT student_id, first_name, middle_name, last_name, extension,
-                       enrollment_type, strand, registration_date
-                FROM students
-                ORDER BY registration_date DESC
-            """)
-
-            students = cursor.fetchall()
-            conn.close()
-
-            # Store the full student data for filtering
-            self.all_students = students
-
-            # Display the data
-            self.populate_student_table(students)
-
-        except Exception as e:
-            print(f"Error loading student data: {e}")
-            QMessageBox.critical(self, "Database Error", f"Failed to load student data: {e}")
-
-    def populate_student_table(self, students):
-        """Populate the student table with data"""
-        self.student_table.setRowCount(0)
-
-        for student in students:
-            row_position = self.student_table.rowCount()
-            self.student_table.insertRow(row_position)
-
-            # Student ID
-            student_id_item = QTableWidgetItem(f"ST-{student[0]:04d}")
-            student_id_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.student_table.setItem(row_position, 0, student_id_item)
-
-            # Full Name
-            middle_initial = f" {student[2][0]}." if student[2] else ""
-            extension = f" {student[4]}" if student[4] else ""
-            full_name = f"{student[1]}{middle_initial} {student[3]}{extension}"
-            name_item = QTableWidgetItem(full_name)
-            self.student_table.setItem(row_position, 1, name_item)
-
-            # Entry Status
-            entry_status = student[5] or "Freshmen"  # Default to Freshmen
-            status_item = QTableWidgetItem(entry_status)
-            status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.student_table.setItem(row_position, 2, status_item)
-
-            # Strand
-            strand_item = QTableWidgetItem(student[6] or "N/A")
-            strand_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.student_table.setItem(row_position, 3, strand_item)
-
-            # Registration Date
-            reg_date_item = QTableWidgetItem(student[7][:10] if student[7] else "N/A")
-            reg_date_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.student_table.setItem(row_position, 4, reg_date_item)
+        """Reload the student list from the database, keeping the current filters"""
+        self.filter_students()
 
     def filter_students(self):
-        """Filter student data based on search term and strand filter"""
-        search_term = self.search_field.text().lower()
+        """Point the student table at the rows matching the search term and strand filter"""
+        self.search_timer.stop()  # This query already covers any typing still waiting on the timer
+        search_term = self.search_field.text()
         selected_strand = self.strand_filter.currentText()
+        strand = None if selected_strand == "All Strands" else selected_strand
 
-        filtered_students = []
-        for student in self.all_students:
-            # Get student details
-            full_name = f"{student[1]} {student[2]} {student[3]}".lower()
-            student_id = f"ST-{student[0]:04d}".lower()
-            strand = student[6] or ""
-
-            # Check if student matches filter criteria
-            name_match = search_term in full_name or search_term in student_id
-            strand_match = selected_strand == "All Strands" or selected_strand == strand
-
-            if name_match and strand_match:
-                filtered_students.append(student)
-
-        self.populate_student_table(filtered_students)
+        # Rows are fetched on a worker a page at a time as the table scrolls. While searching the
+        # best matches come first; the header sort comes back when the search is cleared
+        searching = bool(search_term.strip())
+        self.student_table.horizontalHeader().setSortIndicatorShown(not searching)
+        self.student_model.set_query(partial(query_students, search_term, strand), ranked=searching)
 
     def update_dashboard_metrics(self):
         """Update dashboard metrics and chart with data from database"""
         try:
-            conn = sqlite3.connect(DB_FILE)
-            cursor = conn.cursor()
-
-            # Get total student count
-            cursor.execute("SELECT COUNT(*) FROM students")
-            total_students = cursor.fetchone()[0]
-
-            # Get freshmen count
-            cursor.execute("SELECT COUNT(*) FROM students WHERE enrollment_type = 'Freshmen' OR enrollment_type IS NULL")
-            freshmen_count = cursor.fetchone()[0]
-
-            # Get transferee count
-            cursor.execute("SELECT COUNT(*) FROM students WHERE enrollment_type = 'Transferee'")
-            transferee_count = cursor.fetchone()[0]
+            # One read of the trigger-maintained summary table, however many students there are
+            metrics = get_dashboard_metrics()
 
             # Update metric labels
             if "Registered Students" in self.metric_labels:
-                self.metric_labels["Registered Students"].setText(str(total_students))
+                self.metric_labels["Registered Students"].setText(str(metrics["total"]))
 
             if "Freshmen Students" in self.metric_labels:
-                self.metric_labels["Freshmen Students"].setText(str(freshmen_count))
+                self.metric_labels["Freshmen Students"].setText(str(metrics["freshmen"]))
 
             if "Transferee Students" in self.metric_labels:
-                self.metric_labels["Transferee Students"].setText(str(transferee_count))
+                self.metric_labels["Transferee Students"].setText(str(metrics["transferee"]))
 
-            # Get strand distribution for chart
-            cursor.execute("""
-                SELECT strand, COUNT(*) 
-                FROM students 
-                WHERE strand IS NOT NULL AND strand != '' 
-                GROUP BY strand
-            """)
-
-            strand_data = cursor.fetchall()
-            conn.close()
-
-            # Create dictionary of strand counts
-            strands = []
-            counts = []
-
-            for strand, count in strand_data:
-                strands.append(strand)
-                counts.append(count)
+            # Strand distribution for chart
+            strands = list(metrics["strands"].keys())
+            counts = list(metrics["strands"].values())
 
             # Add default strands with zero count if not present
             default_strands = ["STEM", "ICT", "ABM", "GAS"]
@@ -984,88 +648,42 @@ class StaffDashboard(QWidget):
             # Update bar chart
             self.update_bar_chart(strands, counts)
 
+            # Registrations per day for the trend chart
+            trend = get_registration_trend()
+            self.trend_chart.set_data([day.strftime("%b %d") for day, _ in trend], [count for _, count in trend])
+
         except Exception as e:
             print(f"Error updating dashboard metrics: {e}")
 
     def update_bar_chart(self, strands, counts):
         """Update the bar chart with strand data"""
-        ax = self.figure.add_subplot(111)
-        ax.clear()
-
-        if strands and counts:
-            ax.bar(strands, counts, color="#2356c5")
-            ax.set_ylabel("Number of Students")
-            ax.set_xlabel("Strands")
-
-            # Add count labels on top of bars
-            for i, count in enumerate(counts):
-                if count > 0:
-                    ax.text(i, count + 0.5, str(count), ha='center')
-        else:
-            ax.text(0.5, 0.5, "No strand data available",
-                   ha='center', va='center', transform=ax.transAxes)
-
-        self.canvas.draw()
+        self.strand_chart.set_data(strands, counts)
 
     def search_by_ref_code(self):
         """Search for a student by reference code and display all their information"""
-        ref_code = self.ref_code_input.text().strip()
+        ref_code = normalize_reference_code(self.ref_code_input.text())
 
         if not ref_code:
             QMessageBox.warning(self, "Input Error", "Please enter a reference code")
             return
 
         try:
-            # Connect to SQLite database
-            conn = sqlite3.connect(DB_FILE)
-            conn.row_factory = sqlite3.Row  # This allows accessing columns by name
-            cursor = conn.cursor()
+            # Student, family, academic and emergency records in one query (cached per reference code)
+            details = get_student_details(ref_code)
 
-            # First, query for the student's personal information
-            cursor.execute("""
-                SELECT *
-                FROM students
-                WHERE reference_code = ?
-            """, (ref_code,))
-
-            student = cursor.fetchone()
-
-            if not student:
+            if not details:
                 QMessageBox.warning(self, "Not Found", f"No student found with reference code: {ref_code}")
                 self.search_results_container.setVisible(False)
                 return
 
-            # Now we have the student, get the student_id to retrieve related information
-            student_id = student['student_id']
-
-            # Get family background information
-            cursor.execute("""
-                SELECT *
-                FROM family_background
-                WHERE student_id = ?
-            """, (student_id,))
-            family = cursor.fetchone()
-
-            # Get academic profile information
-            cursor.execute("""
-                SELECT *
-                FROM academic_profile
-                WHERE student_id = ?
-            """, (student_id,))
-            academic = cursor.fetchone()
-
-            # Get emergency contact information
-            cursor.execute("""
-                SELECT *
-                FROM emergency_contacts
-                WHERE student_id = ?
-            """, (student_id,))
-            emergency = cursor.fetchone()
-
-            conn.close()
-
-            # Now display all the information
-            self.display_student_details(student, family, academic, emergency)
+            # The same student looked up again - the labels already show them
+            if details is self.displayed_details:
+                self.search_results_container.setVisible(True)
+                return
+
+            self.display_student_details(details["student"], details["family"],
+                                         details["academic"], details["emergency"])
+            self.displayed_details = None if self.search_results_container.isHidden() else details
 
         except Exception as e:
             QMessageBox.critical(self, "Database Error", f"Failed to search student: {e}")
@@ -1105,14 +723,8 @@ class StaffDashboard(QWidget):
 
             # Format and display family information
             if family:
-                # Try to access guardian_contact safely - sqlite3.Row doesn't have .get() method
-                guardian_contact = "N/A"
-                try:
-                    # Check if 'guardian_contact' column exists in the row
-                    guardian_contact = family['guardian_contact'] or "N/A"
-                except (IndexError, KeyError):
-                    # Column doesn't exist, keep the default value
-                    pass
+                # Older databases may not have the guardian_contact column
+                guardian_contact = family.get('guardian_contact') or "N/A"
 
                 family_html = f"""
                 <table style="width:100%">
@@ -1146,11 +758,6 @@ class StaffDashboard(QWidget):
 
             # Format and display academic information
             if academic:
-                # Print debug info to diagnose the issue
-                print("Academic data found:")
-                for key in academic.keys():
-                    print(f"  {key}: {academic[key]}")
-
                 # Directly access the fields in a way that works with SQLite Row objects
                 elementary_school = academic['elementary_school'] if academic['elementary_school'] else "N/A"
                 elem_year_graduated = academic['elem_year_graduated'] if academic['elem_year_graduated'] else "N/A"
@@ -1179,11 +786,6 @@ class StaffDashboard(QWidget):
 
             # Format and display emergency contact information
             if emergency:
-                # Print debug info to diagnose the issue
-                print("Emergency contact data found:")
-                for key in emergency.keys():
-                    print(f"  {key}: {emergency[key]}")
-
                 # Direct column access for emergency contact fields - this is the crucial fix
                 contact_name = emergency['contact_name'] if emergency['contact_name'] else "N/A"
                 relationship = emergency['relationship'] if emergency['relationship'] else "N/A"
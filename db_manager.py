@@ -22,17 +22,29 @@ except ImportError:
 
 import traceback
 import time
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from reference_codes import OFFLINE_NODE_IDS
+
+# The replicator copies SQLite changes to MySQL, so it needs both modules
+if SQLITE_AVAILABLE and MYSQL_AVAILABLE:
+    from replicator import OutboxReplicator
 
 class DatabaseManager:
     """
     Manages database operations for both SQLite and MySQL
     Allows using either or both databases independently
     """
-    def __init__(self, use_sqlite=True, use_mysql=True):
+    def __init__(self, use_sqlite=True, use_mysql=True, parallel_writes=True, write_behind=True):
         """Initialize database manager with selected databases"""
         self.use_sqlite = use_sqlite and SQLITE_AVAILABLE
         self.use_mysql = use_mysql and MYSQL_AVAILABLE
 
+        # Without write_behind, write to both databases at the same time instead of
+        # one after the other (the default write-behind path never waits on MySQL)
+        self.parallel_writes = parallel_writes
+        self._executors = {}
+
         if not (self.use_sqlite or self.use_mysql):
             print("WARNING: No database is available for use!")
 
@@ -43,8 +55,17 @@ class DatabaseManager:
         else:
             print("WARNING: MySQL module not available, using SQLite only")
 
-        # Test connections at initialization
-        self.test_connections()
+        # Changes committed to SQLite are queued in its replication outbox and
+        # copied to MySQL in the background, so nothing is lost while MySQL is down.
+        # With write_behind, registrations go through the outbox too instead of
+        # waiting for MySQL; deletions always do.
+        self.replicator = None
+        if self.use_sqlite and self.use_mysql:
+            self.replicator = OutboxReplicator()
+        self.write_behind = write_behind and self.replicator is not None
+
+        # Connections are checked later by test_connections() (main.py runs it in the
+        # background) so importing this module never waits on a slow MySQL server
 
     def create_databases(self):
         """Create tables in all configured databases"""
@@ -74,6 +95,33 @@ class DatabaseManager:
 
         return results
 
+    def _get_executor(self, purpose):
+        """
+        Return the thread pool for `purpose` ("write" or "check"), creating it on first use
+        Each purpose has its own pool, so a slow MySQL check at startup never holds up a save
+        """
+        executor = self._executors.get(purpose)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix=f"owlreg-{purpose}")
+            self._executors[purpose] = executor
+        return executor
+
+    def _save_to(self, name, save_func, form_data):
+        """Save to one database and describe the outcome as a results entry"""
+        try:
+            print(f"Saving to {name} database...")
+            db_success, db_ref_code, db_student_id = save_func(form_data)
+            print(f"{name} save result: {db_success}")
+            return {
+                'success': db_success,
+                'reference_code': db_ref_code,
+                'student_id': db_student_id
+            }
+        except Exception as e:
+            print(f"{name} registration error: {e}")
+            traceback.print_exc()
+            return {'success': False, 'error': str(e)}
+
     def save_registration(self, form_data):
         """
         Save registration data to configured databases
@@ -90,126 +138,202 @@ class DatabaseManager:
 
         # Save a timestamp to help with debugging
         print(f"Starting registration process at {time.strftime('%Y-%m-%d %H:%M:%S')}")
-
-        # Save to both databases, starting with SQLite
+        start_time = time.perf_counter()
+
+        # Pick the reference code up front so both databases store the same one.
+        # Work on a copy so the writer threads never share a dict with the caller.
+        personal = dict(form_data.get("personal", {}))
+        if not personal.get("reference_code"):
+            if self.use_sqlite:
+                try:
+                    personal["reference_code"] = sqlite_db.generate_reference_code()
+                except sqlite_db.NoNodeIdError:
+                    # A kiosk that hasn't reached MySQL before tries to claim its node ID now
+                    self.claim_node_id()
+                    personal["reference_code"] = sqlite_db.generate_reference_code()
+            elif self.use_mysql:
+                personal["reference_code"] = mysql_db.generate_reference_code()
+        form_data = dict(form_data)
+        form_data["personal"] = personal
+
+        # SQLite first, so its student ID is preferred when both succeed
+        writers = []
         if self.use_sqlite:
-            try:
-                print("Saving to SQLite database...")
-                sqlite_success, sqlite_ref_code, sqlite_student_id = sqlite_db.save_registration(form_data)
-                results['sqlite'] = {
-                    'success': sqlite_success,
-                    'reference_code': sqlite_ref_code,
-                    'student_id': sqlite_student_id
-                }
-                print(f"SQLite save result: {sqlite_success}")
-
-                if sqlite_success and not ref_code:
-                    ref_code = sqlite_ref_code
-                    student_id = sqlite_student_id
-                    success = True
-                    print(f"Using reference code from SQLite: {ref_code}")
-
-                    # Update the form data with the reference code for MySQL
-                    if "personal" not in form_data:
-                        form_data["personal"] = {}
-                    form_data["personal"]["reference_code"] = ref_code
-
-            except Exception as e:
-                print(f"SQLite registration error: {e}")
-                traceback.print_exc()
-                results['sqlite'] = {'success': False, 'error': str(e)}
-
-        # Then try MySQL with the same reference code if we got one from SQLite
+            writers.append(('sqlite', 'SQLite', sqlite_db.save_registration))
         if self.use_mysql:
-            try:
-                print("Saving to MySQL database...")
-                mysql_success, mysql_ref_code, mysql_student_id = mysql_db.save_registration(form_data)
+            writers.append(('mysql', 'MySQL', mysql_db.save_registration))
+
+        if self.write_behind:
+            # Commit locally at SQLite speed; the replicator brings MySQL up to date
+            results['sqlite'] = self._save_to('SQLite', self._save_sqlite_with_outbox, form_data)
+            if results['sqlite']['success']:
                 results['mysql'] = {
-                    'success': mysql_success,
-                    'reference_code': mysql_ref_code,
-                    'student_id': mysql_student_id
+                    'success': False,
+                    'queued': True,
+                    'reference_code': results['sqlite']['reference_code'],
+                    'student_id': None
                 }
-                print(f"MySQL save result: {mysql_success}")
-
-                if mysql_success and not ref_code:
-                    ref_code = mysql_ref_code
-                    student_id = mysql_student_id
-                    success = True
-                    print(f"Using reference code from MySQL: {ref_code}")
-
-            except Exception as e:
-                print(f"MySQL registration error: {e}")
-                traceback.print_exc()
-                results['mysql'] = {'success': False, 'error': str(e)}
+                self.start_replication()
+                self.replicator.notify()
+            else:
+                # Nothing was queued, so try MySQL directly
+                results['mysql'] = self._save_to('MySQL', mysql_db.save_registration, form_data)
+        elif self.parallel_writes and len(writers) > 1:
+            # The fallback when write-behind is turned off: both writes run at
+            # once, so the wait is the slower of the two
+            executor = self._get_executor("write")
+            futures = [(key, executor.submit(self._save_to, name, save_func, form_data))
+                       for key, name, save_func in writers]
+            for key, future in futures:
+                results[key] = future.result()
+        else:
+            for key, name, save_func in writers:
+                results[key] = self._save_to(name, save_func, form_data)
+
+        for key, name, _ in writers:
+            result = results[key]
+            if result.get('queued'):
+                print(f"Queued for {name} replication: {result['reference_code']}")
+            if result['success'] and not ref_code:
+                ref_code = result['reference_code']
+                student_id = result['student_id']
+                success = True
+                print(f"Using reference code from {name}: {ref_code}")
 
         # Final check if any database save succeeded
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
         if success:
-            print(f"Registration completed successfully with reference code: {ref_code}")
+            print(f"Registration completed successfully with reference code: {ref_code} ({elapsed_ms:.0f} ms)")
         else:
             print("Registration failed on all configured databases")
 
         return success, ref_code, student_id, results
 
+    @staticmethod
+    def _save_sqlite_with_outbox(form_data):
+        """Save to SQLite and queue the registration for MySQL in the same transaction"""
+        return sqlite_db.save_registration(form_data, replicate=True)
+
+    def delete_student(self, student_id):
+        """
+        Delete a student from SQLite and queue the deletion for MySQL
+        Returns (success, reference code or error message)
+        """
+        success, result = sqlite_db.delete_student(student_id, replicate=self.replicator is not None)
+        if success and self.replicator is not None:
+            self.start_replication()
+            self.replicator.notify()
+        return success, result
+
+    def start_replication(self):
+        """Start copying queued changes to MySQL in the background"""
+        if self.replicator is not None:
+            self.replicator.start()
+
+    def replication_metrics(self):
+        """Outbox size and replication lag (None when there is nothing to replicate to)"""
+        if self.replicator is None:
+            return None
+        return self.replicator.metrics()
+
     def test_connections(self):
-        """Test connections to all configured databases"""
+        """Test connections to all configured databases (both checks run at the same time)"""
         results = {}
-
+        checks = []
         if self.use_sqlite:
-            try:
-                print("Testing SQLite connection...")
-                sqlite_result = sqlite_db.test_connection()
-                results['sqlite'] = sqlite_result
-                print(f"SQLite connection test result: {sqlite_result}")
+            checks.append(('sqlite', self._test_sqlite))
+        if self.use_mysql:
+            checks.append(('mysql', self._test_mysql))
+
+        if len(checks) > 1:
+            # The SQLite check is instant, so the total is just the MySQL check
+            executor = self._get_executor("check")
+            futures = [(key, executor.submit(check)) for key, check in checks]
+            for key, future in futures:
+                results[key] = future.result()
+        else:
+            for key, check in checks:
+                results[key] = check()
 
-                if not sqlite_result:
-                    print("WARNING: SQLite database is not accessible. Storage to SQLite will not work.")
-                    # Attempt to create database tables as a recovery step
-                    print("Attempting to create SQLite database tables...")
-                    sqlite_db.create_database()
+        if results.get('sqlite') and results.get('mysql'):
+            self.claim_node_id()
+        return results
 
-            except Exception as e:
-                print(f"SQLite connection test error: {e}")
-                traceback.print_exc()
-                results['sqlite'] = False
+    def claim_node_id(self):
+        """
+        Give this kiosk a reference code node ID from MySQL, the first time both databases are up
+        (a kiosk still on a legacy offline ID gets a claimed one in its place)
+        """
+        if not self.use_mysql:
+            return
+        try:
+            current = sqlite_db.get_node_id()
+            if current is not None and current not in OFFLINE_NODE_IDS:
+                return
+            node_id = mysql_db.claim_node_id(socket.gethostname())
+            if node_id is not None:
+                print(f"Claimed reference code node ID {sqlite_db.set_node_id(node_id)}")
+        except Exception as e:
+            print(f"Could not claim a reference code node ID: {e}")
+
+    def _test_sqlite(self):
+        """Check the SQLite database, creating the tables if they are missing"""
+        try:
+            print("Testing SQLite connection...")
+            sqlite_result = sqlite_db.test_connection()
+            print(f"SQLite connection test result: {sqlite_result}")
+
+            if not sqlite_result:
+                print("WARNING: SQLite database is not accessible. Storage to SQLite will not work.")
+                # Attempt to create database tables as a recovery step
+                print("Attempting to create SQLite database tables...")
+                sqlite_db.create_database()
+
+            return sqlite_result
+
+        except Exception as e:
+            print(f"SQLite connection test error: {e}")
+            traceback.print_exc()
+            return False
+
+    def _test_mysql(self):
+        """Check the MySQL database with retries, creating it if it is missing"""
+        mysql_result = False
+        try:
+            print("Testing MySQL connection...")
+            # Try multiple times to establish MySQL connection
+            for attempt in range(3):
+                print(f"MySQL connection attempt {attempt+1}/3")
+                mysql_result = mysql_db.test_mysql_connection()
+                print(f"MySQL connection test result: {mysql_result}")
+
+                if mysql_result:
+                    print("MySQL connection successful!")
+                    break
+                else:
+                    print(f"MySQL connection attempt {attempt+1} failed")
+                    if attempt < 2:
+                        print("Waiting 2 seconds before retrying...")
+                        time.sleep(2)
+
+            # Additional attempt to create database if connection test failed
+            if not mysql_result:
+                print("WARNING: MySQL database is not accessible. Attempting to create/repair...")
+                # Force database creation as a recovery step
+                mysql_result = mysql_db.create_database()
 
-        if self.use_mysql:
-            try:
-                print("Testing MySQL connection...")
-                # Try multiple times to establish MySQL connection
-                for attempt in range(3):
-                    print(f"MySQL connection attempt {attempt+1}/3")
-                    mysql_result = mysql_db.test_mysql_connection()
-                    results['mysql'] = mysql_result
-                    print(f"MySQL connection test result: {mysql_result}")
-
-                    if mysql_result:
-                        print("MySQL connection successful!")
-                        break
-                    else:
-                        print(f"MySQL connection attempt {attempt+1} failed")
-                        if attempt < 2:
-                            print("Waiting 2 seconds before retrying...")
-                            time.sleep(2)
-
-                # Additional attempt to create database if connection test failed
-                if not mysql_result:
-                    print("WARNING: MySQL database is not accessible. Attempting to create/repair...")
-                    # Force database creation as a recovery step
-                    mysql_result = mysql_db.create_database()
-                    results['mysql'] = mysql_result
-
-                # If still not successful after attempts, warn user
-                if not results.get('mysql', False):
-                    print("\n⚠️ WARNING: MySQL database connection failed after multiple attempts.")
-                    print("Data will only be saved to SQLite database.")
-                    print("Make sure XAMPP MySQL service is running if you want MySQL storage.")
+            # If still not successful after attempts, warn user
+            if not mysql_result:
+                print("\n⚠️ WARNING: MySQL database connection failed after multiple attempts.")
+                print("Data will only be saved to SQLite database.")
+                print("Make sure XAMPP MySQL service is running if you want MySQL storage.")
 
-            except Exception as e:
-                print(f"MySQL connection test error: {e}")
-                traceback.print_exc()
-                results['mysql'] = False
+            return mysql_result
 
-        return results
+        except Exception as e:
+            print(f"MySQL connection test error: {e}")
+            traceback.print_exc()
+            return False
 
 # Create default instance for module-level access
 db_manager = DatabaseManager(use_sqlite=True, use_mysql=True)
@@ -226,3 +350,15 @@ def save_registration(form_data):
 def test_connections():
     """Test connections to all configured databases"""
     return db_manager.test_connections()
+
+def delete_student(student_id):
+    """Delete a student from SQLite and queue the deletion for MySQL"""
+    return db_manager.delete_student(student_id)
+
+def start_replication():
+    """Start copying queued changes to MySQL in the background"""
+    db_manager.start_replication()
+
+def replication_metrics():
+    """Outbox size and replication lag"""
+    return db_manager.replication_metrics()
@@ -5,8 +5,9 @@ from PyQt6.QtWidgets import (
     QCheckBox
 )
 from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QFont, QPixmap
-from image_helper import load_pixmap  # Import the image helper
+from PyQt6.QtGui import QFont
+from image_helper import load_scaled_pixmap  # Import the image helper
+from theme import set_role
 
 
 class FamilyForm(QWidget):
@@ -17,65 +18,25 @@ class FamilyForm(QWidget):
         super().__init__()
         self.setWindowTitle("Family Background")
         self.resize(1200, 850)
-        self.setStyleSheet("background-color: #f7f7f7;")
-
-        # common textbox style
-        self.textbox_style = """
-            QLineEdit {
-                border: 1px solid #ccc;
-                border-radius: 4px;
-                padding: 6px;
-                background-color: white;
-            }
-            QLineEdit:focus {
-                border: 1px solid #4bb3fd;
-            }
-        """
-
-        # combobox style - Enhanced for better visibility with visible borders
-        self.combobox_style = """
-            QComboBox {
-                border: 1px solid #4bb3fd;
-                border-radius: 4px;
-                padding: 4px 10px;
-                background-color: white;
-                min-width: 100px;
-            }
-            QComboBox:hover {
-                border: 2px solid #2356c5;
-            }
-            QComboBox::drop-down {
-                subcontrol-origin: padding;
-                subcontrol-position: center right;
-                width: 20px;
-                border-left: 1px solid #4bb3fd;
-                background-color: #e1ecff;
-            }
-            QComboBox QAbstractItemView {
-                background-color: white;
-                border: 1px solid #4bb3fd;
-                selection-background-color: #e1ecff;
-            }
-        """
+        set_role(self, "form-page")
 
         main_layout = QHBoxLayout(self)
 
         # ---------------- Sidebar ----------------
         sidebar_widget = QWidget()
         sidebar_widget.setFixedWidth(220)
-        sidebar_widget.setStyleSheet("background-color: #f3f3f3; border-radius: 12px;")
+        set_role(sidebar_widget, "sidebar")
         sidebar_layout = QVBoxLayout(sidebar_widget)
         sidebar_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
 
         # Logo
         logo = QLabel("OwlReg")
         logo.setFont(QFont("Arial", 24, QFont.Weight.Bold))
-        logo.setStyleSheet("color: #2356c5; margin-top: 32px;")
+        set_role(logo, "sidebar-logo")
         sidebar_layout.addWidget(logo, alignment=Qt.AlignmentFlag.AlignHCenter)
 
         owl_img = QLabel()
-        owl_img.setPixmap(QPixmap("owl_logo2.png").scaled(80, 80, Qt.AspectRatioMode.KeepAspectRatio,
-                                                          Qt.TransformationMode.SmoothTransformation))
+        owl_img.setPixmap(load_scaled_pixmap("owl_logo2.png", 80, 80))
         owl_img.setAlignment(Qt.AlignmentFlag.AlignCenter)
         sidebar_layout.addWidget(owl_img)
         sidebar_layout.addSpacing(20)
@@ -85,19 +46,7 @@ class FamilyForm(QWidget):
         for text in menu_items:
             btn = QPushButton(text)
             btn.setFont(QFont("Arial", 12))
-            btn.setStyleSheet("""
-                QPushButton {
-                    color: #222;
-                    background: transparent;
-                    border: none;
-                    text-align: left;
-                    padding: 6px 12px;
-                }
-                QPushButton:hover {
-                    background-color: #e6e6e6;
-                    border-radius: 6px;
-                }
-            """)
+            set_role(btn, "sidebar-link")
             btn.setCursor(Qt.CursorShape.PointingHandCursor)
             sidebar_layout.addWidget(btn)
 
@@ -113,19 +62,19 @@ class FamilyForm(QWidget):
         # Header
         header = QLabel("Student General Information Sheet")
         header.setFont(QFont("Arial", 20, QFont.Weight.Bold))
-        header.setStyleSheet("background-color: #4bb3fd; color: white; border-radius: 8px; padding: 18px;")
+        set_role(header, "page-header")
         header.setAlignment(Qt.AlignmentFlag.AlignCenter)
         form_layout.addWidget(header)
         form_layout.addSpacing(15)
 
         # Family Background Section
         family_group = QGroupBox()
-        family_group.setStyleSheet("border: none;")
+        set_role(family_group, "flat-group")
         family_layout = QVBoxLayout(family_group)
 
         family_title = QLabel("B. Family Background")
         family_title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
-        family_title.setStyleSheet("background-color: #4bb3fd; color: white; border-radius: 4px; padding: 6px 12px;")
+        set_role(family_title, "section-title")
         family_layout.addWidget(family_title)
         family_layout.addSpacing(10)
 
@@ -147,17 +96,7 @@ class FamilyForm(QWidget):
         for btn in (back_btn, next_btn):
             btn.setFixedWidth(140)
             btn.setFixedHeight(40)
-            btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #4bb3fd;
-                    color: white;
-                    font-weight: bold;
-                    border-radius: 6px;
-                }
-                QPushButton:hover {
-                    background-color: #379be6;
-                }
-            """)
+            set_role(btn, "nav-button")
 
         nav_layout.addWidget(back_btn)
         nav_layout.addStretch()
@@ -174,7 +113,7 @@ class FamilyForm(QWidget):
 
     def build_parent_group(self, title, allow_skip=False):
         group = QGroupBox()
-        group.setStyleSheet("QGroupBox { border: none; }")
+        set_role(group, "parent-group")
         layout = QVBoxLayout(group)
         controls = {}
 
@@ -183,7 +122,7 @@ class FamilyForm(QWidget):
         # Custom header label
         header = QLabel(title)
         header.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-        header.setStyleSheet("background-color: #dbeafe; color: #111; border-radius: 4px; padding: 6px 10px;")
+        set_role(header, "subsection-title")
         layout.addWidget(header)
 
         skip = None
@@ -191,27 +130,7 @@ class FamilyForm(QWidget):
             skip = QCheckBox(f"Check if {title.split()[0]}'s Information is Not Applicable")
             skip.setObjectName(f"{prefix}_skip")
             skip.setCursor(Qt.CursorShape.PointingHandCursor)
-            skip.setStyleSheet("""
-                QCheckBox {
-                    font-size: 14px;
-                    color: #555;
-                    font-weight: bold;
-                }
-                QCheckBox::indicator {
-                    width: 20px;
-                    height: 20px;
-                }
-                QCheckBox::indicator:unchecked {
-                    border: 2px solid #ccc;
-                    background-color: white;
-                    border-radius: 4px;
-                }
-                QCheckBox::indicator:checked {
-                    border: 2px solid #ff7043;
-                    background-color: #ff7043;
-                    border-radius: 4px;
-                }
-            """)
+            set_role(skip, "skip-check")
 
             # Add visual feedback when skipping sections
             section_controls = QWidget()
@@ -220,7 +139,7 @@ class FamilyForm(QWidget):
             section_controls_layout.setContentsMargins(0, 0, 0, 0)
 
             skip_notification = QLabel("This section will be skipped")
-            skip_notification.setStyleSheet("color: #ff7043; font-style: italic; margin-left: 10px;")
+            set_role(skip_notification, "skip-note")
             skip_notification.setVisible(False)
 
             section_controls_layout.addWidget(skip)
@@ -247,7 +166,7 @@ class FamilyForm(QWidget):
             edit.setPlaceholderText(field.replace('_', ' ').title())
             edit.setMinimumWidth(width)
             edit.setFixedHeight(32)
-            edit.setStyleSheet(self.textbox_style)
+            set_role(edit, "textbox")
             name_layout.addWidget(edit)
             controls[field] = edit
 
@@ -260,7 +179,7 @@ class FamilyForm(QWidget):
         age_edit.setObjectName(f"{prefix}_age")
         age_edit.setMinimumWidth(80)
         age_edit.setFixedHeight(32)
-        age_edit.setStyleSheet(self.textbox_style)
+        set_role(age_edit, "textbox")
         form.addRow("Age:", age_edit)
         controls["age"] = age_edit
 
@@ -270,7 +189,7 @@ class FamilyForm(QWidget):
             gender.setObjectName(f"{prefix}_gender")
             gender.addItems(["Select Gender...", "Male", "Female", "Other"])
             gender.setFixedHeight(32)
-            gender.setStyleSheet(self.combobox_style)  # Use the updated combobox style
+            set_role(gender, "combo")
             form.addRow("Gender:", gender)
             controls["gender"] = gender
 
@@ -279,7 +198,7 @@ class FamilyForm(QWidget):
         eth_edit.setObjectName(f"{prefix}_ethnicity")
         eth_edit.setMinimumWidth(120)
         eth_edit.setFixedHeight(32)
-        eth_edit.setStyleSheet(self.textbox_style)
+        set_role(eth_edit, "textbox")
         form.addRow("Ethnicity:", eth_edit)
         controls["ethnicity"] = eth_edit
 
@@ -288,7 +207,7 @@ class FamilyForm(QWidget):
         occ_edit.setObjectName(f"{prefix}_occupation")
         occ_edit.setMinimumWidth(120)
         occ_edit.setFixedHeight(32)
-        occ_edit.setStyleSheet(self.textbox_style)
+        set_role(occ_edit, "textbox")
         form.addRow("Occupation:", occ_edit)
         controls["occupation"] = occ_edit
 
@@ -299,7 +218,7 @@ class FamilyForm(QWidget):
             "Select Educational Attainment...", "Elementary", "High School", "College", "Postgraduate", "Other"
         ])
         education.setFixedHeight(32)
-        education.setStyleSheet(self.combobox_style)  # Use the updated combobox style
+        set_role(education, "combo")
         form.addRow("Highest Educational Attainment:", education)
         controls["education"] = education
 
@@ -380,15 +299,8 @@ class FamilyForm(QWidget):
                         control.clear()
                     elif isinstance(control, QComboBox):
                         control.setCurrentIndex(0)
-                    # Update visual style for disabled controls
-                    control.setStyleSheet("""
-                        background-color: #f3f3f3;
-                        color: #999;
-                        border: 1px solid #ddd;
-                    """)
+                    # Grey out the skipped controls
+                    set_role(control, "skipped-field")
                 else:
                     # Restore original style
-                    if isinstance(control, QLineEdit):
-                        control.setStyleSheet(self.textbox_style)
-                    elif isinstance(control, QComboBox):
-                        control.setStyleSheet(self.combobox_style)  # Restore combobox style
+                    set_role(control, "textbox" if isinstance(control, QLineEdit) else "combo")
@@ -3,8 +3,9 @@ from PyQt6.QtWidgets import (
     QPushButton, QComboBox, QFormLayout, QGroupBox, QScrollArea, QStackedLayout
 )
 from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QFont, QPixmap
-from image_helper import load_pixmap  # Import the image helper
+from PyQt6.QtGui import QFont
+from image_helper import load_scaled_pixmap  # Import the image helper
+from theme import set_role
 
 class Form3Academic(QWidget):
     next_clicked = pyqtSignal(dict)  # Changed to emit dict
@@ -13,66 +14,26 @@ class Form3Academic(QWidget):
     def __init__(self):
         super().__init__()
         self.resize(1200, 850)
-        self.setStyleSheet("background-color: #f7f7f7;")
-
-        # Updated textbox style to ensure white background
-        self.textbox_style = """
-            QLineEdit {
-                border: 1px solid #ccc;
-                border-radius: 4px;
-                padding: 6px;
-                background-color: white;
-            }
-            QLineEdit:focus {
-                border: 1px solid #4bb3fd;
-            }
-        """
-
-        # Combobox style with white background
-        self.combobox_style = """
-            QComboBox {
-                border: 1px solid #4bb3fd;
-                border-radius: 4px;
-                padding: 4px 10px;
-                background-color: white;
-                min-width: 100px;
-            }
-            QComboBox:hover {
-                border: 2px solid #2356c5;
-            }
-            QComboBox::drop-down {
-                subcontrol-origin: padding;
-                subcontrol-position: center right;
-                width: 20px;
-                border-left: 1px solid #4bb3fd;
-                background-color: #e1ecff;
-            }
-            QComboBox QAbstractItemView {
-                background-color: white;
-                border: 1px solid #4bb3fd;
-                selection-background-color: #e1ecff;
-            }
-        """
+        set_role(self, "form-page")
 
         main_layout = QHBoxLayout(self)
 
         # ---------------- Sidebar ----------------
         sidebar_widget = QWidget()
         sidebar_widget.setFixedWidth(220)
-        sidebar_widget.setStyleSheet("background-color: #f3f3f3; border-radius: 12px;")
+        set_role(sidebar_widget, "sidebar")
         sidebar_layout = QVBoxLayout(sidebar_widget)
         sidebar_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
 
         # Logo
         logo = QLabel("OwlReg")
         logo.setFont(QFont("Arial", 24, QFont.Weight.Bold))
-        logo.setStyleSheet("color: #2356c5; margin-top: 32px;")
+        set_role(logo, "sidebar-logo")
         sidebar_layout.addWidget(logo, alignment=Qt.AlignmentFlag.AlignHCenter)
 
         # Add owl logo
         owl_img = QLabel()
-        owl_img.setPixmap(QPixmap("owl_logo2.png").scaled(80, 80, Qt.AspectRatioMode.KeepAspectRatio,
-                                                          Qt.TransformationMode.SmoothTransformation))
+        owl_img.setPixmap(load_scaled_pixmap("owl_logo2.png", 80, 80))
         owl_img.setAlignment(Qt.AlignmentFlag.AlignCenter)
         sidebar_layout.addWidget(owl_img)
         sidebar_layout.addSpacing(20)
@@ -85,19 +46,7 @@ class Form3Academic(QWidget):
         for i, text in enumerate(menu_items):
             btn = QPushButton(text)
             btn.setFont(QFont("Arial", 12))
-            btn.setStyleSheet("""
-                QPushButton {
-                    color: #222;
-                    background: transparent;
-                    border: none;
-                    text-align: left;
-                    padding: 6px 12px;
-                }
-                QPushButton:hover {
-                    background-color: #e6e6e6;
-                    border-radius: 6px;
-                }
-            """)
+            set_role(btn, "sidebar-link")
             btn.setCursor(Qt.CursorShape.PointingHandCursor)
             btn.clicked.connect(lambda _, idx=i: self.pages.setCurrentIndex(idx))
             sidebar_layout.addWidget(btn)
@@ -126,32 +75,25 @@ class Form3Academic(QWidget):
         # Header
         header = QLabel("Student General Information Sheet")
         header.setFont(QFont("Arial", 20, QFont.Weight.Bold))
-        header.setStyleSheet("background-color: #4bb3fd; color: white; border-radius: 8px; padding: 18px;")
+        set_role(header, "page-header")
         header.setAlignment(Qt.AlignmentFlag.AlignCenter)
         form_area.addWidget(header)
         form_area.addSpacing(15)
 
         # Academic Info
         academic_group = QGroupBox()
-        academic_group.setStyleSheet("border: none;")
+        set_role(academic_group, "flat-group")
         academic_layout = QVBoxLayout(academic_group)
 
         academic_title = QLabel("C. Academic Profile")
         academic_title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
-        academic_title.setStyleSheet("background-color: #4bb3fd; color: white; border-radius: 4px; padding: 6px 12px;")
+        set_role(academic_title, "section-title")
         academic_layout.addWidget(academic_title)
         academic_layout.addSpacing(10)
 
         # Elementary Background
         elementary_group = QGroupBox("Elementary")
-        elementary_group.setStyleSheet("""
-            QGroupBox {
-                background-color: white;
-                border-radius: 8px;
-                margin-top: 15px;
-                padding: 15px;
-            }
-        """)
+        set_role(elementary_group, "school-group")
         elementary_layout = QFormLayout()
         elementary_layout.setLabelAlignment(Qt.AlignmentFlag.AlignLeft)
         elementary_layout.setFormAlignment(Qt.AlignmentFlag.AlignLeft)
@@ -178,14 +120,7 @@ class Form3Academic(QWidget):
 
         # Junior High School Background
         jhs_group = QGroupBox("Junior High")
-        jhs_group.setStyleSheet("""
-            QGroupBox {
-                background-color: white;
-                border-radius: 8px;
-                margin-top: 15px;
-                padding: 15px;
-            }
-        """)
+        set_role(jhs_group, "school-group")
         jhs_layout = QFormLayout()
         jhs_layout.setLabelAlignment(Qt.AlignmentFlag.AlignLeft)
         jhs_layout.setFormAlignment(Qt.AlignmentFlag.AlignLeft)
@@ -215,37 +150,13 @@ class Form3Academic(QWidget):
         nav_layout = QHBoxLayout()
 
         back_btn = QPushButton("Back")
-        back_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4bb3fd;
-                color: white;
-                font-size: 16px;
-                border-radius: 6px;
-                padding: 10px 20px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #379be6;
-            }
-        """)
+        set_role(back_btn, "nav-button-large")
         back_btn.setFixedWidth(160)
         back_btn.setFixedHeight(45)
         back_btn.setCursor(Qt.CursorShape.PointingHandCursor)
 
         next_btn = QPushButton("Next")
-        next_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4bb3fd;
-                color: white;
-                font-size: 16px;
-                border-radius: 6px;
-                padding: 10px 20px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #379be6;
-            }
-        """)
+        set_role(next_btn, "nav-button-large")
         next_btn.setFixedWidth(160)
         next_btn.setFixedHeight(45)
         next_btn.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -284,14 +195,14 @@ class Form3Academic(QWidget):
         tb.setMinimumWidth(width)
         tb.setFixedHeight(32)
         tb.setPlaceholderText(placeholder)
-        tb.setStyleSheet(self.textbox_style)
+        set_role(tb, "textbox")
         return tb
 
     def combo(self, items):
         c = QComboBox()
         c.addItems(items)
         c.setFixedHeight(32)
-        c.setStyleSheet(self.combobox_style)  # Apply custom style
+        set_role(c, "combo")
         return c
 
     def row(self, widgets):
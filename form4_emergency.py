@@ -3,9 +3,10 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QGroupBox, QFormLayout, QCheckBox, QScrollArea, QLineEdit, QStackedLayout, QComboBox
 )
-from PyQt6.QtGui import QFont, QPixmap
+from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt, pyqtSignal
-from image_helper import load_pixmap  # Import the image helper
+from image_helper import load_scaled_pixmap  # Import the image helper
+from theme import set_role
 
 
 class EmergencyForm(QWidget):
@@ -15,39 +16,26 @@ class EmergencyForm(QWidget):
     def __init__(self):
         super().__init__()
         self.resize(1200, 850)
-        self.setStyleSheet("background-color: #f7f7f7;")
-
-        self.textbox_style = """
-            QLineEdit {
-                border: 1px solid #ccc;
-                border-radius: 4px;
-                padding: 6px;
-                background-color: white;
-            }
-            QLineEdit:focus {
-                border: 1px solid #4bb3fd;
-            }
-        """
+        set_role(self, "form-page")
 
         main_layout = QHBoxLayout(self)
 
         # ---------------- Sidebar ----------------
         sidebar_widget = QWidget()
         sidebar_widget.setFixedWidth(220)
-        sidebar_widget.setStyleSheet("background-color: #f3f3f3; border-radius: 12px;")
+        set_role(sidebar_widget, "sidebar")
         sidebar_layout = QVBoxLayout(sidebar_widget)
         sidebar_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
 
         # Logo
         logo = QLabel("OwlReg")
         logo.setFont(QFont("Arial", 24, QFont.Weight.Bold))
-        logo.setStyleSheet("color: #2356c5; margin-top: 32px;")
+        set_role(logo, "sidebar-logo")
         sidebar_layout.addWidget(logo, alignment=Qt.AlignmentFlag.AlignHCenter)
 
         # Add owl logo
         owl_img = QLabel()
-        owl_img.setPixmap(QPixmap("owl_logo2.png").scaled(80, 80, Qt.AspectRatioMode.KeepAspectRatio,
-                                                          Qt.TransformationMode.SmoothTransformation))
+        owl_img.setPixmap(load_scaled_pixmap("owl_logo2.png", 80, 80))
         owl_img.setAlignment(Qt.AlignmentFlag.AlignCenter)
         sidebar_layout.addWidget(owl_img)
         sidebar_layout.addSpacing(20)
@@ -59,19 +47,7 @@ class EmergencyForm(QWidget):
         for i, text in enumerate(menu_items):
             btn = QPushButton(text)
             btn.setFont(QFont("Arial", 12))
-            btn.setStyleSheet("""
-                QPushButton {
-                    color: #222;
-                    background: transparent;
-                    border: none;
-                    text-align: left;
-                    padding: 6px 12px;
-                }
-                QPushButton:hover {
-                    background-color: #e6e6e6;
-                    border-radius: 6px;
-                }
-            """)
+            set_role(btn, "sidebar-link")
             btn.setCursor(Qt.CursorShape.PointingHandCursor)
             btn.clicked.connect(lambda _, idx=i: self.pages.setCurrentIndex(idx))
             sidebar_layout.addWidget(btn)
@@ -103,19 +79,19 @@ class EmergencyForm(QWidget):
         # ---------- HEADER ----------
         header = QLabel("Student General Information Sheet")
         header.setFont(QFont("Arial", 20, QFont.Weight.Bold))
-        header.setStyleSheet("background-color: #4bb3fd; color: white; border-radius: 8px; padding: 18px;")
+        set_role(header, "page-header")
         header.setAlignment(Qt.AlignmentFlag.AlignCenter)
         content_layout.addWidget(header)
         content_layout.addSpacing(15)
 
         # ---------- EMERGENCY CONTACT ----------
         emergency_group = QGroupBox()
-        emergency_group.setStyleSheet("border: none;")
+        set_role(emergency_group, "flat-group")
         emergency_layout = QVBoxLayout(emergency_group)
 
         emergency_title = QLabel("D. Emergency Contact Information")
         emergency_title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
-        emergency_title.setStyleSheet("background-color: #4bb3fd; color: white; border-radius: 4px; padding: 6px 12px;")
+        set_role(emergency_title, "section-title")
         emergency_layout.addWidget(emergency_title)
         emergency_layout.addSpacing(10)
 
@@ -145,31 +121,21 @@ class EmergencyForm(QWidget):
 
         # ---------- NOTICE, CONSENT & ENROLLMENT ----------
         notice_group = QGroupBox()
-        notice_group.setStyleSheet("border: none;")
+        set_role(notice_group, "flat-group")
         notice_layout = QVBoxLayout(notice_group)
 
         # Warning Banner
         warning_text = QLabel("APPROVAL WILL BE AUTOMATICALLY REVOKED IF THE SUBMITTED BASIS FOR ACCEPTANCE IS LATER PROVEN FRAUDULENT. ANY UNITS EARNED FROM THE TIME OF ACCEPTANCE SHALL BE CONSIDERED NULL AND VOID.")
         warning_text.setWordWrap(True)
         warning_text.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        warning_text.setStyleSheet("""
-            QLabel {
-                color: black;
-                font-weight: bold;
-                font-size: 14px;
-                border-top: 2px solid #ccc;
-                border-bottom: 2px solid #ccc;
-                padding: 12px;
-                background-color: #fff;
-            }
-        """)
+        set_role(warning_text, "warning-banner")
         notice_layout.addWidget(warning_text)
 
         # Consent
         consent_title = QLabel("CONSENT")
         consent_title.setFont(QFont("Arial", 12, QFont.Weight.Bold))
         consent_title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        consent_title.setStyleSheet("color: #2356c5; margin-top: 15px;")
+        set_role(consent_title, "notice-title")
         notice_layout.addWidget(consent_title)
 
         consent_text = QLabel(
@@ -181,14 +147,14 @@ class EmergencyForm(QWidget):
             "Act of 2012 (Republic Act 10173)."
         )
         consent_text.setWordWrap(True)
-        consent_text.setStyleSheet("font-size: 13px; color: #333; padding: 5px;")
+        set_role(consent_text, "notice-text")
         notice_layout.addWidget(consent_text)
 
         # Conditional Enrollment
         enrollment_title = QLabel("CONDITIONAL ENROLLMENT")
         enrollment_title.setFont(QFont("Arial", 12, QFont.Weight.Bold))
         enrollment_title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        enrollment_title.setStyleSheet("color: #2356c5; margin-top: 15px;")
+        set_role(enrollment_title, "notice-title")
         notice_layout.addWidget(enrollment_title)
 
         # Requirements (2 columns)
@@ -197,7 +163,7 @@ class EmergencyForm(QWidget):
         transferee = QLabel("TRANSFEREE\n\nCert. of Honorable Dismissal\nForm 137\nPSA Cert. of Live Birth\nCert. of Good Moral Character\nOthers")
 
         for col in (freshmen, transferee):
-            col.setStyleSheet("font-size: 13px; color: #333; margin: 10px;")
+            set_role(col, "notice-column")
             col.setAlignment(Qt.AlignmentFlag.AlignTop)
         requirements.addWidget(freshmen)
         requirements.addWidget(transferee)
@@ -213,37 +179,14 @@ class EmergencyForm(QWidget):
             "from my responsibility to settle any outstanding balance."
         )
         acknowledgment_text.setWordWrap(True)
-        acknowledgment_text.setStyleSheet("font-size: 13px; color: #333; padding: 5px;")
+        set_role(acknowledgment_text, "notice-text")
         notice_layout.addWidget(acknowledgment_text)
 
         content_layout.addWidget(notice_group)
 
         # Agreement Checkbox
         agreement_check = QCheckBox("I have read and agree to the terms and conditions stated above.")
-        agreement_check.setStyleSheet("""
-            QCheckBox {
-                font-size: 13px;
-                margin: 10px;
-            }
-            QCheckBox:checked {
-                color: #2356c5;
-                font-weight: bold;
-            }
-            QCheckBox::indicator {
-                width: 20px;
-                height: 20px;
-            }
-            QCheckBox::indicator:unchecked {
-                border: 2px solid #ccc;
-                background-color: white;
-                border-radius: 4px;
-            }
-            QCheckBox::indicator:checked {
-                border: 2px solid #4bb3fd;
-                background-color: #4bb3fd;
-                border-radius: 4px;
-            }
-        """)
+        set_role(agreement_check, "agreement-check")
         content_layout.addWidget(agreement_check)
 
         # Navigation
@@ -254,19 +197,7 @@ class EmergencyForm(QWidget):
         for btn in (back_btn, next_btn):
             btn.setFixedWidth(160)
             btn.setFixedHeight(45)
-            btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #4bb3fd;
-                    color: white;
-                    font-size: 16px;
-                    border-radius: 6px;
-                    padding: 10px 20px;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background-color: #379be6;
-                }
-            """)
+            set_role(btn, "nav-button-large")
             btn.setCursor(Qt.CursorShape.PointingHandCursor)
 
         nav_layout.addWidget(back_btn)
@@ -278,16 +209,6 @@ class EmergencyForm(QWidget):
         self.agreement_check = agreement_check  # Store reference
         agreement_check.stateChanged.connect(lambda state: self.update_next_button(next_btn, state))
         next_btn.setEnabled(False)
-        next_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #ccc;
-                color: #666;
-                font-size: 16px;
-                border-radius: 6px;
-                padding: 10px 20px;
-                font-weight: bold;
-            }
-        """)
 
         back_btn.clicked.connect(self.back_clicked.emit)
         next_btn.clicked.connect(self.on_next)  # Changed to call on_next
@@ -297,33 +218,8 @@ class EmergencyForm(QWidget):
 
     def update_next_button(self, button, state):
         """Update next button appearance based on checkbox state"""
-        if state == 2:  # Checked
-            button.setEnabled(True)
-            button.setStyleSheet("""
-                QPushButton {
-                    background-color: #4bb3fd;
-                    color: white;
-                    font-size: 16px;
-                    border-radius: 6px;
-                    padding: 10px 20px;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background-color: #379be6;
-                }
-            """)
-        else:  # Not checked
-            button.setEnabled(False)
-            button.setStyleSheet("""
-                QPushButton {
-                    background-color: #ccc;
-                    color: #666;
-                    font-size: 16px;
-                    border-radius: 6px;
-                    padding: 10px 20px;
-                    font-weight: bold;
-                }
-            """)
+        # The theme greys the button out while it is disabled
+        button.setEnabled(state == 2)  # Checked
 
     def make_textbox(self, width=200, placeholder="", objectName=""):
         tb = QLineEdit()
@@ -332,7 +228,7 @@ class EmergencyForm(QWidget):
         tb.setMinimumWidth(width)
         tb.setFixedHeight(32)
         tb.setPlaceholderText(placeholder)
-        tb.setStyleSheet(self.textbox_style)
+        set_role(tb, "textbox")
         return tb
 
     def row(self, widgets):
@@ -3,8 +3,69 @@ from PyQt6.QtWidgets import (
     QHBoxLayout, QFrame, QGroupBox, QSizePolicy, QSpacerItem
 )
 from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QFont, QPixmap
-from image_helper import load_pixmap  # Import the image helper
+from PyQt6.QtGui import QFont
+from image_helper import load_scaled_pixmap  # Import the image helper
+from theme import set_role
+
+# The summary's sections: title, and the key of that step's data in form_data
+SUMMARY_SECTIONS = [
+    ("Email Information", "email"),
+    ("Personal Information", "personal"),
+    ("Family Information", "family"),
+    ("Academic Information", "academic"),
+    ("Emergency Information", "emergency"),
+]
+
+
+class SummarySection(QGroupBox):
+    """
+    One group box of the summary, with a row per field
+    set_data() only touches the rows that changed, so showing the summary
+    again for the same student doesn't rebuild its labels
+    """
+    def __init__(self, title):
+        super().__init__(title)
+        set_role(self, "summary-section")
+
+        section_layout = QVBoxLayout(self)
+        section_layout.setSpacing(8)
+
+        self.no_data = QLabel("No data provided.")
+        set_role(self.no_data, "no-data")
+        section_layout.addWidget(self.no_data)
+
+        self.rows = {}  # field key -> its QLabel, in display order
+
+    def set_data(self, data_dict):
+        """Show data_dict, adding, updating and removing rows by key"""
+        # Format the key for better display (replace underscores with spaces, capitalize)
+        texts = {key: f"<b>{key.replace('_', ' ').title()}:</b> {value}" for key, value in data_dict.items()}
+        section_layout = self.layout()
+
+        for key in [key for key in self.rows if key not in texts]:
+            row = self.rows.pop(key)
+            section_layout.removeWidget(row)
+            row.deleteLater()
+
+        for key, text in texts.items():
+            row = self.rows.get(key)
+            if row is None:
+                row = QLabel(text)
+                row.setWordWrap(True)
+                set_role(row, "summary-row")
+                section_layout.addWidget(row)
+                self.rows[key] = row
+            elif row.text() != text:
+                row.setText(text)
+
+        # New keys went to the end; put the rows back in the data's order if that differs
+        if list(self.rows) != list(texts):
+            for key in texts:
+                section_layout.removeWidget(self.rows[key])
+                section_layout.addWidget(self.rows[key])
+            self.rows = {key: self.rows[key] for key in texts}
+
+        self.no_data.setVisible(not texts)
 
 
 class ConfirmationForm(QWidget):
@@ -14,7 +75,7 @@ class ConfirmationForm(QWidget):
     def __init__(self):
         super().__init__()
         self.form_data = {}
-        self.summary_widget = None
+        self.sections = {}  # section title -> SummarySection
 
         # Track submit button click to prevent multiple submissions
         self.submitted = False
@@ -27,23 +88,21 @@ class ConfirmationForm(QWidget):
         title = QLabel("Confirmation & Summary")
         title.setFont(QFont("Arial", 18, QFont.Weight.Bold))
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        title.setStyleSheet("color: #2356c5; padding: 10px; background-color: #f0f5ff; border-radius: 8px;")
+        set_role(title, "summary-title")
         main_layout.addWidget(title)
 
         # Logo/image if needed
         if hasattr(self, 'logo_label') and self.logo_label:
-            logo_pixmap = load_pixmap("owl_logo2.png")
-            self.logo_label.setPixmap(logo_pixmap.scaled(80, 80, Qt.AspectRatioMode.KeepAspectRatio,
-                                                  Qt.TransformationMode.SmoothTransformation))
+            self.logo_label.setPixmap(load_scaled_pixmap("owl_logo2.png", 80, 80))
 
         # Scroll area for long content
         self.scroll = QScrollArea()
         self.scroll.setWidgetResizable(True)
-        self.scroll.setStyleSheet("QScrollArea { border: none; background-color: transparent; }")
+        set_role(self.scroll, "summary-scroll")
         main_layout.addWidget(self.scroll, 1)  # Give it a stretch factor of 1
 
-        # Placeholder summary widget
-        self.summary_widget = QWidget()
+        # The summary is built once; update_data() fills it in
+        self.summary_widget = self.build_summary()
         self.scroll.setWidget(self.summary_widget)
 
         # Buttons
@@ -53,34 +112,12 @@ class ConfirmationForm(QWidget):
 
         self.back_button = QPushButton("Back")
         self.back_button.setFixedSize(130, 40)
-        self.back_button.setStyleSheet("""
-            QPushButton {
-                background-color: #4bb3fd;
-                color: white;
-                font-weight: bold;
-                font-size: 14px;
-                border-radius: 6px;
-            }
-            QPushButton:hover {
-                background-color: #379be6;
-            }
-        """)
+        set_role(self.back_button, "back-button")
         self.back_button.clicked.connect(self.back_clicked.emit)
 
         self.submit_button = QPushButton("Submit")
         self.submit_button.setFixedSize(130, 40)
-        self.submit_button.setStyleSheet("""
-            QPushButton {
-                background-color: #2356c5;
-                color: white;
-                font-weight: bold;
-                font-size: 14px;
-                border-radius: 6px;
-            }
-            QPushButton:hover {
-                background-color: #1a408f;
-            }
-        """)
+        set_role(self.submit_button, "primary-button")
         self.submit_button.clicked.connect(self.on_submit)
 
         button_layout.addWidget(self.back_button)
@@ -89,56 +126,32 @@ class ConfirmationForm(QWidget):
         main_layout.addLayout(button_layout)
 
     def update_data(self, data):
-        """Update the form with the collected data"""
+        """Update the form with the collected data, changing only the summary rows that differ"""
         self.form_data = data
-        self.rebuild_summary()
-
-    def rebuild_summary(self):
-        """Rebuild the summary section with current data"""
-        if self.summary_widget:
-            self.summary_widget.deleteLater()
-
-        self.summary_widget = QWidget()
-        summary_layout = QVBoxLayout(self.summary_widget)
+        for title, key in SUMMARY_SECTIONS:
+            section_data = self.form_data.get(key, {})
+            if key == "family":
+                # Process family data to remove internal fields and set empty values to N/A
+                section_data = self.process_family_data(section_data)
+            self.sections[title].set_data(section_data)
+
+    def build_summary(self):
+        """Build the summary sections (empty until update_data) and the agreement"""
+        summary_widget = QWidget()
+        summary_layout = QVBoxLayout(summary_widget)
         summary_layout.setSpacing(20)
         summary_layout.setContentsMargins(10, 10, 10, 10)
         summary_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
 
-        # Extract all collected data
-        email_data = self.form_data.get('email', {})
-        personal_data = self.form_data.get('personal', {})
-        family_data = self.form_data.get('family', {})
-        academic_data = self.form_data.get('academic', {})
-        emergency_data = self.form_data.get('emergency', {})
-
-        # Process family data to remove internal fields and set empty values to N/A
-        processed_family_data = self.process_family_data(family_data)
-
         # Add sections
-        summary_layout.addWidget(self.create_section("Email Information", email_data))
-        summary_layout.addWidget(self.create_section("Personal Information", personal_data))
-        summary_layout.addWidget(self.create_section("Family Information", processed_family_data))
-        summary_layout.addWidget(self.create_section("Academic Information", academic_data))
-        summary_layout.addWidget(self.create_section("Emergency Information", emergency_data))
+        self.sections = {}
+        for title, _ in SUMMARY_SECTIONS:
+            self.sections[title] = SummarySection(title)
+            summary_layout.addWidget(self.sections[title])
 
         # Add the final agreement / consent
         agreement_box = QGroupBox("Terms & Consent")
-        agreement_box.setStyleSheet("""
-            QGroupBox {
-                background-color: #fff8f0;
-                border: 2px solid #ffa940;
-                border-radius: 8px;
-                margin-top: 15px;
-                font-weight: bold;
-                padding: 10px;
-                color: #d46b08;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-        """)
+        set_role(agreement_box, "agreement-box")
 
         agreement_layout = QVBoxLayout(agreement_box)
 
@@ -169,7 +182,7 @@ I hereby acknowledge that my enrolment is conditional upon the submission of the
 I further acknowledge that failure to submit the required document/s within the specified period shall result in the cancellation of my enrolment. In such case, I understand that I will not be entitled to credits for the subjects I have enrolled in, nor to any refund of payments made. Additionally, this will not release me from my responsibility to settle any outstanding balance.
         """)
         agreement.setWordWrap(True)
-        agreement.setStyleSheet("color: #333; margin-top: 5px; padding: 5px;")
+        set_role(agreement, "agreement-text")
         agreement_layout.addWidget(agreement)
 
         summary_layout.addWidget(agreement_box)
@@ -177,47 +190,7 @@ I further acknowledge that failure to submit the required document/s within the
         # Add some space at the bottom
         summary_layout.addSpacerItem(QSpacerItem(20, 20, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding))
 
-        self.scroll.setWidget(self.summary_widget)
-
-    def create_section(self, title, data_dict):
-        """Helper to create summary sections"""
-        section = QGroupBox(title)
-        section.setStyleSheet("""
-            QGroupBox {
-                background-color: #f5f5f5;
-                border: 2px solid #4bb3fd;
-                border-radius: 8px;
-                margin-top: 15px;
-                font-weight: bold;
-                padding: 10px;
-                color: #2356c5;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-        """)
-
-        section_layout = QVBoxLayout(section)
-        section_layout.setSpacing(8)
-
-        if not data_dict:
-            no_data = QLabel("No data provided.")
-            no_data.setStyleSheet("color: gray; font-style: italic;")
-            section_layout.addWidget(no_data)
-        else:
-            for key, value in data_dict.items():
-                # Format the key for better display (replace underscores with spaces, capitalize)
-                display_key = key.replace('_', ' ').title()
-
-                # Create row with formatted data
-                row = QLabel(f"<b>{display_key}:</b> {value}")
-                row.setWordWrap(True)
-                row.setStyleSheet("color: #333; padding: 3px;")
-                section_layout.addWidget(row)
-
-        return section
+        return summary_widget
 
     def process_family_data(self, family_data):
         """Process family data to display only relevant information and format it properly"""
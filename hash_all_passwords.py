@@ -1,70 +1,128 @@
-import sqlite3
+"""
+Bulk password migration for OwlReg
+Hashes every plaintext password left in the SQLite staff table and the MySQL
+staff/admin tables. The hashing is spread over a process pool and each batch
+of accounts is written in one transaction. Only plaintext passwords are
+touched, so an interrupted run can simply be started again and carries on
+where it stopped. (Hashes in an older format can't be redone without the
+password - they are upgraded when their owner next logs in.)
+"""
+import argparse
 import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from password_utils import hash_password
-
-# Get database path
-DB_FILE = os.path.join(os.path.dirname(__file__), "student_records.db")
-
-def hash_all_passwords():
+import sqlite_db
+from password_utils import current_algorithm, current_cost, hash_password, parse_hash
+
+# Accounts read, hashed and written per transaction
+BATCH_SIZE = 1000
+
+# (table, ID column, password column) to migrate in each database
+SQLITE_TABLES = (("staff", "staff_id", "password"),)
+MYSQL_TABLES = (("staff", "staff_id", "password_hash"), ("admin", "admin_id", "password_hash"))
+
+def is_plaintext(value):
+    """True for a password stored as plain text rather than as a hash"""
+    # Raw binary that ended up in a text column isn't a password anyone typed
+    return isinstance(value, str) and bool(value) and value.isprintable() and parse_hash(value) is None
+
+def _hash_chunk(passwords, algorithm, cost):
+    """Runs in a worker process: hash a list of passwords"""
+    return [hash_password(password, algorithm=algorithm, cost=cost) for password in passwords]
+
+def _hash_batch(pool, workers, passwords, algorithm, cost):
+    """Hash a batch of passwords, split evenly across the worker processes"""
+    if pool is None:
+        return _hash_chunk(passwords, algorithm, cost)
+    size = -(-len(passwords) // workers)
+    chunks = [passwords[i:i + size] for i in range(0, len(passwords), size)]
+    return [hashed for chunk in pool.map(_hash_chunk, chunks, [algorithm] * len(chunks), [cost] * len(chunks))
+            for hashed in chunk]
+
+def migrate_table(connection, placeholder, table, id_column, password_column,
+                  pool, workers, algorithm, cost, batch_size=BATCH_SIZE):
+    """
+    Hash the plaintext passwords of one table, batch_size accounts at a time
+    placeholder is the driver's parameter marker ("?" for SQLite, "%s" for MySQL).
+    Returns the number of passwords hashed
     """
-    Convert all plain text passwords in the database to hashed passwords
+    cursor = connection.cursor()
+    select_sql = (f"SELECT {id_column}, {password_column} FROM {table} "
+                  f"WHERE {id_column} > {placeholder} ORDER BY {id_column} LIMIT {placeholder}")
+    # Only replace the password that was read, in case its owner changed it meanwhile
+    update_sql = (f"UPDATE {table} SET {password_column} = {placeholder} "
+                  f"WHERE {id_column} = {placeholder} AND {password_column} = {placeholder}")
+
+    hashed_count = 0
+    last_id = 0
+    while True:
+        cursor.execute(select_sql, (last_id, batch_size))
+        rows = cursor.fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        pending = [(account_id, password) for account_id, password in rows if is_plaintext(password)]
+        if not pending:
+            continue
+
+        hashes = _hash_batch(pool, workers, [password for _, password in pending], algorithm, cost)
+        cursor.executemany(update_sql, [(hashed, account_id, password)
+                                        for (account_id, password), hashed in zip(pending, hashes)])
+        connection.commit()
+        hashed_count += len(pending)
+        print(f"  {table}: hashed {hashed_count} password(s) so far (up to ID {last_id})")
+
+    cursor.close()
+    return hashed_count
+
+def _mysql_tables(connection):
+    """The MySQL account tables that exist (create_mysql_users.py makes them)"""
+    cursor = connection.cursor()
+    tables = []
+    for table, id_column, password_column in MYSQL_TABLES:
+        cursor.execute("SHOW TABLES LIKE %s", (table,))
+        if cursor.fetchone():
+            tables.append((table, id_column, password_column))
+    cursor.close()
+    return tables
+
+def hash_all_passwords(workers=None, batch_size=BATCH_SIZE, include_mysql=True, cost=None):
+    """
+    Convert all plain text passwords in the databases to hashed passwords
+    Uses the deployment's hash algorithm and cost (calibrated once, here) unless cost is given
     """
     try:
         print("Starting password hashing process...")
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-
-        # First check if the database exists and has the staff table
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='staff'")
-        if not cursor.fetchone():
-            print("Error: Staff table does not exist in the database.")
-            conn.close()
+        if not sqlite_db.ensure_schema():
+            print("Error: could not open the SQLite database.")
             return False
 
-        # Get all staff accounts with plain text passwords
-        cursor.execute("SELECT staff_id, username, password FROM staff")
-        staff_accounts = cursor.fetchall()
+        algorithm = current_algorithm()
+        cost = cost or current_cost(algorithm)
+        workers = workers or os.cpu_count() or 1
+        print(f"Hashing with {algorithm} (cost {cost}) on {workers} process(es)")
 
-        if not staff_accounts:
-            print("No staff accounts found in the database.")
-            conn.close()
-            return False
-
-        print(f"Found {len(staff_accounts)} staff account(s)")
-
-        # Count of passwords updated
+        start = time.perf_counter()
         updated_count = 0
-
-        # Update each password to hashed version
-        for staff_id, username, password in staff_accounts:
-            # Skip already hashed passwords (if they're in bytes format)
-            if isinstance(password, bytes):
-                print(f"Staff '{username}' (ID: {staff_id}) already has a hashed password. Skipping.")
-                continue
-
-            # Hash the password
-            try:
-                hashed_password = hash_password(password)
-
-                # Update the database with the hashed password
-                cursor.execute(
-                    "UPDATE staff SET password = ? WHERE staff_id = ?",
-                    (hashed_password, staff_id)
-                )
-
-                updated_count += 1
-                print(f"Hashed password for staff '{username}' (ID: {staff_id})")
-            except Exception as e:
-                print(f"Error hashing password for staff '{username}' (ID: {staff_id}): {e}")
-
-        # Commit changes
-        conn.commit()
-        conn.close()
-
-        print(f"\nPassword hashing complete. Updated {updated_count} staff account(s).")
-        print("All passwords are now securely hashed using SHA-256.")
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            conn = sqlite_db.get_connection()
+            for table, id_column, password_column in SQLITE_TABLES:
+                print(f"SQLite {table}:")
+                updated_count += migrate_table(conn, "?", table, id_column, password_column,
+                                               pool, workers, algorithm, cost, batch_size)
+
+            if include_mysql:
+                updated_count += _hash_mysql_passwords(pool, workers, algorithm, cost, batch_size)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        elapsed = time.perf_counter() - start
+        print(f"\nPassword hashing complete. Updated {updated_count} account(s) in {elapsed:.1f} s.")
 
         # Update timestamp file to record when this was done
         with open("passwords_hashed.txt", "w") as f:
@@ -77,17 +135,40 @@ def hash_all_passwords():
         print(f"Error during password hashing: {e}")
         return False
 
+def _hash_mysql_passwords(pool, workers, algorithm, cost, batch_size):
+    """Migrate the MySQL staff and admin tables; skipped when MySQL isn't reachable"""
+    try:
+        from mysql_db import pooled_connection
+        with pooled_connection() as connection:
+            updated_count = 0
+            for table, id_column, password_column in _mysql_tables(connection):
+                print(f"MySQL {table}:")
+                updated_count += migrate_table(connection, "%s", table, id_column, password_column,
+                                               pool, workers, algorithm, cost, batch_size)
+            return updated_count
+    except Exception as e:
+        print(f"Skipping MySQL accounts: {e}")
+        return 0
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hash every plaintext staff and admin password")
+    parser.add_argument("--yes", action="store_true", help="don't ask for confirmation")
+    parser.add_argument("--workers", type=int, default=None, help="hashing processes (default: one per CPU)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="accounts per transaction")
+    parser.add_argument("--sqlite-only", action="store_true", help="leave the MySQL accounts alone")
+    args = parser.parse_args()
+
     print("Password Hashing Utility")
     print("-----------------------\n")
 
     # Confirm action
-    confirm = input("This will hash all plain text passwords in the database. Continue? (y/n): ")
-    if confirm.lower() != 'y':
-        print("Operation cancelled.")
-        sys.exit(0)
+    if not args.yes:
+        confirm = input("This will hash all plain text passwords in the databases. Continue? (y/n): ")
+        if confirm.lower() != 'y':
+            print("Operation cancelled.")
+            sys.exit(0)
 
-    success = hash_all_passwords()
+    success = hash_all_passwords(args.workers, args.batch_size, include_mysql=not args.sqlite_only)
 
     if success:
         print("\nOperation completed successfully.")
@@ -1,41 +1,81 @@
 """
 Image loading helper for OwlReg
-Provides functions to safely load images, with fallbacks for missing files
+Provides functions to safely load images, with fallbacks for missing files.
+Loaded and scaled pixmaps are kept in QPixmapCache, so the logo every page
+shows is decoded and scaled once per process instead of once per page
 """
 import os
-from PyQt6.QtGui import QPixmap, QIcon
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPixmap, QPixmapCache, QIcon
 import traceback
 
+# QPixmapCache is shared by the whole process, so keys carry a prefix
+CACHE_PREFIX = "owlreg:"
+# Room for the decoded logos and their scaled copies (QPixmapCache's default is 10 MB)
+CACHE_LIMIT_KB = 32 * 1024
+
+QPixmapCache.setCacheLimit(max(QPixmapCache.cacheLimit(), CACHE_LIMIT_KB))
+
 def get_image_path(filename):
     """Get the absolute path to an image file in the application directory"""
     return os.path.join(os.path.dirname(__file__), filename)
 
+def _placeholder(size):
+    """A blank pixmap of `size`, made once per size"""
+    key = f"{CACHE_PREFIX}placeholder:{size[0]}x{size[1]}"
+    pixmap = QPixmapCache.find(key)
+    if pixmap is None:
+        pixmap = QPixmap(size[0], size[1])
+        pixmap.fill()  # Fill with default color
+        QPixmapCache.insert(key, pixmap)
+    return pixmap
+
 def load_pixmap(filename, default_size=(100, 100)):
     """
     Safely load a QPixmap from a file with error handling
-    Returns a valid pixmap even if the file is missing
+    Returns a valid pixmap even if the file is missing. The file is only
+    read the first time; later calls share the cached pixmap
     """
+    key = f"{CACHE_PREFIX}{filename}"
+    pixmap = QPixmapCache.find(key)
+    if pixmap is not None:
+        return pixmap
+
     try:
         # Try to load the specified image file
         path = get_image_path(filename)
         if os.path.exists(path):
             pixmap = QPixmap(path)
             if not pixmap.isNull():
+                QPixmapCache.insert(key, pixmap)
                 return pixmap
 
-        # If file doesn't exist or couldn't be loaded, create a blank pixmap
+        # If file doesn't exist or couldn't be loaded, use a blank pixmap
+        # (cached under the filename too, so the warning only shows once)
         print(f"Warning: Could not load image '{filename}', using placeholder instead.")
-        pixmap = QPixmap(default_size[0], default_size[1])
-        pixmap.fill()  # Fill with default color
+        pixmap = _placeholder(default_size)
+        QPixmapCache.insert(key, pixmap)
         return pixmap
 
     except Exception as e:
         print(f"Error loading image '{filename}': {e}")
         traceback.print_exc()
         # Return a blank pixmap on error
-        pixmap = QPixmap(default_size[0], default_size[1])
-        pixmap.fill()  # Fill with default color
-        return pixmap
+        return _placeholder(default_size)
+
+def load_scaled_pixmap(filename, width, height,
+                       aspect_mode=Qt.AspectRatioMode.KeepAspectRatio,
+                       transform_mode=Qt.TransformationMode.SmoothTransformation):
+    """
+    load_pixmap(filename) scaled to fit width x height, smoothly and keeping
+    its aspect ratio by default. Each size is scaled once and then cached
+    """
+    key = f"{CACHE_PREFIX}{filename}@{width}x{height}:{aspect_mode.value}:{transform_mode.value}"
+    pixmap = QPixmapCache.find(key)
+    if pixmap is None:
+        pixmap = load_pixmap(filename, (width, height)).scaled(width, height, aspect_mode, transform_mode)
+        QPixmapCache.insert(key, pixmap)
+    return pixmap
 
 def load_icon(filename):
     """
@@ -1,18 +1,13 @@
 from PyQt6.QtWidgets import QApplication, QMainWindow, QStackedWidget, QMessageBox
+from PyQt6.QtCore import QThreadPool
 import sys
 import traceback
 from OwlReg.image_helper import load_pixmap  # Fixed import path
 from datetime import datetime
-from dashboard_login import DashboardLoginScreen, StaffLoginDialog, StaffDashboard, AdminLoginDialog
-from student_email import StudentEmailScreen
-from personal_info import StudentGeneralInfoScreen
-from form2_family import FamilyForm
-from form3_academic import Form3Academic
-from form4_emergency import EmergencyForm
-from form5_confirmation import ConfirmationForm
-from success_screen import SuccessScreen
-from admin_list import AdminDashboard
-from reference_code_screen import ReferenceCodeScreen
+from dashboard_login import StaffLoginDialog, StaffDashboard, AdminLoginDialog
+from pages import PageRegistry
+from theme import apply_theme
+from workers import Worker
 
 # Import database manager that handles both SQLite and MySQL
 import db_manager
@@ -35,92 +30,55 @@ class MainWindow(QMainWindow):
         # Store form data
         self.form_data = {}
 
+        # Registration save running in the background (None when idle)
+        self.submit_worker = None
+
         # Create the stacked widget
         self.stack = QStackedWidget()
         self.setCentralWidget(self.stack)
 
-        # Create instances of all form pages
-        self.dashboard_page = DashboardLoginScreen()
-        self.email_page = StudentEmailScreen()
-        self.personal_info_page = StudentGeneralInfoScreen()
-        self.family_page = FamilyForm()
-        self.academic_page = Form3Academic()
-        self.emergency_page = EmergencyForm()
-        self.confirmation_page = ConfirmationForm()
-        self.success_page = SuccessScreen()
-        self.reference_screen = ReferenceCodeScreen()
-
-        # Add all pages to the stack
-        self.stack.addWidget(self.dashboard_page)      # index 0
-        self.stack.addWidget(self.email_page)          # index 1
-        self.stack.addWidget(self.personal_info_page)  # index 2
-        self.stack.addWidget(self.family_page)         # index 3
-        self.stack.addWidget(self.academic_page)       # index 4
-        self.stack.addWidget(self.emergency_page)      # index 5
-        self.stack.addWidget(self.confirmation_page)   # index 6
-        self.stack.addWidget(self.success_page)        # index 7
-        self.stack.addWidget(self.reference_screen)    # index 8
-
-        # Admin
-        self.admin_dashboard = AdminDashboard()
-        self.stack.addWidget(self.admin_dashboard)     # index 9
-
-        # ---------------- Navigation Signal Connections ---------------- #
-
-        # Dashboard page connections
-        self.dashboard_page.admin_login_clicked.connect(self.show_admin_login)
-        self.dashboard_page.student_register_clicked.connect(
-            lambda: self.stack.setCurrentIndex(1)
-        )
-        self.dashboard_page.staff_login_clicked.connect(self.show_staff_login)
-
-        # Email page connections
-        self.email_page.next_clicked.connect(self.on_email_next)
-
-        # Personal Info page connections
-        self.personal_info_page.next_clicked.connect(self.on_personal_info_next)
-        self.personal_info_page.back_clicked.connect(
-            lambda: self.stack.setCurrentIndex(1)
-        )
-
-        # Family page connections
-        self.family_page.next_clicked.connect(self.on_family_next)
-        self.family_page.back_clicked.connect(
-            lambda: self.stack.setCurrentIndex(2)
-        )
-
-        # Academic page connections
-        self.academic_page.next_clicked.connect(self.on_academic_next)
-        self.academic_page.back_clicked.connect(
-            lambda: self.stack.setCurrentIndex(3)
-        )
-
-        # Emergency page connections
-        self.emergency_page.next_clicked.connect(self.on_emergency_next)
-        self.emergency_page.back_clicked.connect(
-            lambda: self.stack.setCurrentIndex(4)
-        )
-
-        # Confirmation page connections
-        self.confirmation_page.back_clicked.connect(
-            lambda: self.stack.setCurrentIndex(5)
-        )
-        # This is the critical connection - make sure it's correct:
-        self.confirmation_page.submit_clicked.connect(self.on_submit)
-
-        # Success page connection
-        self.success_page.close_clicked.connect(self.close)
-
-        # Reference code screen connection
-        self.reference_screen.close_clicked.connect(lambda: self.stack.setCurrentWidget(self.dashboard_page))
+        # Pages are built (and their modules imported) the first time they are shown;
+        # next_page is prewarmed while the student is still on the page before it
+        self.pages = PageRegistry(self.stack)
+        self.pages.register("dashboard", "dashboard_login", "DashboardLoginScreen",
+                            self.connect_dashboard_page, next_page="email")
+        self.pages.register("email", "student_email", "StudentEmailScreen",
+                            self.connect_email_page, next_page="personal_info")
+        self.pages.register("personal_info", "personal_info", "StudentGeneralInfoScreen",
+                            self.connect_personal_info_page, next_page="family")
+        self.pages.register("family", "form2_family", "FamilyForm",
+                            self.connect_family_page, next_page="academic")
+        self.pages.register("academic", "form3_academic", "Form3Academic",
+                            self.connect_academic_page, next_page="emergency")
+        self.pages.register("emergency", "form4_emergency", "EmergencyForm",
+                            self.connect_emergency_page, next_page="confirmation")
+        self.pages.register("confirmation", "form5_confirmation", "ConfirmationForm",
+                            self.connect_confirmation_page, next_page="reference")
+        self.pages.register("success", "success_screen", "SuccessScreen", self.connect_success_page)
+        self.pages.register("reference", "reference_code_screen", "ReferenceCodeScreen",
+                            self.connect_reference_page)
+        self.pages.register("admin", "admin_list", "AdminDashboard", self.connect_admin_dashboard)
+
+        # Only the first page is built up front
+        self.show_page("dashboard")
 
         # Check database connection in background
-        QApplication.processEvents()
         self.check_database_connection()
 
+        # Copy any registrations still queued from earlier sessions to MySQL
+        db_manager.start_replication()
+
     def check_database_connection(self):
-        """Check database connection on startup"""
-        results = db_manager.test_connections()
+        """Start the startup database checks on a worker so the window shows right away"""
+        self.connection_worker = Worker(db_manager.test_connections)
+        self.connection_worker.signals.finished.connect(self.on_database_checked)
+        QThreadPool.globalInstance().start(self.connection_worker)
+
+    def on_database_checked(self, results):
+        """Warn about any database that failed the startup check"""
+        print(f"Database connection results: {results}")
+        print(f"SQLite connection status: {'Connected' if results.get('sqlite', False) else 'Not connected'}")
+        print(f"MySQL connection status: {'Connected' if results.get('mysql', False) else 'Not connected'}")
 
         # Check both database connections and show appropriate warnings
         if 'mysql' in results and not results['mysql']:
@@ -150,111 +108,191 @@ class MainWindow(QMainWindow):
                 "The application requires at least one working database connection to function."
             )
 
+    # ---------------- Navigation Signal Connections ---------------- #
+
+    def show_page(self, name):
+        """Switch to the page called `name`, building it first if needed"""
+        return self.pages.show(name)
+
+    def connect_dashboard_page(self, page):
+        page.admin_login_clicked.connect(self.show_admin_login)
+        page.student_register_clicked.connect(lambda: self.show_page("email"))
+        page.staff_login_clicked.connect(self.show_staff_login)
+
+    def connect_email_page(self, page):
+        page.next_clicked.connect(self.on_email_next)
+
+    def connect_personal_info_page(self, page):
+        page.next_clicked.connect(self.on_personal_info_next)
+        page.back_clicked.connect(lambda: self.show_page("email"))
+
+    def connect_family_page(self, page):
+        page.next_clicked.connect(self.on_family_next)
+        page.back_clicked.connect(lambda: self.show_page("personal_info"))
+
+    def connect_academic_page(self, page):
+        page.next_clicked.connect(self.on_academic_next)
+        page.back_clicked.connect(lambda: self.show_page("family"))
+
+    def connect_emergency_page(self, page):
+        page.next_clicked.connect(self.on_emergency_next)
+        page.back_clicked.connect(lambda: self.show_page("academic"))
+
+    def connect_confirmation_page(self, page):
+        page.back_clicked.connect(lambda: self.show_page("emergency"))
+        page.submit_clicked.connect(self.on_submit)
+
+    def connect_success_page(self, page):
+        page.close_clicked.connect(self.close)
+
+    def connect_reference_page(self, page):
+        page.close_clicked.connect(lambda: self.show_page("dashboard"))
+
+    def connect_admin_dashboard(self, page):
+        # Closing the admin dashboard (logging out) returns to the dashboard login
+        page.closeEvent = lambda event: self.handle_admin_logout(event)
+
     # ---------------- Data Collection Methods ---------------- #
 
     def on_email_next(self, data):
         self.form_data["email"] = data
-        self.stack.setCurrentIndex(2)
+        self.show_page("personal_info")
 
     def on_personal_info_next(self, data):
         self.form_data["personal"] = data
-        self.stack.setCurrentIndex(3)
+        self.show_page("family")
 
     def on_family_next(self, data):
         self.form_data["family"] = data
-        self.stack.setCurrentIndex(4)
+        self.show_page("academic")
 
     def on_academic_next(self, data):
         self.form_data["academic"] = data
-        self.stack.setCurrentIndex(5)
+        self.show_page("emergency")
 
     def on_emergency_next(self, data):
         self.form_data["emergency"] = data
         # Pass all collected data to Confirmation page
-        self.confirmation_page.update_data(self.form_data)
-        self.stack.setCurrentIndex(6)
+        self.pages.get("confirmation").update_data(self.form_data)
+        self.show_page("confirmation")
 
     def on_submit(self):
-        """Handle submit button click and save to the database"""
+        """Handle submit button click and save to the database in the background"""
+        # Coalesce repeat clicks - the registration already being saved is the same one
+        if self.submit_worker is not None:
+            print("Registration is already being saved - ignoring repeat submission")
+            return
+
         print("Processing registration submission...")
 
         # Disable submit button to prevent multiple submissions
-        self.confirmation_page.submit_button.setEnabled(False)
-        self.confirmation_page.submit_button.setText("Submitting...")
-        QApplication.processEvents()  # Force UI update
-
-        try:
-            # Save data using database manager which handles both SQLite and MySQL
-            success, reference_code, student_id, db_results = db_manager.save_registration(self.form_data)
-
-            if success:
-                print(f"Registration saved successfully. Reference code: {reference_code}")
-                print(f"Database results: {db_results}")
-
-                # Determine which databases were used successfully
-                sqlite_success = db_results.get('sqlite', {}).get('success', False)
-                mysql_success = db_results.get('mysql', {}).get('success', False)
-
-                # Get student name for display
-                personal_data = self.form_data.get("personal", {})
-                student_name = f"{personal_data.get('first_name', '')} {personal_data.get('last_name', '')}"
-
-                # Show reference code screen
-                self.reference_screen.set_code(reference_code, student_name)
-
-                # Add note about database storage based on which databases worked
-                current_date = datetime.now().strftime("%B %d, %Y")
-                if sqlite_success and mysql_success:
-                    db_note = f"Registration completed on {current_date}.\n" \
-                              f"All information has been saved to both MySQL and SQLite databases."
-                elif mysql_success:
-                    db_note = f"Registration completed on {current_date}.\n" \
-                              f"All information has been saved to the MySQL database."
-                elif sqlite_success:
-                    db_note = f"Registration completed on {current_date}.\n" \
-                              f"All information has been saved to the SQLite database."
-                else:
-                    # This shouldn't happen since success would be False
-                    db_note = f"Registration completed on {current_date}.\n" \
-                              f"Warning: Database storage may not be complete."
-
-                self.reference_screen.set_db_note(db_note)
-
-                # Show the reference screen
-                self.stack.setCurrentWidget(self.reference_screen)
-
-                # Clear form data
-                self.form_data = {}
-
+        submit_button = self.pages.get("confirmation").submit_button
+        submit_button.setEnabled(False)
+        submit_button.setText("Submitting...")
+
+        # Save data using database manager which handles both SQLite and MySQL,
+        # on a pool thread so a slow MySQL server doesn't freeze the window
+        self.submit_worker = Worker(self.save_registration_task, dict(self.form_data), report_progress=True)
+        self.submit_worker.signals.progress.connect(self.on_submit_progress)
+        self.submit_worker.signals.finished.connect(self.on_submit_finished)
+        self.submit_worker.signals.error.connect(self.on_submit_error)
+        QThreadPool.globalInstance().start(self.submit_worker)
+
+    @staticmethod
+    def save_registration_task(form_data, progress):
+        """Runs on a worker thread: save the registration to the databases"""
+        progress("Saving...")
+        return db_manager.save_registration(form_data)
+
+    def on_submit_progress(self, message):
+        """Show save progress on the submit button"""
+        self.pages.get("confirmation").submit_button.setText(message)
+
+    def reset_submit_button(self):
+        """Let the confirmation page submit again"""
+        confirmation_page = self.pages.get("confirmation")
+        confirmation_page.submitted = False
+        confirmation_page.submit_button.setEnabled(True)
+        confirmation_page.submit_button.setText("Submit")
+
+    def on_submit_finished(self, result):
+        """Back on the GUI thread: show the outcome of the save"""
+        self.submit_worker = None
+        success, reference_code, student_id, db_results = result
+
+        if success:
+            print(f"Registration saved successfully. Reference code: {reference_code}")
+            print(f"Database results: {db_results}")
+
+            # Determine which databases were used successfully
+            sqlite_success = db_results.get('sqlite', {}).get('success', False)
+            mysql_success = db_results.get('mysql', {}).get('success', False)
+            mysql_queued = db_results.get('mysql', {}).get('queued', False)
+
+            # Get student name for display
+            personal_data = self.form_data.get("personal", {})
+            student_name = f"{personal_data.get('first_name', '')} {personal_data.get('last_name', '')}"
+
+            # Show reference code screen
+            reference_screen = self.pages.get("reference")
+            reference_screen.set_code(reference_code, student_name)
+
+            # Add note about database storage based on which databases worked
+            current_date = datetime.now().strftime("%B %d, %Y")
+            if sqlite_success and mysql_success:
+                db_note = f"Registration completed on {current_date}.\n" \
+                          f"All information has been saved to both MySQL and SQLite databases."
+            elif sqlite_success and mysql_queued:
+                db_note = f"Registration completed on {current_date}.\n" \
+                          f"All information has been saved and will be copied to the MySQL database automatically."
+            elif mysql_success:
+                db_note = f"Registration completed on {current_date}.\n" \
+                          f"All information has been saved to the MySQL database."
+            elif sqlite_success:
+                db_note = f"Registration completed on {current_date}.\n" \
+                          f"All information has been saved to the SQLite database."
             else:
-                # Show error message
-                error_msg = "Registration could not be saved to any database."
-                if isinstance(reference_code, str) and reference_code:
-                    error_msg = f"Error: {reference_code}"
-
-                QMessageBox.critical(
-                    self,
-                    "Registration Error",
-                    f"{error_msg}\n\n"
-                    "Please check your input and try again."
-                )
-                # Re-enable submit button
-                self.confirmation_page.submit_button.setEnabled(True)
-                self.confirmation_page.submit_button.setText("Submit")
-
-        except Exception as e:
-            print(f"Unexpected error: {e}")
-            traceback.print_exc()
+                # This shouldn't happen since success would be False
+                db_note = f"Registration completed on {current_date}.\n" \
+                          f"Warning: Database storage may not be complete."
+
+            reference_screen.set_db_note(db_note)
+
+            # Show the reference screen
+            self.show_page("reference")
+
+            # Clear form data and get the confirmation page ready for the next student
+            self.form_data = {}
+            self.reset_submit_button()
+
+        else:
+            # Show error message
+            error_msg = "Registration could not be saved to any database."
+            if isinstance(reference_code, str) and reference_code:
+                error_msg = f"Error: {reference_code}"
 
             QMessageBox.critical(
                 self,
-                "System Error",
-                f"An unexpected error occurred:\n\n{str(e)}"
+                "Registration Error",
+                f"{error_msg}\n\n"
+                "Please check your input and try again."
             )
-
             # Re-enable submit button
-            self.confirmation_page.submit_button.setEnabled(True)
-            self.confirmation_page.submit_button.setText("Submit")
+            self.reset_submit_button()
+
+    def on_submit_error(self, message):
+        """Back on the GUI thread: the save raised an unexpected error"""
+        self.submit_worker = None
+        print(f"Unexpected error: {message}")
+
+        QMessageBox.critical(
+            self,
+            "System Error",
+            f"An unexpected error occurred:\n\n{message}"
+        )
+
+        # Re-enable submit button
+        self.reset_submit_button()
 
     def show_staff_login(self):
         """Show the staff login dialog"""
@@ -283,16 +321,15 @@ class MainWindow(QMainWindow):
         """Show the admin login dialog"""
         dialog = AdminLoginDialog(self)
         dialog.login_successful.connect(self.show_admin_dashboard)
+        # Build the admin dashboard while the admin is typing
+        self.pages.prewarm("admin")
         dialog.exec()  # Use exec() instead of show() for modal dialog
 
     def show_admin_dashboard(self, admin_data):
         """Show the admin dashboard after successful admin authentication"""
         # The AdminDashboard class doesn't accept parameters in its constructor
         # So we'll just switch to the admin dashboard page in the stack
-        self.stack.setCurrentWidget(self.admin_dashboard)
-
-        # Connect the admin dashboard's close event to return to dashboard login
-        self.admin_dashboard.closeEvent = lambda event: self.handle_admin_logout(event)
+        self.show_page("admin")
 
         # Display a welcome message
         QMessageBox.information(
@@ -305,7 +342,7 @@ class MainWindow(QMainWindow):
     def handle_admin_logout(self, event):
         """Handle admin dashboard logout by returning to dashboard login"""
         # Return to the dashboard login page
-        self.stack.setCurrentWidget(self.dashboard_page)
+        self.show_page("dashboard")
         # Let the close event continue for the admin dashboard
         event.accept()
 
@@ -322,35 +359,10 @@ if __name__ == "__main__":
         print("Starting OwlReg application...")
         app = QApplication(sys.argv)
         print("QApplication initialized")
+        # One stylesheet for every page, installed before any page is built
+        apply_theme(app)
 
-        # Check database connections (but don't block the application)
-        print("Checking database connections...")
-        try:
-            connection_results = db_manager.test_connections()
-            print(f"Database connection results: {connection_results}")
-
-            sqlite_ok = connection_results.get('sqlite', False)
-            mysql_ok = connection_results.get('mysql', False)
-
-            print(f"SQLite connection status: {'Connected' if sqlite_ok else 'Not connected'}")
-            print(f"MySQL connection status: {'Connected' if mysql_ok else 'Not connected'}")
-
-            if not sqlite_ok and not mysql_ok:
-                print("No database available - application may not function correctly")
-                # Show warning to user
-                QMessageBox.warning(
-                    None,
-                    "Database Connection Error",
-                    "Could not connect to any database (SQLite or MySQL).\n\n"
-                    "Please make sure the database file exists and is accessible, "
-                    "and that MySQL server is running if you are using it.\n\n"
-                    "The application requires at least one working database connection to function."
-                )
-        except Exception as e:
-            print(f"Error checking databases: {e}")
-            traceback.print_exc()
-
-        # Create and show main window
+        # Create and show main window (database checks run in the background)
         print("Creating main window...")
         window = MainWindow()
         print("Maximizing main window...")
@@ -4,12 +4,16 @@ Uses pymysql module for MySQL database operations
 Works independently of SQLite operations
 """
 import pymysql
-import random
-import string
+from pymysql.constants import SERVER_STATUS
+import re
 import time
 import traceback
 import socket
+import threading
+import contextlib
 from datetime import datetime
+from itertools import islice
+from reference_codes import ReferenceCodeAllocator, SHARED_NODE_ID, CLAIMED_NODE_IDS
 
 # MySQL configuration - updated to match XAMPP defaults
 MYSQL_CONFIG = {
@@ -28,6 +32,203 @@ MYSQL_CONFIG_NO_DB = {
     "connect_timeout": 10  # increased timeout
 }
 
+# Connection pool settings - every MySQL caller borrows from the shared pool
+POOL_MAX_SIZE = 5            # most connections open at once
+POOL_IDLE_TIMEOUT = 300      # close connections left unused this long (seconds)
+POOL_PING_AFTER = 30         # ping connections idle this long before handing them out
+POOL_BORROW_TIMEOUT = 10     # wait this long for a free connection before giving up
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled MySQL connection becomes free in time"""
+
+
+class ConnectionPool:
+    """
+    Bounded pool of pymysql connections
+    Connections are opened lazily, pinged only if they sat idle for a while,
+    and closed once they stay unused past the idle timeout
+    """
+    def __init__(self, config, max_size=POOL_MAX_SIZE, idle_timeout=POOL_IDLE_TIMEOUT,
+                 ping_after=POOL_PING_AFTER, borrow_timeout=POOL_BORROW_TIMEOUT):
+        self.config = dict(config)
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.ping_after = ping_after
+        self.borrow_timeout = borrow_timeout
+
+        self._idle = []        # (connection, last_used) pairs, most recently used last
+        self._open_count = 0   # idle + borrowed connections
+        self._condition = threading.Condition()
+
+    def _connect(self):
+        """Open a new server connection (the only place a handshake happens)"""
+        return pymysql.connect(**self.config)
+
+    def _evict_idle_locked(self):
+        """Close connections that have been idle too long (caller holds the lock)"""
+        now = time.monotonic()
+        keep = []
+        for conn, last_used in self._idle:
+            if now - last_used > self.idle_timeout:
+                self._open_count -= 1
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            else:
+                keep.append((conn, last_used))
+        self._idle = keep
+
+    def acquire(self, timeout=None):
+        """Borrow a connection, waiting up to `timeout` seconds for one to free up"""
+        if timeout is None:
+            timeout = self.borrow_timeout
+        deadline = time.monotonic() + timeout
+
+        with self._condition:
+            while True:
+                self._evict_idle_locked()
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._open_count < self.max_size:
+                    self._open_count += 1
+                    conn, last_used = None, None
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(f"No MySQL connection became free within {timeout} seconds")
+                self._condition.wait(remaining)
+
+        if conn is not None:
+            # Only ping connections that sat idle long enough to have been dropped
+            if time.monotonic() - last_used <= self.ping_after:
+                return conn
+            try:
+                conn.ping(reconnect=False)
+                return conn
+            except Exception as e:
+                print(f"Pooled MySQL connection went stale ({e}), opening a new one")
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+        try:
+            return self._connect()
+        except Exception:
+            with self._condition:
+                self._open_count -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, conn, discard=False):
+        """Return a borrowed connection to the pool"""
+        if not discard and conn.open:
+            try:
+                # Never hand the next borrower an unfinished transaction
+                if conn.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+                    conn.rollback()
+            except Exception:
+                discard = True
+        else:
+            discard = True
+
+        with self._condition:
+            if discard:
+                self._open_count -= 1
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._condition.notify()
+
+    @contextlib.contextmanager
+    def connection(self, timeout=None):
+        """Borrow a connection for the duration of a `with` block"""
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close_all(self):
+        """Close every idle connection (borrowed ones close when released)"""
+        with self._condition:
+            for conn, _ in self._idle:
+                self._open_count -= 1
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._idle = []
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """Return the shared MySQL connection pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                config = dict(MYSQL_CONFIG)
+                config.update({"port": 3306, "charset": "utf8mb4", "autocommit": False})
+                _pool = ConnectionPool(config)
+    return _pool
+
+def pooled_connection(timeout=None):
+    """Borrow a pooled MySQL connection: `with pooled_connection() as conn: ...`"""
+    return get_pool().connection(timeout)
+
+# After a failed attempt to reach MySQL, how long ensure_database() reports it
+# unavailable before trying again (doubled on each further failure, up to the maximum)
+DATABASE_RETRY_DELAY = 5
+DATABASE_MAX_RETRY_DELAY = 300
+
+# Set once the database and tables are known to exist in this process
+_database_ready = False
+_database_lock = threading.Lock()
+_database_failures = 0
+_database_retry_at = 0.0
+
+def ensure_database():
+    """
+    Create the database and tables on first use, then remember that they exist
+    One thread at a time tries; while MySQL is down, callers get False straight
+    away until the retry delay has passed instead of each waiting out a connect timeout
+    """
+    global _database_ready, _database_failures, _database_retry_at
+    if _database_ready:
+        return True
+
+    with _database_lock:
+        if _database_ready:
+            return True
+        if time.monotonic() < _database_retry_at:
+            return False
+
+        _database_ready = create_database()
+        if _database_ready:
+            _database_failures = 0
+        else:
+            _database_failures += 1
+            delay = min(DATABASE_RETRY_DELAY * 2 ** (_database_failures - 1), DATABASE_MAX_RETRY_DELAY)
+            _database_retry_at = time.monotonic() + delay
+            print(f"MySQL database not available, trying again in {delay} seconds at the earliest")
+        return _database_ready
+
+def _clear_database_backoff():
+    """Let the next ensure_database() try straight away - MySQL was just seen answering"""
+    global _database_failures, _database_retry_at
+    with _database_lock:
+        _database_failures = 0
+        _database_retry_at = 0.0
+
 def check_mysql_running():
     """Check if MySQL is accepting connections on default port"""
     print(f"Checking if MySQL is running on {MYSQL_CONFIG['host']}:3306...")
@@ -60,15 +261,12 @@ def test_mysql_connection():
 
     for attempt in range(3):  # Try 3 times
         try:
-            # Use a clean config copy with explicit timeout
-            temp_config = MYSQL_CONFIG.copy()
-            temp_config['connect_timeout'] = 10
-
+            # Borrow from the pool so a successful check leaves a warm connection behind
             print(f"Connection attempt {attempt+1}/3 to MySQL database...")
-            connection = pymysql.connect(**temp_config)
-            connection.ping()  # Verify connection is alive
-            connection.close()
+            with pooled_connection() as connection:
+                connection.ping()  # Verify connection is alive
             print("✓ Successfully connected to MySQL database")
+            _clear_database_backoff()
             return True
         except pymysql.err.OperationalError as e:
             error_code = e.args[0] if e.args else None
@@ -102,13 +300,69 @@ def test_mysql_connection():
     print("Failed to connect to MySQL after multiple attempts.")
     return False
 
+# Secondary indexes created by create_database(): (table, column(s), index name)
+# InnoDB already indexes the student_id foreign keys, so those are only created
+# if an older table is somehow missing them
+INDEXES = (
+    ("students", "created_at", "idx_students_created_at"),
+    ("students", "enrollment_type", "idx_students_enrollment_type"),
+    ("students", "strand", "idx_students_strand"),
+    ("students", "first_name, last_name", "idx_students_name"),
+    ("family_background", "student_id", "idx_family_background_student_id"),
+    ("academic_profile", "student_id", "idx_academic_profile_student_id"),
+    ("emergency_contacts", "student_id", "idx_emergency_contacts_student_id"),
+)
+
+def ensure_index(cursor, table, columns, index_name):
+    """Create an index on table(columns) unless some index already starts with the first column"""
+    column_list = [column.strip() for column in columns.split(",")]
+    cursor.execute('''
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s
+          AND column_name = %s AND seq_in_index = 1
+        LIMIT 1
+    ''', (table, column_list[0]))
+    if cursor.fetchone():
+        return
+    print(f"Creating index {index_name} on {table}({columns})...")
+    cursor.execute(f"CREATE INDEX `{index_name}` ON `{table}` ({', '.join(f'`{c}`' for c in column_list)})")
+
+# FULLTEXT indexes created by create_database(): (table, columns, index name, parser)
+# ft_students_search serves word-prefix search
+FULLTEXT_INDEXES = (
+    ("students", "first_name, middle_name, last_name, reference_code, lrn, home_address",
+     "ft_students_search", None),
+)
+# Indexes the schema works without, created after it is committed. The ngram
+# name index serves the fuzzy fallback for misspellings, but not every server
+# has the ngram parser (the MariaDB in XAMPP doesn't)
+OPTIONAL_FULLTEXT_INDEXES = (
+    ("students", "first_name, middle_name, last_name", "ft_students_name_ngram", "ngram"),
+)
+# Names of the optional indexes the last create_database() couldn't create
+missing_indexes = set()
+
+def ensure_fulltext_index(cursor, table, columns, index_name, parser=None):
+    """Create a FULLTEXT index unless one with this name already exists"""
+    cursor.execute('''
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+        LIMIT 1
+    ''', (table, index_name))
+    if cursor.fetchone():
+        return
+    print(f"Creating full-text index {index_name} on {table}({columns})...")
+    column_list = ", ".join(f"`{column.strip()}`" for column in columns.split(","))
+    with_parser = f" WITH PARSER {parser}" if parser else ""
+    cursor.execute(f"CREATE FULLTEXT INDEX `{index_name}` ON `{table}` ({column_list}){with_parser}")
+
 def create_database():
     """Create MySQL database and tables"""
     try:
         print("Starting MySQL database creation/verification process...")
         # First connect to MySQL without specifying a database
         try:
-            connection = pymysql.connect(**MYSQL_CONFIG_NO_DB, connect_timeout=10)
+            connection = pymysql.connect(**MYSQL_CONFIG_NO_DB)
             print("✓ Connected to MySQL server")
         except Exception as e:
             print(f"Error connecting to MySQL: {e}")
@@ -129,7 +383,7 @@ def create_database():
 
         # Now connect with the database selected
         try:
-            connection = pymysql.connect(**MYSQL_CONFIG, connect_timeout=10)
+            connection = pymysql.connect(**MYSQL_CONFIG)
             print(f"✓ Connected to database '{db_name}'")
         except Exception as e:
             print(f"Error connecting to database '{db_name}': {e}")
@@ -243,7 +497,36 @@ def create_database():
         )
         ''')
 
+        # Create reference_code_nodes table - one row per node ID handed out for reference codes
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS reference_code_nodes (
+            node_id INT AUTO_INCREMENT PRIMARY KEY,
+            hostname VARCHAR(255) NOT NULL,
+            next_sequence BIGINT NOT NULL DEFAULT 0,
+            claimed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''')
+        # The counter MySQL-only kiosks share; claimed IDs are numbered after it
+        cursor.execute("INSERT IGNORE INTO reference_code_nodes (node_id, hostname) VALUES (%s, 'shared')",
+                       (SHARED_NODE_ID,))
+
+
+        # Secondary indexes - MySQL has no CREATE INDEX IF NOT EXISTS, so check first
+        for table, columns, index_name in INDEXES:
+            ensure_index(cursor, table, columns, index_name)
+        for table, columns, index_name, parser in FULLTEXT_INDEXES:
+            ensure_fulltext_index(cursor, table, columns, index_name, parser)
+
         connection.commit()
+
+        for table, columns, index_name, parser in OPTIONAL_FULLTEXT_INDEXES:
+            try:
+                ensure_fulltext_index(cursor, table, columns, index_name, parser)
+                missing_indexes.discard(index_name)
+            except pymysql.Error as e:
+                print(f"Optional index {index_name} not created, continuing without it: {e}")
+                missing_indexes.add(index_name)
+
         cursor.close()
         connection.close()
         print("Database and tables created successfully!")
@@ -257,340 +540,404 @@ def create_database():
         traceback.print_exc()
         return False
 
-def generate_reference_code():
-    """Generate a unique reference code that's compatible with MySQL"""
-    # Create a unique identifier with timestamp and random characters
-    timestamp = int(time.time())
-    random_chars = ''.join(random.choices(string.ascii_uppercase + string.digits, k=5))
-    code = f"R{timestamp}{random_chars}"
+def claim_node_id(hostname):
+    """
+    Hand a kiosk a reference code node ID no other kiosk has
+    Returns None if MySQL is unavailable or every claimable ID is taken
+    """
+    if not ensure_database():
+        return None
+    with pooled_connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute("INSERT INTO reference_code_nodes (hostname) VALUES (%s)", (hostname,))
+        node_id = cursor.lastrowid
+        connection.commit()
+        cursor.close()
 
-    # Ensure it fits in our VARCHAR field by taking a subset
-    # Use the middle portion to ensure uniqueness while keeping a consistent format
-    if len(code) > 10:
-        code = f"R{code[5:14]}"
+    if node_id not in CLAIMED_NODE_IDS:
+        print(f"Reference code node IDs are used up (got {node_id})")
+        return None
+    return node_id
+
+def _reserve_code_block(count):
+    """
+    Reserve `count` sequence numbers from the shared node's counter
+    LAST_INSERT_ID(expr) hands the bumped value back to this connection only,
+    so concurrent kiosks each get their own block. Returns (node_id, first sequence number)
+    """
+    if not ensure_database():
+        raise RuntimeError("MySQL database not available")
+    with pooled_connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute("UPDATE reference_code_nodes SET next_sequence = LAST_INSERT_ID(next_sequence + %s) "
+                       "WHERE node_id = %s", (count, SHARED_NODE_ID))
+        cursor.execute("SELECT LAST_INSERT_ID()")
+        end = cursor.fetchone()[0]
+        connection.commit()
+        cursor.close()
+    return SHARED_NODE_ID, end - count
 
-    return code
+_code_allocator = ReferenceCodeAllocator(_reserve_code_block)
 
-def save_registration(form_data):
-    """Save registration data to MySQL database"""
+def generate_reference_code():
+    """A reference code unique across every kiosk, for when only MySQL is in use"""
+    return _code_allocator.next_code()
+
+# Insert statements shared by save_registration() and save_registrations()
+INSERT_STUDENT_SQL = '''
+INSERT INTO `students` (
+    `reference_code`, `first_name`, `last_name`, `middle_name`, `extension`,
+    `lrn`, `enrollment_type`, `strand`, `preferred_session`,
+    `birthday`, `civil_status`, `religion`, `mobile_no`, `telephone_no`,
+    `ethnicity`, `home_address`
+) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+'''
+
+INSERT_FAMILY_SQL = '''
+INSERT INTO `family_background` (
+    `student_id`, `father_name`, `father_age`, `father_ethnicity`,
+    `father_occupation`, `father_education`, `mother_name`,
+    `mother_age`, `mother_ethnicity`, `mother_occupation`,
+    `mother_education`, `guardian_name`, `guardian_age`,
+    `guardian_ethnicity`, `guardian_occupation`, `guardian_education`,
+    `guardian_contact`
+) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+'''
+
+INSERT_ACADEMIC_SQL = '''
+INSERT INTO `academic_profile` (
+    `student_id`, `elementary_school`, `elem_year_graduated`,
+    `elem_honors`, `juniorhs_school`, `jhs_year_graduated`, `jhs_honors`
+) VALUES (%s, %s, %s, %s, %s, %s, %s)
+'''
+
+INSERT_EMERGENCY_SQL = '''
+INSERT INTO `emergency_contacts` (
+    `student_id`, `contact_name`, `relationship`, `address`, `contact_no`
+) VALUES (%s, %s, %s, %s, %s)
+'''
+
+# Registrations written per transaction by save_registrations()
+BULK_CHUNK_SIZE = 500
+
+def _registration_rows(form_data, ref_code):
+    """
+    Build the students, family_background, academic_profile and emergency_contacts
+    values for one registration, filling in the defaults the MySQL schema needs.
+    The three child rows leave out student_id, which is only known once the student row is in
+    """
+    personal = form_data.get("personal", {})
+    family = form_data.get("family", {})
+    academic = form_data.get("academic", {})
+    emergency = form_data.get("emergency", {})
+
+    # Determine enrollment type (transferee status) based on grade level
+    enrollment_type = "Transferee" if personal.get("is_transferee", False) else "Freshmen"
+
+    # Format the birth date as YYYY-MM-DD for MySQL DATE type
+    birth_date = personal.get("birth_date", "")
+    if birth_date:
+        try:
+            # Try to parse the date and format it for MySQL
+            date_obj = datetime.strptime(birth_date, "%Y-%m-%d")
+            birth_date = date_obj.strftime("%Y-%m-%d")
+        except ValueError:
+            # If date can't be parsed, use a default
+            birth_date = "2000-01-01"
+    else:
+        birth_date = "2000-01-01"  # Default date if not provided
+
+    # Format address correctly
+    address = f"{personal.get('street_address', '')}, {personal.get('barangay', '')}, {personal.get('city', '')}, {personal.get('province', '')}"
+
+    # Handle missing values for required fields
+    first_name = personal.get("first_name", "")
+    if not first_name:
+        first_name = "Unknown"
+
+    last_name = personal.get("last_name", "")
+    if not last_name:
+        last_name = "Unknown"
+
+    # Generate a unique LRN or use the provided one
+    lrn = personal.get("lrn", "")
+    if not lrn:
+        # Use reference code as LRN if not provided
+        lrn = ref_code
+
+    # Always add timestamp to LRN to guarantee uniqueness
+    # This ensures no duplicate entry errors occur
+    current_time = int(time.time())
+    lrn = f"{lrn}_{current_time}"
+
+    mobile = personal.get("mobile", "")
+    if not mobile:
+        mobile = "00000000000"  # Default mobile number if not provided
+
+    strand = personal.get("strand", "")
+    if not strand:
+        strand = "Select..."  # Default value for strand
+
+    session = personal.get("session", "Morning")
+    if not session:
+        session = "Morning"  # Default session
+
+    # Set values with defaults
+    student_row = (
+        ref_code,
+        first_name,
+        last_name,
+        personal.get("middle_name", ""),
+        personal.get("extension", ""),
+        lrn,
+        enrollment_type,
+        strand,
+        session,
+        birth_date,
+        personal.get("civil_status", "Single"),
+        personal.get("religion", ""),
+        mobile,
+        personal.get("telephone", ""),
+        personal.get("ethnicity", ""),
+        address
+    )
+
+    father = family.get("father", {})
+    mother = family.get("mother", {})
+    guardian = family.get("guardian", {})
+
+    # Process family names
+    father_name = ""
+    if not father.get("skipped", True):
+        father_name = f"{father.get('first_name', '')} {father.get('last_name', '')}"
+
+    mother_name = ""
+    if not mother.get("skipped", True):
+        mother_name = f"{mother.get('first_name', '')} {mother.get('last_name', '')}"
+
+    guardian_name = ""
+    if not guardian.get("skipped", True):
+        guardian_name = f"{guardian.get('first_name', '')} {guardian.get('last_name', '')}"
+
+    # Convert ages to integers when possible
+    try:
+        father_age = int(father.get("age", 0)) if father.get("age", "").isdigit() else 0
+        mother_age = int(mother.get("age", 0)) if mother.get("age", "").isdigit() else 0
+        guardian_age = int(guardian.get("age", 0)) if guardian.get("age", "").isdigit() else 0
+    except:
+        father_age = 0
+        mother_age = 0
+        guardian_age = 0
+
+    family_row = (
+        father_name,
+        father_age,
+        father.get("ethnicity", ""),
+        father.get("occupation", ""),
+        father.get("education", ""),
+        mother_name,
+        mother_age,
+        mother.get("ethnicity", ""),
+        mother.get("occupation", ""),
+        mother.get("education", ""),
+        guardian_name,
+        guardian_age,
+        guardian.get("ethnicity", ""),
+        guardian.get("occupation", ""),
+        guardian.get("education", ""),
+        guardian.get("contact", "")
+    )
+
+    # Format years as proper YEAR type for MySQL
+    elementary_year = academic.get("elementary_year", "")
+    if not elementary_year or not elementary_year.isdigit():
+        elementary_year = None
+
+    juniorhs_year = academic.get("juniorhs_year", "")
+    if not juniorhs_year or not juniorhs_year.isdigit():
+        juniorhs_year = None
+
+    academic_row = (
+        academic.get("elementary_school", ""),
+        elementary_year,
+        academic.get("elementary_honors", ""),
+        academic.get("juniorhs_school", ""),
+        juniorhs_year,
+        academic.get("juniorhs_honors", "")
+    )
+
+    # Handle missing required fields for emergency contacts
+    relationship = emergency.get("relationship", "")
+    if not relationship:
+        relationship = "Not specified"
+
+    emergency_address = emergency.get("address", "")
+    if not emergency_address:
+        emergency_address = "Not specified"
+
+    contact_no = emergency.get("contact_no", "")
+    if not contact_no:
+        contact_no = "00000000000"
+
+    emergency_row = (
+        emergency.get("contact_name", "Not specified"),
+        relationship,
+        emergency_address,
+        contact_no
+    )
+
+    return student_row, family_row, academic_row, emergency_row
+
+def save_registration(form_data, raise_errors=False):
+    """
+    Save registration data to MySQL database
+    With raise_errors, a failed insert raises its pymysql error instead of
+    returning it as a message, so the caller can tell what kind of failure it was
+    """
     try:
         print("\n===== MySQL SAVE REGISTRATION - START =====")
         print("Attempting to save student data to MySQL...")
         print(f"Form data received with keys: {list(form_data.keys())}")
 
-        try:
-            # First try to check if MySQL server is running
-            mysql_running = check_mysql_running()
-            if not mysql_running:
-                print("ERROR: MySQL server is not running. Please start your MySQL/XAMPP service.")
-                return False, "MySQL server not running", None
-
-            # Try to test database existence
-            print("Testing database existence...")
-            try:
-                conn = pymysql.connect(
-                    host=MYSQL_CONFIG["host"],
-                    port=3306,
-                    user=MYSQL_CONFIG["user"],
-                    password=MYSQL_CONFIG["password"],
-                    connect_timeout=10
-                )
-                cursor = conn.cursor()
-                cursor.execute(f"SHOW DATABASES LIKE '{MYSQL_CONFIG['database']}'")
-                result = cursor.fetchone()
-                if not result:
-                    print(f"ERROR: Database '{MYSQL_CONFIG['database']}' does not exist!")
-                    print("Attempting to create database...")
-                    cursor.execute(f"CREATE DATABASE IF NOT EXISTS {MYSQL_CONFIG['database']}")
-                    conn.commit()
-                    print(f"Database '{MYSQL_CONFIG['database']}' created successfully.")
-                cursor.close()
-                conn.close()
-            except Exception as db_check_error:
-                print(f"ERROR checking database existence: {db_check_error}")
-        except Exception as conn_error:
-            print(f"ERROR during connection check: {conn_error}")
-
-        # Connect to MySQL with explicit parameters and force autocommit
-        print(f"Connecting to MySQL with: host={MYSQL_CONFIG['host']}, user={MYSQL_CONFIG['user']}, db={MYSQL_CONFIG['database']}")
-        connection = pymysql.connect(
-            host=MYSQL_CONFIG["host"],
-            port=3306,  # Explicitly set port
-            user=MYSQL_CONFIG["user"],
-            password=MYSQL_CONFIG["password"],
-            database=MYSQL_CONFIG["database"],
-            charset='utf8mb4',
-            connect_timeout=30,  # Increase timeout
-            autocommit=True  # Enable autocommit mode
-        )
-        print("✓ Connected to MySQL database")
-        cursor = connection.cursor()
-
-        # Get data from form
-        personal = form_data.get("personal", {})
-        family = form_data.get("family", {})
-        academic = form_data.get("academic", {})
-        emergency = form_data.get("emergency", {})
+        # Make sure the database and tables exist (only checked on the first save)
+        if not ensure_database():
+            print("ERROR: MySQL database is not available. Please start your MySQL/XAMPP service.")
+            return False, "MySQL database not available", None
 
-        # Generate reference code
-        ref_code = personal.get("reference_code", "")
+        # Pick the reference code and build the rows before borrowing a connection:
+        # reserving a new block of codes borrows one of its own, and may fail
+        ref_code = form_data.get("personal", {}).get("reference_code", "")
         if not ref_code:
             ref_code = generate_reference_code()
         print(f"Using reference code: {ref_code}")
 
-        # Generate unique LRN with timestamp
-        timestamp = int(time.time())
-        lrn = personal.get("lrn", "")
-        if not lrn:
-            lrn = f"LRN{timestamp}"
-        else:
-            lrn = f"{lrn}_{timestamp}"
-        print(f"Using unique LRN: {lrn}")
+        # Get data from form
+        student_row, family_row, academic_row, emergency_row = _registration_rows(form_data, ref_code)
 
-        try:
-            # Disable autocommit for transaction
-            connection.autocommit(False)
-
-            # Start transaction explicitly
-            print("Beginning MySQL transaction...")
-            connection.begin()
-
-            # Insert into students table - adjusted for the MySQL schema
-            query = '''
-            INSERT INTO `students` (
-                `reference_code`, `first_name`, `last_name`, `middle_name`, `extension`,
-                `lrn`, `enrollment_type`, `strand`, `preferred_session`,
-                `birthday`, `civil_status`, `religion`, `mobile_no`, `telephone_no`,
-                `ethnicity`, `home_address`
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            '''
-
-            # Determine enrollment type (transferee status) based on grade level
-            enrollment_type = "Transferee" if personal.get("is_transferee", False) else "Freshmen"
-
-            # Format the birth date as YYYY-MM-DD for MySQL DATE type
-            birth_date = personal.get("birth_date", "")
-            if birth_date:
-                try:
-                    # Try to parse the date and format it for MySQL
-                    date_obj = datetime.strptime(birth_date, "%Y-%m-%d")
-                    birth_date = date_obj.strftime("%Y-%m-%d")
-                except ValueError:
-                    # If date can't be parsed, use a default
-                    birth_date = "2000-01-01"
-            else:
-                birth_date = "2000-01-01"  # Default date if not provided
-
-            # Format address correctly
-            address = f"{personal.get('street_address', '')}, {personal.get('barangay', '')}, {personal.get('city', '')}, {personal.get('province', '')}"
-
-            # Handle missing values for required fields
-            first_name = personal.get("first_name", "")
-            if not first_name:
-                first_name = "Unknown"
-
-            last_name = personal.get("last_name", "")
-            if not last_name:
-                last_name = "Unknown"
-
-            # Generate a unique LRN or use the provided one
-            lrn = personal.get("lrn", "")
-            if not lrn:
-                # Use reference code as LRN if not provided
-                lrn = ref_code
-
-            # Always add timestamp to LRN to guarantee uniqueness
-            # This ensures no duplicate entry errors occur
-            current_time = int(time.time())
-            lrn = f"{lrn}_{current_time}"
-            print(f"Using unique LRN: {lrn}")
-
-            mobile = personal.get("mobile", "")
-            if not mobile:
-                mobile = "00000000000"  # Default mobile number if not provided
-
-            strand = personal.get("strand", "")
-            if not strand:
-                strand = "Select..."  # Default value for strand
-
-            session = personal.get("session", "Morning")
-            if not session:
-                session = "Morning"  # Default session
-
-            # Set values with defaults
-            values = (
-                ref_code,
-                first_name,
-                last_name,
-                personal.get("middle_name", ""),
-                personal.get("extension", ""),
-                lrn,
-                enrollment_type,
-                strand,
-                session,
-                birth_date,
-                personal.get("civil_status", "Single"),
-                personal.get("religion", ""),
-                mobile,
-                personal.get("telephone", ""),
-                personal.get("ethnicity", ""),
-                address
-            )
-
-            print("Executing INSERT into students table...")
-            cursor.execute(query, values)
-            student_id = cursor.lastrowid
-            print(f"Student inserted with ID {student_id} and LRN {lrn} into MySQL")
-
-            # Insert into family_background table
-            father = family.get("father", {})
-            mother = family.get("mother", {})
-            guardian = family.get("guardian", {})
-
-            # Process family names
-            father_name = ""
-            if not father.get("skipped", True):
-                father_name = f"{father.get('first_name', '')} {father.get('last_name', '')}"
-
-            mother_name = ""
-            if not mother.get("skipped", True):
-                mother_name = f"{mother.get('first_name', '')} {mother.get('last_name', '')}"
-
-            guardian_name = ""
-            if not guardian.get("skipped", True):
-                guardian_name = f"{guardian.get('first_name', '')} {guardian.get('last_name', '')}"
-
-            # Convert ages to integers when possible
+        # Borrow a pooled connection - no new handshake once the pool is warm
+        with pooled_connection() as connection:
+            print("✓ Borrowed pooled MySQL connection")
+            cursor = connection.cursor()
             try:
-                father_age = int(father.get("age", 0)) if father.get("age", "").isdigit() else 0
-                mother_age = int(mother.get("age", 0)) if mother.get("age", "").isdigit() else 0
-                guardian_age = int(guardian.get("age", 0)) if guardian.get("age", "").isdigit() else 0
-            except:
-                father_age = 0
-                mother_age = 0
-                guardian_age = 0
-
-            query = '''
-            INSERT INTO `family_background` (
-                `student_id`, `father_name`, `father_age`, `father_ethnicity`, 
-                `father_occupation`, `father_education`, `mother_name`, 
-                `mother_age`, `mother_ethnicity`, `mother_occupation`, 
-                `mother_education`, `guardian_name`, `guardian_age`, 
-                `guardian_ethnicity`, `guardian_occupation`, `guardian_education`,
-                `guardian_contact`
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            '''
-
-            values = (
-                student_id,
-                father_name,
-                father_age,
-                father.get("ethnicity", ""),
-                father.get("occupation", ""),
-                father.get("education", ""),
-                mother_name,
-                mother_age,
-                mother.get("ethnicity", ""),
-                mother.get("occupation", ""),
-                mother.get("education", ""),
-                guardian_name,
-                guardian_age,
-                guardian.get("ethnicity", ""),
-                guardian.get("occupation", ""),
-                guardian.get("education", ""),
-                guardian.get("contact", "")
-            )
-
-            cursor.execute(query, values)
-
-            # Format years as proper YEAR type for MySQL
-            elementary_year = academic.get("elementary_year", "")
-            if not elementary_year or not elementary_year.isdigit():
-                elementary_year = None
-
-            juniorhs_year = academic.get("juniorhs_year", "")
-            if not juniorhs_year or not juniorhs_year.isdigit():
-                juniorhs_year = None
-
-            # Insert into academic_profile table
-            query = '''
-            INSERT INTO `academic_profile` (
-                `student_id`, `elementary_school`, `elem_year_graduated`,
-                `elem_honors`, `juniorhs_school`, `jhs_year_graduated`, `jhs_honors`
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-            '''
-
-            values = (
-                student_id,
-                academic.get("elementary_school", ""),
-                elementary_year,
-                academic.get("elementary_honors", ""),
-                academic.get("juniorhs_school", ""),
-                juniorhs_year,
-                academic.get("juniorhs_honors", "")
-            )
-
-            cursor.execute(query, values)
-
-            # Insert into emergency_contacts table
-            query = '''
-            INSERT INTO `emergency_contacts` (
-                `student_id`, `contact_name`, `relationship`, `address`, `contact_no`
-            ) VALUES (%s, %s, %s, %s, %s)
-            '''
-
-            # Handle missing required fields for emergency contacts
-            relationship = emergency.get("relationship", "")
-            if not relationship:
-                relationship = "Not specified"
-
-            address = emergency.get("address", "")
-            if not address:
-                address = "Not specified"
-
-            contact_no = emergency.get("contact_no", "")
-            if not contact_no:
-                contact_no = "00000000000"
-
-            values = (
-                student_id,
-                emergency.get("contact_name", "Not specified"),
-                relationship,
-                address,
-                contact_no
-            )
-
-            cursor.execute(query, values)
-
-            # Final commit - make DOUBLE sure this happens
-            print("Committing transaction to MySQL database...")
-            connection.commit()
-
-            # Explicitly flush tables to ensure data is written to disk
-            print("Flushing tables to ensure data is visible...")
-            cursor.execute("FLUSH TABLES")
-
-            print(f"✅ Successfully committed all student data to MySQL with ID {student_id}")
-
-            return True, ref_code, student_id
-
-        except Exception as e:
-            # Rollback if error
-            connection.rollback()
-            print(f"Error saving registration to MySQL (rolling back): {e}")
-            traceback.print_exc()
-            return False, str(e), None
-        finally:
-            # Close connection
-            cursor.close()
-            connection.close()
-            print("MySQL connection closed")
+                # Start transaction explicitly
+                print("Beginning MySQL transaction...")
+                connection.begin()
+
+                # Insert into students table - adjusted for the MySQL schema
+                print("Executing INSERT into students table...")
+                cursor.execute(INSERT_STUDENT_SQL, student_row)
+                student_id = cursor.lastrowid
+                print(f"Student inserted with ID {student_id} and LRN {student_row[5]} into MySQL")
+
+                # Insert into family_background, academic_profile and emergency_contacts tables
+                cursor.execute(INSERT_FAMILY_SQL, (student_id,) + family_row)
+                cursor.execute(INSERT_ACADEMIC_SQL, (student_id,) + academic_row)
+                cursor.execute(INSERT_EMERGENCY_SQL, (student_id,) + emergency_row)
+
+                # Final commit - committed rows are immediately visible to other connections
+                print("Committing transaction to MySQL database...")
+                connection.commit()
+
+                print(f"✅ Successfully committed all student data to MySQL with ID {student_id}")
+
+                return True, ref_code, student_id
+
+            except Exception as e:
+                # Rollback if error
+                connection.rollback()
+                print(f"Error saving registration to MySQL (rolling back): {e}")
+                traceback.print_exc()
+                if raise_errors:
+                    raise
+                return False, str(e), None
+            finally:
+                cursor.close()
 
     except Exception as e:
+        if raise_errors:
+            raise
         print(f"MySQL database error: {e}")
         traceback.print_exc()
         return False, str(e), None
 
+def save_registrations(registrations, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Bulk-import registrations into MySQL
+    The iterable is read lazily, chunk_size registrations at a time; each chunk
+    is one transaction of multi-row INSERTs (pymysql's executemany rewrites
+    INSERT ... VALUES into a single statement with many value lists).
+    Returns one (success, reference code or error, student ID) tuple per
+    registration, in input order
+    """
+    if not ensure_database():
+        return [(False, "MySQL database not available", None) for _ in registrations]
+
+    results = []
+    iterator = iter(registrations)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            break
+        results.extend(_save_registration_chunk(chunk))
+
+    print(f"Bulk import saved {sum(1 for r in results if r[0])} of {len(results)} registrations to MySQL")
+    return results
+
+def _save_registration_chunk(chunk):
+    """Write one chunk of registrations in a single transaction"""
+    results = [None] * len(chunk)
+    prepared = []  # (position in chunk, reference code, rows, form data)
+    for position, form_data in enumerate(chunk):
+        try:
+            ref_code = form_data.get("personal", {}).get("reference_code") or generate_reference_code()
+            prepared.append((position, ref_code, _registration_rows(form_data, ref_code), form_data))
+        except Exception as e:
+            results[position] = (False, str(e), None)
+
+    if not prepared:
+        return results
+
+    try:
+        with pooled_connection() as connection:
+            cursor = connection.cursor()
+            try:
+                connection.begin()
+                cursor.executemany(INSERT_STUDENT_SQL, [rows[0] for _, _, rows, _ in prepared])
+
+                # A multi-row insert only reports the first ID, so look them up by reference code
+                ref_codes = [ref_code for _, ref_code, _, _ in prepared]
+                placeholders = ", ".join(["%s"] * len(ref_codes))
+                cursor.execute(f"SELECT reference_code, student_id FROM students WHERE reference_code IN ({placeholders})",
+                               ref_codes)
+                student_ids = dict(cursor.fetchall())
+
+                cursor.executemany(INSERT_FAMILY_SQL,
+                                   [(student_ids[ref_code],) + rows[1] for _, ref_code, rows, _ in prepared])
+                cursor.executemany(INSERT_ACADEMIC_SQL,
+                                   [(student_ids[ref_code],) + rows[2] for _, ref_code, rows, _ in prepared])
+                cursor.executemany(INSERT_EMERGENCY_SQL,
+                                   [(student_ids[ref_code],) + rows[3] for _, ref_code, rows, _ in prepared])
+
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+    except Exception as e:
+        # One bad row (e.g. a duplicate reference code) fails the whole chunk,
+        # so fall back to saving this chunk one registration at a time
+        print(f"Bulk insert of {len(prepared)} registrations failed ({e}), saving them one by one")
+        for position, ref_code, _, form_data in prepared:
+            payload = dict(form_data)
+            payload["personal"] = dict(form_data.get("personal", {}), reference_code=ref_code)
+            results[position] = save_registration(payload)
+        return results
+
+    for position, ref_code, _, _ in prepared:
+        results[position] = (True, ref_code, student_ids[ref_code])
+    return results
+
 def test_connection():
     """Test if MySQL database connection works"""
     try:
@@ -598,3 +945,144 @@ def test_connection():
     except Exception as e:
         print(f"MySQL connection error: {e}")
         return False
+
+def registration_exists(ref_code):
+    """Return True if a student with this reference code is already in MySQL"""
+    with pooled_connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute("SELECT 1 FROM students WHERE reference_code = %s", (ref_code,))
+        found = cursor.fetchone() is not None
+        cursor.close()
+    return found
+
+def delete_registration(ref_code):
+    """Delete a student by reference code (related records cascade); a missing student is not an error"""
+    if not ensure_database():
+        return False, "MySQL database not available"
+
+    try:
+        with pooled_connection() as connection:
+            cursor = connection.cursor()
+            # Foreign keys cascade to family_background, academic_profile and emergency_contacts
+            deleted = cursor.execute("DELETE FROM students WHERE reference_code = %s", (ref_code,))
+            connection.commit()
+            cursor.close()
+
+        if deleted:
+            print(f"Student {ref_code} deleted from MySQL database")
+        else:
+            print(f"Student {ref_code} not found in MySQL database")
+        return True, ref_code
+    except Exception as e:
+        print(f"MySQL deletion error: {e}")
+        return False, str(e)
+
+STUDENT_PAGE_SIZE = 200
+
+# Sort keys accepted by query_students(), matching sqlite_db.STUDENT_SORT_KEYS
+# (MySQL keeps the registration date in created_at)
+STUDENT_SORT_KEYS = {
+    "student_id": ("student_id",),
+    "name": ("first_name", "last_name", "student_id"),
+    "enrollment_type": ("enrollment_type", "student_id"),
+    "strand": ("strand", "created_at", "student_id"),
+    "registration_date": ("created_at", "student_id"),
+}
+RELEVANCE_SORT = "relevance"
+FUZZY_MATCH_LIMIT = 50   # most fuzzy matches returned when nothing matches exactly
+
+# Conditions over the FULLTEXT indexes (the column lists must match the index definitions)
+SEARCH_MATCH_SQL = ("MATCH (first_name, middle_name, last_name, reference_code, lrn, home_address) "
+                    "AGAINST (%s IN BOOLEAN MODE)")
+FUZZY_MATCH_SQL = "MATCH (first_name, middle_name, last_name) AGAINST (%s IN NATURAL LANGUAGE MODE)"
+# The fuzzy fallback when the server has no ngram index: any whole word, over ft_students_search
+PLAIN_FUZZY_MATCH_SQL = ("MATCH (first_name, middle_name, last_name, reference_code, lrn, home_address) "
+                         "AGAINST (%s IN NATURAL LANGUAGE MODE)")
+
+# "ST-0042", "st42", "st-00" - the student numbers shown in the list
+STUDENT_NUMBER_PATTERN = re.compile(r"st-?(\d+)", re.IGNORECASE)
+
+def _student_number_range(digits):
+    """student_id range whose ST-0000 number starts with `digits`"""
+    if len(digits) >= 4:
+        return int(digits), int(digits) + 1
+    scale = 10 ** (4 - len(digits))
+    return int(digits) * scale, (int(digits) + 1) * scale
+
+def query_students(search="", strand=None, sort_key="registration_date", descending=True,
+                   offset=0, limit=STUDENT_PAGE_SIZE, fuzzy=True):
+    """
+    One page of the student list, filtered and sorted in MySQL
+    Same arguments and (rows, total) result as sqlite_db.query_students: word-prefix
+    search through the ft_students_search FULLTEXT index, with the ngram name index
+    as the fuzzy fallback (or, without it, any word matching ft_students_search)
+    """
+    if sort_key not in STUDENT_SORT_KEYS and sort_key != RELEVANCE_SORT:
+        raise ValueError(f"Unknown sort key: {sort_key}")
+    if not ensure_database():
+        return [], 0
+
+    search = search.strip()
+    student_number = STUDENT_NUMBER_PATTERN.fullmatch(search)
+    words = re.findall(r"\w+", search.lower())
+    if search and not student_number and not words:
+        return [], 0
+
+    with pooled_connection() as connection:
+        cursor = connection.cursor()
+        if search and not student_number:
+            # "+word*" - every word must start some indexed word
+            match = (SEARCH_MATCH_SQL, " ".join(f"+{word}*" for word in words))
+            rows, total = _query_students(cursor, match, strand, sort_key, descending, offset, limit)
+            if total == 0 and fuzzy:
+                fuzzy_sql = PLAIN_FUZZY_MATCH_SQL if "ft_students_name_ngram" in missing_indexes else FUZZY_MATCH_SQL
+                match = (fuzzy_sql, search)
+                rows, total = _query_students(cursor, match, strand, RELEVANCE_SORT, False,
+                                              offset, limit, cap=FUZZY_MATCH_LIMIT)
+        else:
+            if sort_key == RELEVANCE_SORT:
+                sort_key, descending = "registration_date", True
+            id_range = _student_number_range(student_number.group(1)) if student_number else None
+            rows, total = _query_students(cursor, None, strand, sort_key, descending, offset, limit, id_range)
+        cursor.close()
+    return rows, total
+
+def _query_students(cursor, match, strand, sort_key, descending, offset, limit, id_range=None, cap=None):
+    """Run one student page query; match is (MATCH ... AGAINST sql, search string) or None"""
+    conditions = []
+    params = []
+    if match:
+        conditions.append(match[0])
+        params.append(match[1])
+    if id_range:
+        conditions.append("student_id >= %s AND student_id < %s")
+        params += list(id_range)
+    if strand:
+        conditions.append("strand = %s")
+        params.append(strand)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    if sort_key == RELEVANCE_SORT:
+        order_by = f"{match[0]} DESC, student_id"
+        order_params = [match[1]]
+    else:
+        direction = "DESC" if descending else "ASC"
+        order_by = ", ".join(f"{column} {direction}" for column in STUDENT_SORT_KEYS[sort_key])
+        order_params = []
+    if cap is not None:
+        limit = max(0, min(limit, cap - offset))
+
+    cursor.execute(f"""
+        SELECT student_id, first_name, middle_name, last_name, extension,
+               enrollment_type, strand, DATE_FORMAT(created_at, '%%Y-%%m-%%d %%H:%%i:%%s')
+        FROM students
+        {where}
+        ORDER BY {order_by}
+        LIMIT %s OFFSET %s
+    """, params + order_params + [limit, offset])
+    rows = list(cursor.fetchall())
+
+    count_sql = f"SELECT 1 FROM students {where}" + (f" LIMIT {int(cap)}" if cap is not None else "")
+    cursor.execute(f"SELECT COUNT(*) FROM ({count_sql}) AS matches", params)
+    total = cursor.fetchone()[0]
+    return rows, total
@@ -0,0 +1,69 @@
+"""
+Page registry for OwlReg's main window
+Pages are registered by name with the module and class that make them, and
+a page's module is only imported, and the page only built, the first time
+it is shown. While one page is showing, the page after it can be built in
+the background of the event loop (prewarmed), so the next click doesn't
+wait for it either
+"""
+import importlib
+from PyQt6.QtCore import QTimer
+
+# Prewarming waits this long after a page is shown, so that page paints and
+# takes input first
+PREWARM_DELAY_MS = 100
+
+
+class PageRegistry:
+    """The pages of a QStackedWidget, each built the first time it is needed"""
+    def __init__(self, stack):
+        self.stack = stack
+        self._specs = {}   # name -> (module name, class name, on_created, next page name)
+        self._pages = {}   # name -> page, for the pages built so far
+
+    def register(self, name, module_name, class_name, on_created=None, next_page=None):
+        """
+        Add a page without building it
+        on_created(page) is called once the page exists (e.g. to connect its
+        signals); next_page names the page to prewarm while this one shows
+        """
+        self._specs[name] = (module_name, class_name, on_created, next_page)
+
+    def names(self):
+        return list(self._specs)
+
+    def is_built(self, name):
+        return name in self._pages
+
+    def get(self, name):
+        """The page called `name`, importing its module and building it if needed"""
+        page = self._pages.get(name)
+        if page is None:
+            module_name, class_name, on_created, _ = self._specs[name]
+            page = getattr(importlib.import_module(module_name), class_name)()
+            self._pages[name] = page
+            self.stack.addWidget(page)
+            if on_created is not None:
+                on_created(page)
+        return page
+
+    def show(self, name):
+        """Switch the stack to `name` and start prewarming the page after it"""
+        page = self.get(name)
+        self.stack.setCurrentWidget(page)
+        next_page = self._specs[name][3]
+        if next_page is not None:
+            self.prewarm(next_page)
+        return page
+
+    def prewarm(self, name):
+        """Build `name` shortly, from the event loop, unless it already exists"""
+        if not self.is_built(name):
+            QTimer.singleShot(PREWARM_DELAY_MS, lambda: self._build_quietly(name))
+
+    def _build_quietly(self, name):
+        """Timer callback for prewarm(); a failure here shows up again when the page is shown"""
+        try:
+            self.get(name)
+        except Exception as e:
+            print(f"Error prewarming page '{name}': {e}")
@@ -1,33 +1,176 @@
+import base64
 import hashlib
+import hmac
 import os
+import threading
+import time
 
-def hash_password(password, salt=None):
+# Stored hashes name their algorithm and cost, so the cost can change without
+# breaking existing logins:
+#   $pbkdf2-sha256$i=<iterations>$<salt>$<digest>
+#   $scrypt$ln=<log2 N>,r=<r>,p=<p>$<salt>$<digest>
+# (salt and digest in base64, the whole string stored as ASCII bytes).
+# Hashes from before this format are 32 bytes of salt followed by a 32-byte
+# PBKDF2-SHA256 digest at 100,000 iterations.
+PBKDF2 = "pbkdf2-sha256"
+SCRYPT = "scrypt"
+ALGORITHMS = (PBKDF2, SCRYPT)
+
+# Deployment settings - which algorithm new hashes use, and either a fixed cost
+# (iterations for PBKDF2, log2 N for scrypt) or a login time to calibrate for
+ALGORITHM_ENV = "OWLREG_PASSWORD_HASH"
+COST_ENV = "OWLREG_PASSWORD_COST"
+TARGET_MS_ENV = "OWLREG_PASSWORD_TARGET_MS"
+DEFAULT_ALGORITHM = PBKDF2
+DEFAULT_TARGET_MS = 100
+
+# Never calibrate below these, however slow the machine
+MIN_COST = {PBKDF2: 100000, SCRYPT: 14}
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+LEGACY_SALT_BYTES = 32
+LEGACY_ITERATIONS = 100000
+
+# A stored cost this far below the current one gets rehashed at the next login;
+# the slack keeps calibration noise from rehashing on every login
+REHASH_BELOW = 0.8
+
+_calibrated = {}   # algorithm -> cost calibrated for this machine
+_calibration_lock = threading.Lock()
+
+def _derive(algorithm, cost, password, salt):
+    """Raw digest of `password` for one algorithm and cost"""
+    if algorithm == PBKDF2:
+        return hashlib.pbkdf2_hmac('sha256', password, salt, cost)
+    n = 1 << cost
+    return hashlib.scrypt(password, salt=salt, n=n, r=SCRYPT_R, p=SCRYPT_P,
+                          maxmem=256 * SCRYPT_R * n, dklen=32)
+
+def calibrate(algorithm=PBKDF2, target_ms=DEFAULT_TARGET_MS):
+    """The highest cost that hashes within about target_ms on this machine"""
+    if algorithm == PBKDF2:
+        # PBKDF2 time grows linearly with iterations - time a short run and scale
+        sample = 20000
+        start = time.perf_counter()
+        _derive(PBKDF2, sample, b"calibration", b"\0" * SALT_BYTES)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        cost = int(sample * target_ms / max(elapsed_ms, 0.001)) // 10000 * 10000
+    else:
+        # Each step of log2 N doubles the time - climb until the next step would overshoot
+        cost = MIN_COST[SCRYPT]
+        while True:
+            start = time.perf_counter()
+            _derive(SCRYPT, cost, b"calibration", b"\0" * SALT_BYTES)
+            if (time.perf_counter() - start) * 1000 * 2 > target_ms or cost >= 20:
+                break
+            cost += 1
+    return max(cost, MIN_COST[algorithm])
+
+def current_algorithm():
+    """Algorithm new hashes use in this deployment"""
+    algorithm = os.environ.get(ALGORITHM_ENV, DEFAULT_ALGORITHM)
+    return algorithm if algorithm in ALGORITHMS else DEFAULT_ALGORITHM
+
+def current_cost(algorithm):
+    """Cost new hashes use: the configured one, or calibrated once per process"""
+    if os.environ.get(COST_ENV):
+        return max(int(os.environ[COST_ENV]), MIN_COST[algorithm])
+
+    with _calibration_lock:
+        if algorithm not in _calibrated:
+            target_ms = float(os.environ.get(TARGET_MS_ENV) or DEFAULT_TARGET_MS)
+            _calibrated[algorithm] = calibrate(algorithm, target_ms)
+            print(f"Password hashing calibrated: {algorithm} cost {_calibrated[algorithm]} for ~{target_ms:.0f} ms")
+        return _calibrated[algorithm]
+
+def hash_password(password, salt=None, algorithm=None, cost=None):
     """
-    Hash a password for storing using SHA-256 with a random salt.
-    If salt is not provided, a new one is generated.
+    Hash a password for storing, with a random salt unless one is given
+    Uses the deployment's algorithm and cost unless they are given.
+    Returns the versioned hash as ASCII bytes.
     """
+    algorithm = algorithm or current_algorithm()
+    cost = cost or current_cost(algorithm)
     if salt is None:
-        salt = os.urandom(32)  # 32 bytes = 256 bits
+        salt = os.urandom(SALT_BYTES)
+
+    digest = _derive(algorithm, cost, password.encode('utf-8'), salt)
+    params = f"i={cost}" if algorithm == PBKDF2 else f"ln={cost},r={SCRYPT_R},p={SCRYPT_P}"
+    encoded = f"${algorithm}${params}${base64.b64encode(salt).decode('ascii')}${base64.b64encode(digest).decode('ascii')}"
+    return encoded.encode('ascii')
+
+def parse_hash(stored_password):
+    """
+    Split a stored hash into (algorithm, cost, salt, digest)
+    Returns None for something that isn't a hash (e.g. a plaintext password)
+    """
+    if isinstance(stored_password, str):
+        if not stored_password.startswith("$"):
+            return None
+        stored_password = stored_password.encode('ascii', 'replace')
 
-    # Hash the password with the salt
-    pwdhash = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, 100000)
+    if not stored_password.startswith(b"$"):
+        # Legacy hash: raw salt + PBKDF2 digest
+        if len(stored_password) != LEGACY_SALT_BYTES + 32:
+            return None
+        return PBKDF2, LEGACY_ITERATIONS, stored_password[:LEGACY_SALT_BYTES], stored_password[LEGACY_SALT_BYTES:]
 
-    # Return both salt and hash for storage
-    return salt + pwdhash
+    try:
+        _, algorithm, params, salt, digest = stored_password.decode('ascii').split("$")
+        params = dict(param.split("=") for param in params.split(","))
+        if algorithm == PBKDF2:
+            cost = int(params["i"])
+        elif algorithm == SCRYPT and int(params["r"]) == SCRYPT_R and int(params["p"]) == SCRYPT_P:
+            cost = int(params["ln"])
+        else:
+            return None
+        return algorithm, cost, base64.b64decode(salt), base64.b64decode(digest)
+    except (ValueError, KeyError):
+        return None
 
 def verify_password(stored_password, provided_password):
     """
     Verify a stored password against a provided one.
-    The stored password contains the salt at the beginning.
+    Accepts every stored hash format; the digests are compared in constant time.
     """
-    salt = stored_password[:32]  # First 32 bytes are the salt
-    stored_hash = stored_password[32:]
+    parsed = parse_hash(stored_password)
+    if parsed is None:
+        return False
+    algorithm, cost, salt, digest = parsed
+    return hmac.compare_digest(_derive(algorithm, cost, provided_password.encode('utf-8'), salt), digest)
+
+def needs_rehash(stored_password):
+    """True if the stored hash is older, or weaker, than what hash_password() makes now"""
+    parsed = parse_hash(stored_password)
+    legacy = isinstance(stored_password, bytes) and not stored_password.startswith(b"$")
+    if parsed is None or legacy:
+        return True
+    algorithm, cost, _, _ = parsed
+    if algorithm != current_algorithm():
+        return True
+    wanted = current_cost(algorithm)
+    if algorithm == SCRYPT:
+        return cost < wanted
+    return cost < wanted * REHASH_BELOW
 
-    # Hash the provided password with the stored salt
-    pwdhash = hashlib.pbkdf2_hmac('sha256', provided_password.encode('utf-8'), salt, 100000)
+def verify_and_upgrade(stored_password, provided_password):
+    """
+    Check a login and, when it succeeds with an outdated hash (or a plaintext
+    password), hash the password again with the current settings.
+    Returns (authenticated, new hash to store or None)
+    """
+    if parse_hash(stored_password) is None:
+        # Plaintext password from before hashing was introduced
+        if not isinstance(stored_password, str):
+            return False, None
+        authenticated = hmac.compare_digest(stored_password.encode('utf-8'), provided_password.encode('utf-8'))
+    else:
+        authenticated = verify_password(stored_password, provided_password)
 
-    # Compare the computed hash with the stored hash
-    return pwdhash == stored_hash
+    if authenticated and needs_rehash(stored_password):
+        return True, hash_password(provided_password)
+    return authenticated, None
 
 def convert_to_binary(password_hash):
     """Convert password hash to binary for SQLite storage"""
@@ -5,8 +5,9 @@ from PyQt6.QtWidgets import (
     QSizePolicy
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QDate
-from PyQt6.QtGui import QPixmap, QFont
-from image_helper import load_pixmap
+from PyQt6.QtGui import QFont
+from image_helper import load_scaled_pixmap
+from theme import set_role, set_style_property
 
 
 
@@ -16,54 +17,15 @@ class StudentGeneralInfoScreen(QWidget):
 
     def __init__(self):
         super().__init__()
-        self.setStyleSheet("background-color: #f7f7f7;")
+        set_role(self, "form-page")
         self.sidebar_expanded = True
 
-        # 🔹 Common textbox style
-        self.textbox_style = """
-            QLineEdit {
-                border: 1px solid #ccc;
-                border-radius: 4px;
-                padding: 6px;
-                background-color: white;
-            }
-            QLineEdit:focus {
-                border: 1px solid #4bb3fd;
-            }
-        """
-
-        # 🔹 Dropdown style - Enhanced for better visibility and with visible borders
-        self.combobox_style = """
-            QComboBox {
-                border: 1px solid #4bb3fd;
-                border-radius: 4px;
-                padding: 4px 10px;
-                background-color: white;
-                min-width: 100px;
-            }
-            QComboBox:hover {
-                border: 2px solid #2356c5;
-            }
-            QComboBox::drop-down {
-                subcontrol-origin: padding;
-                subcontrol-position: center right;
-                width: 20px;
-                border-left: 1px solid #4bb3fd;
-                background-color: #e1ecff;
-            }
-            QComboBox QAbstractItemView {
-                background-color: white;
-                border: 1px solid #4bb3fd;
-                selection-background-color: #e1ecff;
-            }
-        """
-
         main_layout = QHBoxLayout(self)
 
         # ---------------- Sidebar ----------------
         self.sidebar_widget = QWidget()
         self.sidebar_widget.setFixedWidth(220)
-        self.sidebar_widget.setStyleSheet("background-color: #f3f3f3; border-radius: 12px;")
+        set_role(self.sidebar_widget, "sidebar")
         sidebar_layout = QVBoxLayout(self.sidebar_widget)
         sidebar_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
 
@@ -71,14 +33,13 @@ class StudentGeneralInfoScreen(QWidget):
         # Logo
         self.logo_label = QLabel("OwlReg")
         self.logo_label.setFont(QFont("Arial", 24, QFont.Weight.Bold))
-        self.logo_label.setStyleSheet("color: #2356c5;")
+        set_role(self.logo_label, "brand-text")
         sidebar_layout.addWidget(self.logo_label, alignment=Qt.AlignmentFlag.AlignHCenter)
 
         # Owl image
         self.owl_img = QLabel()
         try:
-            self.owl_img.setPixmap(QPixmap("owl_logo2.png").scaled(80, 80, Qt.AspectRatioMode.KeepAspectRatio,
-                                                                   Qt.TransformationMode.SmoothTransformation))
+            self.owl_img.setPixmap(load_scaled_pixmap("owl_logo2.png", 80, 80))
         except Exception:
             pass
         self.owl_img.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -93,19 +54,7 @@ class StudentGeneralInfoScreen(QWidget):
         for text in menu_items:
             btn = QPushButton(text)
             btn.setFont(QFont("Arial", 12))
-            btn.setStyleSheet("""
-                QPushButton {
-                    color: #222;
-                    background: transparent;
-                    border: none;
-                    text-align: left;
-                    padding: 6px 12px;
-                }
-                QPushButton:hover {
-                    background-color: #e6e6e6;
-                    border-radius: 6px;
-                }
-            """)
+            set_role(btn, "sidebar-link")
             btn.setCursor(Qt.CursorShape.PointingHandCursor)
             btn.clicked.connect(lambda _, idx=len(self.menu_items): self.pages.setCurrentIndex(idx))
             sidebar_layout.addWidget(btn)
@@ -135,19 +84,19 @@ class StudentGeneralInfoScreen(QWidget):
         # Header
         header = QLabel("Student General Information Sheet")
         header.setFont(QFont("Arial", 20, QFont.Weight.Bold))
-        header.setStyleSheet("background-color: #4bb3fd; color: white; border-radius: 8px; padding: 18px;")
+        set_role(header, "page-header")
         header.setAlignment(Qt.AlignmentFlag.AlignCenter)
         form_area.addWidget(header)
         form_area.addSpacing(15)
 
         # ---------------- Personal Info ----------------
         personal_group = QGroupBox()
-        personal_group.setStyleSheet("border: none;")
+        set_role(personal_group, "flat-group")
         personal_layout = QVBoxLayout(personal_group)
 
         personal_title = QLabel("A. Personal Information")
         personal_title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
-        personal_title.setStyleSheet("background-color: #4bb3fd; color: white; border-radius: 4px; padding: 6px 12px;")
+        set_role(personal_title, "section-title")
         personal_layout.addWidget(personal_title)
         personal_layout.addSpacing(10)
 
@@ -160,19 +109,13 @@ class StudentGeneralInfoScreen(QWidget):
         strand_combo = QComboBox(); strand_combo.addItems(["Select...", "STEM", "ABM", "ICT", "GAS"])
 
         # Apply the combobox style to make borders visible
-        enroll_combo.setStyleSheet(self.combobox_style)
-        strand_combo.setStyleSheet(self.combobox_style)
+        set_role(enroll_combo, "combo")
+        set_role(strand_combo, "combo")
 
         # Add student status label that will update based on grade level
         self.status_label = QLabel("Student Status: Freshmen")
         self.status_label.setObjectName("status_label")
-        self.status_label.setStyleSheet("""
-            font-size: 14px;
-            font-weight: bold;
-            color: #4bb3fd;
-            padding: 5px;
-            border-radius: 4px;
-        """)
+        # The theme styles it by this name, coloured by its "status" property
 
         # Connect grade level dropdown to update student status
         enroll_combo.setObjectName("enrolling_combo")
@@ -210,56 +153,7 @@ class StudentGeneralInfoScreen(QWidget):
         birth_date.setMinimumDate(QDate(1900, 1, 1))  # Set reasonable minimum date
         birth_date.setMaximumDate(QDate(2025, 9, 28))  # Set max date to current date (Sept 28, 2025)
         birth_date.setMinimumWidth(160)  # Slightly reduced width since month is now numeric
-        birth_date.setStyleSheet("""
-            QDateEdit {
-                border: 1px solid #ccc;
-                border-radius: 4px;
-                padding: 5px;
-                background-color: white;
-                min-width: 160px;
-            }
-            QDateEdit:focus {
-                border: 1px solid #4bb3fd;
-            }
-            QDateEdit::drop-down {
-                subcontrol-origin: padding;
-                subcontrol-position: center right;
-                width: 20px;
-                border-left: 1px solid #ccc;
-            }
-            /* Make sure calendar widget shows month and year clearly */
-            QCalendarWidget QToolButton {
-                color: #333;
-                font-size: 14px;
-                font-weight: bold;
-                background-color: #f0f5ff;
-                padding: 6px;
-            }
-            QCalendarWidget QMenu {
-                font-size: 12px;
-                background-color: white;
-                selection-background-color: #4bb3fd;
-                selection-color: white;
-            }
-            QCalendarWidget QSpinBox {
-                font-size: 14px;
-                color: #333;
-                background-color: white;
-                selection-background-color: #4bb3fd;
-                selection-color: white;
-            }
-            QCalendarWidget QAbstractItemView:enabled {
-                font-size: 12px;
-                color: #333;
-                background-color: white;
-                selection-background-color: #4bb3fd;
-                selection-color: white;
-            }
-            QCalendarWidget QWidget#qt_calendar_navigationbar {
-                background-color: #e1ecff;
-                padding: 2px;
-            }
-        """)
+        set_role(birth_date, "date")
 
         form.addRow("Birth Info:", self.row([
             ("Date of Birth:", birth_date),
@@ -285,12 +179,12 @@ class StudentGeneralInfoScreen(QWidget):
 
         # ---------------- Address ----------------
         address_group = QGroupBox()
-        address_group.setStyleSheet("border: none;")
+        set_role(address_group, "flat-group")
         address_layout = QVBoxLayout(address_group)
 
         address_title = QLabel("Home Address")
         address_title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
-        address_title.setStyleSheet("background-color: #4bb3fd; color: white; border-radius: 4px; padding: 6px 12px;")
+        set_role(address_title, "section-title")
         address_layout.addWidget(address_title)
         address_layout.addSpacing(10)
 
@@ -308,30 +202,12 @@ class StudentGeneralInfoScreen(QWidget):
         pwd_check = QCheckBox()
         pwd_check.setText("Yes")
         pwd_check.setObjectName("pwd_check")
-        pwd_check.setStyleSheet("""
-            QCheckBox {
-                font-size: 14px;
-            }
-            QCheckBox::indicator {
-                width: 18px;
-                height: 18px;
-            }
-            QCheckBox::indicator:unchecked {
-                border: 2px solid #ccc;
-                background-color: white;
-                border-radius: 3px;
-            }
-            QCheckBox::indicator:checked {
-                border: 2px solid #4bb3fd;
-                background-color: #4bb3fd;
-                border-radius: 3px;
-            }
-        """)
+        set_role(pwd_check, "pwd-check")
 
         # Create a label that appears when PWD is checked
         pwd_label = QLabel("PWD ID will be required during enrollment")
         pwd_label.setObjectName("pwd_notification")
-        pwd_label.setStyleSheet("color: #2356c5; font-style: italic; margin-left: 10px;")
+        set_role(pwd_label, "pwd-note")
         pwd_label.setVisible(False)
 
         # Connect checkbox to show/hide the notification
@@ -355,17 +231,7 @@ class StudentGeneralInfoScreen(QWidget):
         for btn in (back_btn, next_btn):
             btn.setFixedWidth(140)
             btn.setFixedHeight(40)
-            btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #4bb3fd;
-                    color: white;
-                    font-weight: bold;
-                    border-radius: 6px;
-                }
-                QPushButton:hover {
-                    background-color: #379be6;
-                }
-            """)
+            set_role(btn, "nav-button")
 
         nav_layout.addWidget(back_btn)
         nav_layout.addStretch()
@@ -388,32 +254,13 @@ class StudentGeneralInfoScreen(QWidget):
 
             if grade_level == "Grade 12":
                 self.status_label.setText("Student Status: Transferee")
-                self.status_label.setStyleSheet("""
-                    font-size: 14px;
-                    font-weight: bold;
-                    color: #d32f2f;
-                    background-color: #ffebee;
-                    padding: 5px;
-                    border-radius: 4px;
-                """)
+                set_style_property(self.status_label, "status", "transferee")
             elif grade_level == "Grade 11":
                 self.status_label.setText("Student Status: Freshmen")
-                self.status_label.setStyleSheet("""
-                    font-size: 14px;
-                    font-weight: bold;
-                    color: #4bb3fd;
-                    padding: 5px;
-                    border-radius: 4px;
-                """)
+                set_style_property(self.status_label, "status", "freshmen")
             else:
                 self.status_label.setText("Student Status: Select Grade Level")
-                self.status_label.setStyleSheet("""
-                    font-size: 14px;
-                    font-weight: bold;
-                    color: #757575;
-                    padding: 5px;
-                    border-radius: 4px;
-                """)
+                set_style_property(self.status_label, "status", "unselected")
 
     def on_next(self):
         data = self.get_data()
@@ -427,7 +274,7 @@ class StudentGeneralInfoScreen(QWidget):
         tb.setMinimumWidth(width)
         tb.setFixedHeight(32)
         tb.setPlaceholderText(placeholder)
-        tb.setStyleSheet(self.textbox_style)
+        set_role(tb, "textbox")
         return tb
 
     def combo(self, items, objectName=""):
@@ -435,7 +282,7 @@ class StudentGeneralInfoScreen(QWidget):
         c.setObjectName(objectName)
         c.addItems(items)
         c.setFixedHeight(32)
-        c.setStyleSheet(self.combobox_style)  # Apply custom style
+        set_role(c, "combo")
         return c
 
     def row(self, widgets, objectNames=None):
@@ -556,38 +403,14 @@ class StudentGeneralInfoScreen(QWidget):
             self.logo_label.hide()
             self.owl_img.hide()
             for btn in self.menu_items:
-                btn.setStyleSheet("""
-                    QPushButton {
-                        color: #222;
-                        background: transparent;
-                        border: none;
-                        padding: 6px;
-                        text-align: center;
-                    }
-                    QPushButton:hover {
-                        background-color: #e6e6e6;
-                        border-radius: 6px;
-                    }
-                """)
+                set_style_property(btn, "collapsed", True)
                 btn.setText(btn.text()[0])
         else:
             self.sidebar_widget.setFixedWidth(220)
             self.logo_label.show()
             self.owl_img.show()
             for i, btn in enumerate(self.menu_items):
-                btn.setStyleSheet("""
-                    QPushButton {
-                        color: #222;
-                        background: transparent;
-                        border: none;
-                        text-align: left;
-                        padding: 6px 12px;
-                    }
-                    QPushButton:hover {
-                        background-color: #e6e6e6;
-                        border-radius: 6px;
-                    }
-                """)
+                set_style_property(btn, "collapsed", False)
                 btn.setText(
                     ["Discover", "Form", "About", "Vision Mission and...", "Library", "Subject", "Scholarship", "Feedback"][i]
                 )
@@ -600,7 +423,7 @@ class StudentGeneralInfoScreen(QWidget):
         # ---------------- Sidebar ----------------
         self.sidebar_widget = QWidget()
         self.sidebar_widget.setFixedWidth(220)
-        self.sidebar_widget.setStyleSheet("background-color: #f3f3f3; border-radius: 12px;")
+        set_role(self.sidebar_widget, "sidebar")
         sidebar_layout = QVBoxLayout(self.sidebar_widget)
         sidebar_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
 
@@ -608,31 +431,19 @@ class StudentGeneralInfoScreen(QWidget):
         toggle_btn = QPushButton("≡")
         toggle_btn.setFont(QFont("Arial", 16))
         toggle_btn.setFixedSize(40, 40)
-        toggle_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2356c5;
-                color: white;
-                border-radius: 20px;
-                border: none;
-            }
-            QPushButton:hover {
-                background-color: #1a408f;
-            }
-        """)
+        set_role(toggle_btn, "sidebar-toggle")
         toggle_btn.clicked.connect(self.toggle_sidebar)
         sidebar_layout.addWidget(toggle_btn, alignment=Qt.AlignmentFlag.AlignRight)
 
         # Logo
         self.logo_label = QLabel("OwlReg")
         self.logo_label.setFont(QFont("Arial", 24, QFont.Weight.Bold))
-        self.logo_label.setStyleSheet("color: #2356c5;")
+        set_role(self.logo_label, "brand-text")
         sidebar_layout.addWidget(self.logo_label, alignment=Qt.AlignmentFlag.AlignHCenter)
 
         # Owl image
         self.owl_img = QLabel()
-        owl_pixmap = load_pixmap("owl_logo2.png")
-        self.owl_img.setPixmap(owl_pixmap.scaled(80, 80, Qt.AspectRatioMode.KeepAspectRatio,
-                                                  Qt.TransformationMode.SmoothTransformation))
+        self.owl_img.setPixmap(load_scaled_pixmap("owl_logo2.png", 80, 80))
         self.owl_img.setAlignment(Qt.AlignmentFlag.AlignCenter)
         sidebar_layout.addWidget(self.owl_img)
         sidebar_layout.addSpacing(20)
@@ -645,19 +456,7 @@ class StudentGeneralInfoScreen(QWidget):
         for text in menu_items:
             btn = QPushButton(text)
             btn.setFont(QFont("Arial", 12))
-            btn.setStyleSheet("""
-                QPushButton {
-                    color: #222;
-                    background: transparent;
-                    border: none;
-                    text-align: left;
-                    padding: 6px 12px;
-                }
-                QPushButton:hover {
-                    background-color: #e6e6e6;
-                    border-radius: 6px;
-                }
-            """)
+            set_role(btn, "sidebar-link")
             btn.setCursor(Qt.CursorShape.PointingHandCursor)
             btn.clicked.connect(lambda _, idx=len(self.menu_items): self.pages.setCurrentIndex(idx))
             sidebar_layout.addWidget(btn)
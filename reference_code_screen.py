@@ -8,8 +8,9 @@ from PyQt6.QtWidgets import (
     QFrame, QSizePolicy, QApplication
 )
 from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QFont, QPixmap, QColor
-from image_helper import load_pixmap
+from PyQt6.QtGui import QFont, QColor
+from image_helper import load_scaled_pixmap
+from theme import set_role
 
 
 class ReferenceCodeScreen(QWidget):
@@ -33,14 +34,11 @@ class ReferenceCodeScreen(QWidget):
         logo_container = QVBoxLayout()
         logo_label = QLabel("OwlReg")
         logo_label.setFont(QFont("Arial", 24, QFont.Weight.Bold))
-        logo_label.setStyleSheet("color: #2356c5;")
+        set_role(logo_label, "brand-text")
 
         owl_img = QLabel()
         # Use the image helper to load the logo
-        owl_pixmap = load_pixmap("owl_logo2.png")
-        owl_img.setPixmap(owl_pixmap.scaled(100, 100,
-                                            Qt.AspectRatioMode.KeepAspectRatio,
-                                            Qt.TransformationMode.SmoothTransformation))
+        owl_img.setPixmap(load_scaled_pixmap("owl_logo2.png", 100, 100))
 
         owl_img.setAlignment(Qt.AlignmentFlag.AlignCenter)
         logo_container.addWidget(logo_label, alignment=Qt.AlignmentFlag.AlignCenter)
@@ -53,17 +51,17 @@ class ReferenceCodeScreen(QWidget):
         title_container = QVBoxLayout()
         title = QLabel("Registration Successful!")
         title.setFont(QFont("Arial", 24, QFont.Weight.Bold))
-        title.setStyleSheet("color: #2356c5;")
+        set_role(title, "brand-text")
 
         confirmation_message = QLabel(
             "Thank you for registering with OwlReg. Your information has been saved successfully."
         )
         confirmation_message.setWordWrap(True)
-        confirmation_message.setStyleSheet("font-size: 14px; color: #444;")
+        set_role(confirmation_message, "confirmation-message")
 
         from datetime import datetime
         date_label = QLabel(datetime.now().strftime("%B %d, %Y"))
-        date_label.setStyleSheet("font-size: 12px; color: #666;")
+        set_role(date_label, "date-text")
 
         title_container.addWidget(title)
         title_container.addWidget(confirmation_message)
@@ -75,41 +73,23 @@ class ReferenceCodeScreen(QWidget):
         # Reference code display (card)
         code_card = QFrame()
         code_card.setFrameShape(QFrame.Shape.Box)
-        code_card.setStyleSheet("""
-            QFrame {
-                background-color: #f0f5ff;
-                border: 2px solid #4bb3fd;
-                border-radius: 15px;
-                padding: 20px;
-            }
-        """)
+        set_role(code_card, "code-card")
         code_layout = QVBoxLayout(code_card)
 
         ref_title = QLabel("Your Unique Reference Code")
         ref_title.setFont(QFont("Arial", 16))
-        ref_title.setStyleSheet("color: #2356c5;")
+        set_role(ref_title, "brand-text")
         ref_title.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         # Reference code display
         self.code_display = QLabel("ST-000000-0000")  # Placeholder
         self.code_display.setFont(QFont("Arial", 32, QFont.Weight.Bold))
-        self.code_display.setStyleSheet("color: #2356c5;")
+        set_role(self.code_display, "brand-text")
         self.code_display.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         # Add copy button
         copy_button = QPushButton("Copy Code")
-        copy_button.setStyleSheet("""
-            QPushButton {
-                background-color: #4bb3fd;
-                color: white;
-                font-weight: bold;
-                border-radius: 6px;
-                padding: 8px 15px;
-            }
-            QPushButton:hover {
-                background-color: #379be6;
-            }
-        """)
+        set_role(copy_button, "copy-button")
         copy_button.clicked.connect(self.copy_to_clipboard)
 
         # Important instructions
@@ -117,17 +97,17 @@ class ReferenceCodeScreen(QWidget):
             "Please save this reference code. You will need to provide this code when completing your enrollment."
         )
         instructions.setWordWrap(True)
-        instructions.setStyleSheet("color: #e63946; font-weight: bold; font-size: 14px; margin-top: 10px;")
+        set_role(instructions, "code-instructions")
         instructions.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         # Student name
         self.name_display = QLabel()  # Will be set later
-        self.name_display.setStyleSheet("font-size: 18px; color: #333;")
+        set_role(self.name_display, "student-name")
         self.name_display.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         # Database note (for SQLite fallback)
         self.db_note = QLabel()
-        self.db_note.setStyleSheet("font-size: 12px; color: #e67e22; font-style: italic;")
+        set_role(self.db_note, "db-note")
         self.db_note.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.db_note.setVisible(False)
 
@@ -146,24 +126,13 @@ class ReferenceCodeScreen(QWidget):
             "All your submitted information has been saved in our database. Please bring your supporting documents when you come for enrollment."
         )
         info_text.setWordWrap(True)
-        info_text.setStyleSheet("font-size: 13px; color: #444; margin-top: 15px;")
+        set_role(info_text, "info-text")
         main_layout.addWidget(info_text)
 
         # Close button
         close_button = QPushButton("Close")
         close_button.setFixedSize(150, 40)
-        close_button.setStyleSheet("""
-            QPushButton {
-                background-color: #2356c5;
-                color: white;
-                font-weight: bold;
-                font-size: 14px;
-                border-radius: 6px;
-            }
-            QPushButton:hover {
-                background-color: #1a408f;
-            }
-        """)
+        set_role(close_button, "primary-button")
         close_button.clicked.connect(self.close_clicked.emit)
         main_layout.addWidget(close_button, alignment=Qt.AlignmentFlag.AlignCenter)
 
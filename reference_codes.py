@@ -0,0 +1,112 @@
+"""
+Reference codes for OwlReg registrations
+A code is REF, the kiosk's node ID, a sequence number and a check character,
+written in Crockford base32 (e.g. REF02000A1MY). Each kiosk reserves its
+sequence numbers a block at a time, so codes are unique without looking
+anything up before the insert, and a mistyped code fails its check
+"""
+import threading
+
+# Crockford base32 - no I, L, O or U, so codes read back unambiguously
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+PREFIX = "REF"
+NODE_DIGITS = 2        # 1024 node IDs
+SEQUENCE_DIGITS = 6    # ~1.07 billion codes per node
+CODE_LENGTH = len(PREFIX) + NODE_DIGITS + SEQUENCE_DIGITS + 1
+MAX_NODE_ID = len(ALPHABET) ** NODE_DIGITS - 1
+MAX_SEQUENCE = len(ALPHABET) ** SEQUENCE_DIGITS - 1
+
+# Sequence numbers a kiosk reserves at once; a block left unused when the app
+# closes is skipped, never reused
+BLOCK_SIZE = 1000
+
+# Who hands out node IDs: MySQL-only kiosks share one counter kept on the server,
+# and each SQLite kiosk claims its own ID from MySQL once (or is given one in its
+# settings) before it issues any codes. IDs from 512 up were once picked at random
+# by kiosks that hadn't reached MySQL; they are never handed out, and a kiosk
+# still holding one stops issuing codes until it claims a proper ID
+SHARED_NODE_ID = 1
+CLAIMED_NODE_IDS = range(2, 512)
+OFFLINE_NODE_IDS = range(512, MAX_NODE_ID + 1)
+
+# Lookalike characters people type for the ones in ALPHABET
+_LOOKALIKES = str.maketrans("OIL", "011")
+_VALUES = {character: value for value, character in enumerate(ALPHABET)}
+
+
+def encode(number, digits):
+    """`number` in base32, zero-padded to `digits` characters"""
+    characters = []
+    for _ in range(digits):
+        number, remainder = divmod(number, 32)
+        characters.append(ALPHABET[remainder])
+    return "".join(reversed(characters))
+
+
+def check_character(payload):
+    """Luhn mod 32 check character - catches any single mistyped character and most swaps"""
+    total = 0
+    factor = 2
+    for character in reversed(payload):
+        addend = factor * _VALUES[character]
+        total += addend // 32 + addend % 32
+        factor = 3 - factor
+    return ALPHABET[-total % 32]
+
+
+def format_reference_code(node_id, sequence):
+    """The reference code for sequence number `sequence` of node `node_id`"""
+    if not 0 <= node_id <= MAX_NODE_ID:
+        raise ValueError(f"Node ID {node_id} is outside 0-{MAX_NODE_ID}")
+    if not 0 <= sequence <= MAX_SEQUENCE:
+        raise ValueError(f"Node {node_id} has used up its reference codes")
+    payload = encode(node_id, NODE_DIGITS) + encode(sequence, SEQUENCE_DIGITS)
+    return PREFIX + payload + check_character(payload)
+
+
+def normalize_reference_code(text):
+    """
+    Tidy a typed reference code: uppercase, without spaces or dashes, and with
+    O, I and L read as 0, 1 and 1 in codes of this format (older codes are left alone)
+    """
+    code = "".join(text.split()).replace("-", "").upper()
+    if len(code) == CODE_LENGTH and code.startswith(PREFIX):
+        code = PREFIX + code[len(PREFIX):].translate(_LOOKALIKES)
+    return code
+
+
+def is_valid_reference_code(code):
+    """True if `code` is in this format and its check character matches"""
+    if len(code) != CODE_LENGTH or not code.startswith(PREFIX):
+        return False
+    payload, check = code[len(PREFIX):-1], code[-1]
+    if any(character not in _VALUES for character in payload):
+        return False
+    return check_character(payload) == check
+
+
+class ReferenceCodeAllocator:
+    """
+    Hands out reference codes from blocks of reserved sequence numbers
+    reserve_block(count) must atomically reserve `count` sequence numbers and
+    return (node_id, first sequence number); it only runs once per block,
+    so the database is touched once every BLOCK_SIZE codes. Thread-safe.
+    """
+    def __init__(self, reserve_block, block_size=BLOCK_SIZE):
+        self.reserve_block = reserve_block
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._node_id = None
+        self._next = 0   # next unused sequence number in the current block
+        self._end = 0    # first sequence number past the current block
+
+    def next_code(self):
+        """A reference code no other call, thread, process or kiosk will get"""
+        with self._lock:
+            if self._next >= self._end:
+                self._node_id, self._next = self.reserve_block(self.block_size)
+                self._end = self._next + self.block_size
+            sequence = self._next
+            self._next += 1
+            node_id = self._node_id
+        return format_reference_code(node_id, sequence)
@@ -0,0 +1,206 @@
+"""
+Write-behind replication from SQLite to MySQL for OwlReg
+Registrations and deletions are committed to SQLite together with an entry in
+replication_outbox, and the replicator copies them to MySQL in the background
+"""
+import threading
+import time
+import traceback
+
+import pymysql
+
+import sqlite_db
+import mysql_db
+
+# Replication settings
+BATCH_SIZE = 50           # outbox entries copied per pass
+POLL_INTERVAL = 30        # seconds between passes when nothing wakes the replicator
+RETRY_BASE_DELAY = 2      # wait after the first failure (seconds), doubled on each further failure
+RETRY_MAX_DELAY = 300     # longest wait between retries
+MAX_ATTEMPTS = 5          # attempts before an entry MySQL keeps rejecting is dead-lettered
+
+# Errors that retrying will not fix (a clashing key, a value MySQL won't store)
+PERMANENT_ERRORS = (pymysql.IntegrityError, pymysql.DataError)
+
+
+class OutboxReplicator:
+    """
+    Background thread that drains replication_outbox into MySQL
+    Entries are applied strictly in the order they were queued; a failure
+    stops the pass and the same entry is retried after an exponential backoff.
+    An entry MySQL rejects with a permanent error max_attempts times is moved
+    to replication_dead_letters so the entries behind it can go through
+    """
+    def __init__(self, batch_size=BATCH_SIZE, poll_interval=POLL_INTERVAL,
+                 base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY, max_attempts=MAX_ATTEMPTS):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+
+        self.consecutive_failures = 0
+        self.replicated_count = 0
+        self.last_success_at = None
+        self.last_error = None
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the background thread (does nothing if it is already running)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="owlreg-replicator", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=5):
+        """Ask the background thread to finish and wait for it"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def notify(self):
+        """Wake the replicator because something new was queued"""
+        self._wake.set()
+
+    def retry_delay(self):
+        """Backoff before the next attempt after consecutive failures"""
+        return min(self.base_delay * (2 ** (self.consecutive_failures - 1)), self.max_delay)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                copied = self.replicate_once()
+            except Exception as e:
+                print(f"Replicator error: {e}")
+                traceback.print_exc()
+                self.consecutive_failures += 1
+                self.last_error = str(e)
+                copied = 0
+
+            if self.consecutive_failures:
+                # MySQL is struggling - back off, and don't let new registrations cut the wait short
+                self._stop.wait(self.retry_delay())
+                self._wake.clear()
+            elif copied >= self.batch_size:
+                continue  # More may be waiting - go straight on to the next batch
+            else:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def replicate_once(self):
+        """Copy one batch of queued changes to MySQL; returns how many were copied"""
+        entries = sqlite_db.fetch_outbox_batch(self.batch_size)
+        done = []
+        failure = None
+        try:
+            for group in self._group_entries(entries):
+                for entry, error in self._apply_group(group):
+                    if error is None:
+                        done.append(entry["outbox_id"])
+                    elif failure is None:
+                        failure = (entry, error)
+                if failure is not None and self._is_dead(*failure):
+                    self._dead_letter(*failure)
+                    failure = None
+                if failure is not None:
+                    break  # Later changes wait, so MySQL sees them in order
+        finally:
+            sqlite_db.complete_outbox_entries(done)
+
+        if done:
+            self.replicated_count += len(done)
+            self.last_success_at = time.time()
+
+        if failure is not None:
+            entry, error = failure
+            self.consecutive_failures += 1
+            self.last_error = str(error)
+            sqlite_db.record_outbox_failure(entry["outbox_id"], error)
+            print(f"Replication of {entry['reference_code']} failed (attempt {entry['attempts'] + 1}): {error}")
+        elif entries:
+            self.consecutive_failures = 0
+        return len(done)
+
+    def _is_dead(self, entry, error):
+        """True if `entry` keeps failing with an error retrying won't fix"""
+        return isinstance(error, PERMANENT_ERRORS) and entry["attempts"] + 1 >= self.max_attempts
+
+    def _dead_letter(self, entry, error):
+        """Give up on `entry`, keeping it in replication_dead_letters for someone to look at"""
+        sqlite_db.dead_letter_outbox_entry(entry["outbox_id"], error)
+        self.last_error = str(error)
+        print(f"Gave up replicating {entry['reference_code']} after {entry['attempts'] + 1} attempts, "
+              f"moved to dead letters: {error}")
+
+    @staticmethod
+    def _group_entries(entries):
+        """
+        Split a batch into runs that can be applied together: consecutive
+        first-attempt registrations form one bulk insert, everything else goes alone
+        """
+        group = []
+        for entry in entries:
+            if entry["operation"] == sqlite_db.OUTBOX_REGISTER and not entry["attempts"]:
+                group.append(entry)
+                continue
+            if group:
+                yield group
+                group = []
+            yield [entry]
+        if group:
+            yield group
+
+    def _apply_group(self, group):
+        """Apply a group of entries, returning (entry, exception or error message, or None) pairs"""
+        first = group[0]
+        try:
+            if first["operation"] == sqlite_db.OUTBOX_REGISTER and not first["attempts"]:
+                results = mysql_db.save_registrations([entry["payload"] for entry in group])
+                return [(entry, None if success else str(message))
+                        for entry, (success, message, _) in zip(group, results)]
+
+            self._apply(first)
+            return [(first, None)]
+        except Exception as e:
+            return [(first, e)]
+
+    def _apply(self, entry):
+        """Apply one outbox entry to MySQL, raising if it did not go through"""
+        ref_code = entry["reference_code"]
+
+        if entry["operation"] == sqlite_db.OUTBOX_REGISTER:
+            # An earlier attempt may have committed in MySQL before its reply was lost
+            if entry["attempts"] and mysql_db.registration_exists(ref_code):
+                return
+            success, message, _ = mysql_db.save_registration(entry["payload"], raise_errors=True)
+        elif entry["operation"] == sqlite_db.OUTBOX_DELETE:
+            success, message = mysql_db.delete_registration(ref_code)
+        else:
+            raise ValueError(f"Unknown outbox operation: {entry['operation']}")
+
+        if not success:
+            raise RuntimeError(message)
+
+    def metrics(self):
+        """Replication lag metrics: queue size, age of the oldest change, failure state and dead letters"""
+        outbox = sqlite_db.get_outbox_metrics()
+        oldest = outbox["oldest_created_at"]
+        return {
+            "pending": outbox["pending"],
+            "lag_seconds": time.time() - oldest if oldest else 0.0,
+            "head_attempts": outbox["head_attempts"],
+            "head_error": outbox["head_error"],
+            "dead_lettered": outbox["dead_lettered"],
+            "dead_letters": outbox["dead_letters"],
+            "replicated": self.replicated_count,
+            "consecutive_failures": self.consecutive_failures,
+            "last_success_at": self.last_success_at,
+            "running": self._thread is not None and self._thread.is_alive()
+        }
@@ -5,19 +5,280 @@ Works independently from MySQL operations
 """
 import sqlite3
 import os
-import random
-import string
-from datetime import datetime
+import threading
+import atexit
+import weakref
+import json
+import time
+import re
+from datetime import date, datetime, timedelta
+from itertools import islice
+from collections import OrderedDict
 import traceback
+from reference_codes import ReferenceCodeAllocator, CLAIMED_NODE_IDS, OFFLINE_NODE_IDS
 
 # Database file path
 DB_FILE = os.path.join(os.path.dirname(__file__), "student_records.db")
 
+# Connection tuning - every module borrows connections through get_connection()
+# so these settings apply everywhere
+BUSY_TIMEOUT_SECONDS = 10      # wait this long for another writer before failing
+STATEMENT_CACHE_SIZE = 256     # prepared statements kept per connection
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",     # readers don't block the writer
+    "PRAGMA synchronous=NORMAL",   # safe with WAL, avoids an fsync per commit
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",    # ~16 MB page cache
+    "PRAGMA mmap_size=67108864",   # 64 MB memory-mapped reads
+)
+
+# Bump whenever create_database() gains new tables, indexes or triggers.
+# Stored in PRAGMA user_version so the DDL only runs when the file is behind.
+SCHEMA_VERSION = 9
+
+# One connection per thread while the thread uses the database. The connection
+# hangs off a holder in thread-local storage; when the thread ends (for
+# QThreadPool workers, when the task ends - PyQt drops the Python thread state
+# after each run) the holder is freed and its connection goes to a small idle
+# pool for the next thread, or is closed if the pool is full
+MAX_IDLE_CONNECTIONS = 4
+_local = threading.local()
+_holders = weakref.WeakSet()   # holders of the connections threads are using now
+_idle = []                     # (database file, connection) waiting for a thread
+_connections_lock = threading.Lock()
+
+class _ConnectionHolder:
+    """One thread's connection; hands it back through _release_connection() when the thread lets go"""
+    __slots__ = ("conn", "db_file", "__weakref__")
+
+    def __init__(self, conn, db_file):
+        self.conn = conn
+        self.db_file = db_file
+        weakref.finalize(self, _release_connection, conn, db_file).atexit = False
+
+def _release_connection(conn, db_file):
+    """Put a finished thread's connection in the idle pool, or close it"""
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+        with _connections_lock:
+            if db_file == DB_FILE and len(_idle) < MAX_IDLE_CONNECTIONS:
+                _idle.append((db_file, conn))
+                return
+        conn.close()
+    except sqlite3.ProgrammingError:
+        pass  # already closed by close_connections()
+    except Exception as e:
+        print(f"Error releasing SQLite connection: {e}")
+
+def _open_connection():
+    conn = sqlite3.connect(
+        DB_FILE,
+        timeout=BUSY_TIMEOUT_SECONDS,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        check_same_thread=False  # idle connections move between threads
+    )
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def get_connection():
+    """Return the calling thread's shared SQLite connection, taking an idle one or opening one on first use"""
+    holder = getattr(_local, "holder", None)
+    if holder is not None and holder.db_file == DB_FILE:
+        return holder.conn
+
+    conn = None
+    stale = []
+    with _connections_lock:
+        while _idle and conn is None:
+            db_file, idle_conn = _idle.pop()
+            if db_file == DB_FILE:
+                conn = idle_conn
+            else:
+                stale.append(idle_conn)
+    for idle_conn in stale:
+        idle_conn.close()
+    if conn is None:
+        conn = _open_connection()
+
+    # Replacing a holder for another database file releases that one
+    holder = _ConnectionHolder(conn, DB_FILE)
+    _local.holder = holder
+    with _connections_lock:
+        _holders.add(holder)
+    return conn
+
+def close_connections():
+    """Close every shared connection, in use or idle (called automatically at exit)"""
+    with _connections_lock:
+        connections = [holder.conn for holder in _holders] + [conn for _, conn in _idle]
+        _idle.clear()
+
+    for conn in connections:
+        try:
+            conn.close()
+        except Exception as e:
+            print(f"Error closing SQLite connection: {e}")
+
+    _local.__dict__.clear()
+
+atexit.register(close_connections)
+
+# Database file whose schema has been verified by this process
+_schema_ready_for = None
+_schema_lock = threading.Lock()
+
+def ensure_schema():
+    """Make sure the schema is current, checking the database only once per process"""
+    global _schema_ready_for
+    if _schema_ready_for == DB_FILE:
+        return True
+
+    with _schema_lock:
+        if _schema_ready_for == DB_FILE:
+            return True
+
+        try:
+            version = get_connection().execute("PRAGMA user_version").fetchone()[0]
+        except Exception as e:
+            print(f"Could not read SQLite schema version: {e}")
+            return False
+
+        if version < SCHEMA_VERSION:
+            print(f"SQLite schema version {version} is older than {SCHEMA_VERSION}, upgrading...")
+            if not create_database():
+                return False
+
+        _schema_ready_for = DB_FILE
+        return True
+
+# Secondary indexes created by create_database()
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_students_registration_date ON students (registration_date)",
+    "CREATE INDEX IF NOT EXISTS idx_students_enrollment_type ON students (enrollment_type)",
+    "CREATE INDEX IF NOT EXISTS idx_students_strand_registration_date ON students (strand, registration_date)",
+    "CREATE INDEX IF NOT EXISTS idx_students_name ON students (first_name, last_name)",
+    "CREATE INDEX IF NOT EXISTS idx_staff_name ON staff (last_name, first_name)",
+    "CREATE INDEX IF NOT EXISTS idx_family_background_student_id ON family_background (student_id)",
+    "CREATE INDEX IF NOT EXISTS idx_academic_profile_student_id ON academic_profile (student_id)",
+    "CREATE INDEX IF NOT EXISTS idx_emergency_contacts_student_id ON emergency_contacts (student_id)",
+)
+
+# Indexes from older schema versions that a newer index now covers
+OBSOLETE_INDEXES = (
+    "idx_students_strand",  # replaced by idx_students_strand_registration_date
+)
+
+# student_metrics rows: ('total', ''), ('freshmen', ''), ('transferee', '') and
+# ('strand', <strand name>). A student with no enrollment type counts as freshmen,
+# the same way the dashboards always counted them.
+# ("WHERE 1" in the INSERT keeps SQLite from reading ON CONFLICT as a join clause)
+_METRIC_ROWS_FOR = '''
+    SELECT 'total' AS metric, '' AS key
+    UNION ALL SELECT 'freshmen', '' WHERE {row}.enrollment_type = 'Freshmen' OR {row}.enrollment_type IS NULL
+    UNION ALL SELECT 'transferee', '' WHERE {row}.enrollment_type = 'Transferee'
+    UNION ALL SELECT 'strand', {row}.strand WHERE {row}.strand IS NOT NULL AND {row}.strand != ''
+'''
+
+_ADD_METRICS = '''
+    INSERT INTO student_metrics (metric, key, count)
+    SELECT metric, key, 1 FROM ({rows}) WHERE 1
+    ON CONFLICT (metric, key) DO UPDATE SET count = count + 1;
+'''
+
+_REMOVE_METRICS = '''
+    UPDATE student_metrics SET count = count - 1
+    WHERE (metric, key) IN (SELECT metric, key FROM ({rows}));
+'''
+
+METRIC_TRIGGERS = (
+    f"""CREATE TRIGGER IF NOT EXISTS trg_student_metrics_insert AFTER INSERT ON students BEGIN
+        {_ADD_METRICS.format(rows=_METRIC_ROWS_FOR.format(row="NEW"))}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_student_metrics_delete AFTER DELETE ON students BEGIN
+        {_REMOVE_METRICS.format(rows=_METRIC_ROWS_FOR.format(row="OLD"))}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_student_metrics_update
+    AFTER UPDATE OF enrollment_type, strand ON students BEGIN
+        {_REMOVE_METRICS.format(rows=_METRIC_ROWS_FOR.format(row="OLD"))}
+        {_ADD_METRICS.format(rows=_METRIC_ROWS_FOR.format(row="NEW"))}
+    END""",
+)
+
+def _rebuild_student_metrics(cursor):
+    """Recount student_metrics from scratch in a single pass over students"""
+    cursor.execute('''
+        SELECT strand,
+               COUNT(*),
+               SUM(enrollment_type = 'Freshmen' OR enrollment_type IS NULL),
+               SUM(enrollment_type = 'Transferee')
+        FROM students
+        GROUP BY strand
+    ''')
+    total = freshmen = transferee = 0
+    rows = []
+    for strand, count, strand_freshmen, strand_transferees in cursor.fetchall():
+        total += count
+        freshmen += strand_freshmen or 0
+        transferee += strand_transferees or 0
+        if strand:
+            rows.append(("strand", strand, count))
+    rows += [("total", "", total), ("freshmen", "", freshmen), ("transferee", "", transferee)]
+
+    cursor.execute("DELETE FROM student_metrics")
+    cursor.executemany("INSERT INTO student_metrics (metric, key, count) VALUES (?, ?, ?)", rows)
+
+# Student search index: external-content FTS5 tables that read their text
+# from students, so nothing is stored twice. students_fts matches word
+# prefixes across the searchable columns (the 2- and 3-letter prefix indexes
+# make short prefixes cheap); students_trigram indexes the names by trigram
+# for fuzzy matching of misspelled names.
+SEARCH_COLUMNS = ("first_name", "middle_name", "last_name", "reference_code", "lrn", "address")
+FUZZY_COLUMNS = ("first_name", "middle_name", "last_name")
+SEARCH_TABLES = {
+    "students_fts": (SEARCH_COLUMNS, "unicode61 remove_diacritics 2", "prefix='2 3',"),
+    "students_trigram": (FUZZY_COLUMNS, "trigram", ""),
+}
+
+def _search_trigger_sql(table, columns):
+    """Triggers that keep one external-content search table in step with students"""
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"NEW.{column}" for column in columns)
+    old_values = ", ".join(f"OLD.{column}" for column in columns)
+    insert = f"INSERT INTO {table} (rowid, {column_list}) VALUES (NEW.student_id, {new_values});"
+    delete = (f"INSERT INTO {table} ({table}, rowid, {column_list}) "
+              f"VALUES ('delete', OLD.student_id, {old_values});")
+    return (
+        f"CREATE TRIGGER IF NOT EXISTS trg_{table}_insert AFTER INSERT ON students BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_{table}_delete AFTER DELETE ON students BEGIN {delete} END",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{table}_update
+        AFTER UPDATE OF {column_list} ON students BEGIN {delete} {insert} END""",
+    )
+
+def _create_search_index(cursor):
+    """Create the search tables and their triggers, indexing existing students the first time"""
+    for table, (columns, tokenizer, options) in SEARCH_TABLES.items():
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+        cursor.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5(
+            {", ".join(columns)},
+            content='students', content_rowid='student_id',
+            {options} tokenize='{tokenizer}'
+        )
+        ''')
+        for trigger_sql in _search_trigger_sql(table, columns):
+            cursor.execute(trigger_sql)
+        if not exists:
+            cursor.execute(f"INSERT INTO {table} ({table}) VALUES ('rebuild')")
+
 def create_database():
     """Create SQLite database and tables"""
     try:
-        # Connect to SQLite database (creates file if it doesn't exist)
-        conn = sqlite3.connect(DB_FILE)
+        # Borrow the shared connection (creates file if it doesn't exist)
+        conn = get_connection()
         cursor = conn.cursor()
 
         # Create students table
@@ -115,27 +376,522 @@ def create_database():
         )
         ''')
 
+        # Create replication_outbox table - changes still waiting to be copied to MySQL
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS replication_outbox (
+            outbox_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            operation TEXT NOT NULL,
+            reference_code TEXT NOT NULL,
+            payload TEXT,
+            created_at REAL NOT NULL,
+            attempts INTEGER DEFAULT 0,
+            last_attempt_at REAL,
+            last_error TEXT
+        )
+        ''')
+
+        # Create replication_dead_letters table - outbox changes MySQL rejected for good
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS replication_dead_letters (
+            outbox_id INTEGER PRIMARY KEY,
+            operation TEXT NOT NULL,
+            reference_code TEXT NOT NULL,
+            payload TEXT,
+            created_at REAL NOT NULL,
+            attempts INTEGER NOT NULL,
+            last_error TEXT,
+            dead_at REAL NOT NULL
+        )
+        ''')
+
+        # Create reference_code_allocator table - this kiosk's node ID and next unreserved sequence number
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS reference_code_allocator (
+            singleton INTEGER PRIMARY KEY CHECK (singleton = 1),
+            node_id INTEGER NOT NULL,
+            next_sequence INTEGER NOT NULL DEFAULT 0
+        )
+        ''')
+
+        # Indexes for the dashboard list order, metric filters and child-table lookups
+        for index_sql in INDEXES:
+            cursor.execute(index_sql)
+        for index_name in OBSOLETE_INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+        # Create student_metrics table - dashboard counts kept current by triggers
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS student_metrics (
+            metric TEXT NOT NULL,
+            key TEXT NOT NULL DEFAULT '',
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (metric, key)
+        ) WITHOUT ROWID
+        ''')
+        for trigger_sql in METRIC_TRIGGERS:
+            cursor.execute(trigger_sql)
+        _rebuild_student_metrics(cursor)
+
+        # Full-text search over names, reference codes, LRNs and addresses
+        _create_search_index(cursor)
+
+        # Record the schema version so ensure_schema() can skip this next time
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
         conn.commit()
-        conn.close()
         return True
     except Exception as e:
         print(f"Database creation error: {e}")
         return False
 
+def get_dashboard_metrics():
+    """
+    Dashboard counts from the trigger-maintained student_metrics table
+    Returns {"total", "freshmen", "transferee": int, "strands": {strand: count}}
+    """
+    metrics = {"total": 0, "freshmen": 0, "transferee": 0, "strands": {}}
+    if not ensure_schema():
+        return metrics
+
+    cursor = get_connection().execute("SELECT metric, key, count FROM student_metrics ORDER BY metric, key")
+    for metric, key, count in cursor.fetchall():
+        if metric == "strand":
+            if count > 0:
+                metrics["strands"][key] = count
+        else:
+            metrics[metric] = count
+    return metrics
+
+# Days shown on the dashboards' registration trend chart
+REGISTRATION_TREND_DAYS = 14
+
+def get_registration_trend(days=REGISTRATION_TREND_DAYS, today=None):
+    """
+    Registrations per day over the last `days` days, oldest first
+    Returns [(date, count)] with a 0 for each day nobody registered
+    """
+    today = today or date.today()
+    first_day = today - timedelta(days=days - 1)
+    trend = {first_day + timedelta(days=i): 0 for i in range(days)}
+    if not ensure_schema():
+        return list(trend.items())
+
+    # registration_date is "YYYY-MM-DD HH:MM:SS", so this is a range scan of its index
+    cursor = get_connection().execute("""
+        SELECT substr(registration_date, 1, 10) AS day, COUNT(*)
+        FROM students
+        WHERE registration_date >= ?
+        GROUP BY day
+    """, (first_day.isoformat(),))
+    for day, count in cursor.fetchall():
+        try:
+            day = date.fromisoformat(day)
+        except (TypeError, ValueError):
+            continue
+        if day in trend:
+            trend[day] = count
+    return list(trend.items())
+
+STUDENT_PAGE_SIZE = 200
+
+# Sort keys accepted by query_students(): the ORDER BY columns for each.
+# Every list ends in a unique column so paging is stable, and each one
+# matches an index so a page never sorts the whole table.
+# RELEVANCE_SORT ranks search matches best first instead.
+STUDENT_SORT_KEYS = {
+    "student_id": ("student_id",),
+    "name": ("first_name", "last_name", "student_id"),
+    "enrollment_type": ("enrollment_type", "student_id"),
+    "strand": ("strand", "registration_date", "student_id"),
+    "registration_date": ("registration_date", "student_id"),
+}
+RELEVANCE_SORT = "relevance"
+
+# bm25 weight per SEARCH_COLUMNS entry: a hit in a name counts more than one in the address
+SEARCH_WEIGHTS = (10.0, 4.0, 10.0, 8.0, 8.0, 1.0)
+FUZZY_MATCH_LIMIT = 50   # most fuzzy matches returned when nothing matches exactly
+# bm25 scores every match before the best can be picked, so only searches this
+# selective are ranked; broader ones (a first letter or two) list newest first
+RANKED_MATCH_LIMIT = 2000
+
+# "ST-0042", "st42", "st-00" - the student numbers shown in the list
+STUDENT_NUMBER_PATTERN = re.compile(r"st-?(\d+)", re.IGNORECASE)
+
+def _prefix_match_query(text):
+    """
+    FTS5 query for search-as-you-type: every finished word of `text` must match a
+    whole word and the last one, still being typed, a word prefix
+    (prefix-expanding a common finished word would read its entire doclist)
+    """
+    words = re.findall(r"\w+", text.lower())
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    if text[-1:].isalnum():
+        terms[-1] += "*"
+    return " ".join(terms)
+
+def _fuzzy_match_query(text):
+    """
+    FTS5 trigram query matching names that share a run of letters with every word
+    of `text`: four-letter runs for words of five letters or more, three-letter runs
+    for shorter ones (words under three letters are skipped). One typo leaves most
+    runs intact, while short runs alone would match half the table.
+    """
+    groups = []
+    for word in re.findall(r"\w+", text.lower()):
+        size = 4 if len(word) >= 5 else 3
+        runs = dict.fromkeys(word[i:i + size] for i in range(len(word) - size + 1))
+        if runs:
+            groups.append("(" + " OR ".join(f'"{run}"' for run in runs) + ")")
+    if not groups:
+        return None
+    return " AND ".join(groups)
+
+def _student_number_range(digits):
+    """
+    student_id range whose ST-0000 number starts with `digits`
+    ("00" covers ST-0000 to ST-0099; four or more digits name one student)
+    """
+    if len(digits) >= 4:
+        return int(digits), int(digits) + 1
+    scale = 10 ** (4 - len(digits))
+    return int(digits) * scale, (int(digits) + 1) * scale
+
+def _search_students(conn, table, match, strand, sort_key, descending, offset, limit, cap=None):
+    """One page of students matching an FTS5 query on `table`, plus the match count (at most `cap`)"""
+    strand_sql = "AND s.strand = ?" if strand else ""
+    params = [match] + ([strand] if strand else [])
+
+    # Without a strand the count never has to touch the students table. With one,
+    # CROSS JOIN keeps the index lookup as the outer loop: left to itself SQLite
+    # walks the strand index and runs the MATCH again for every student in the strand
+    if strand:
+        matches = (f"SELECT 1 FROM {table} CROSS JOIN students s ON s.student_id = {table}.rowid "
+                   f"WHERE {table} MATCH ? {strand_sql}")
+    else:
+        matches = f"SELECT 1 FROM {table} WHERE {table} MATCH ?"
+    if cap is not None:
+        matches += f" LIMIT {int(cap)}"
+    total = conn.execute(f"SELECT COUNT(*) FROM ({matches})", params).fetchone()[0]
+    if total == 0:
+        return [], 0
+
+    if sort_key == RELEVANCE_SORT and (cap is not None or total <= RANKED_MATCH_LIMIT):
+        weights = ", ".join(map(str, SEARCH_WEIGHTS)) if table == "students_fts" else "1.0"
+        order_by = f"bm25({table}, {weights}), s.student_id"
+    elif sort_key == RELEVANCE_SORT:
+        order_by = f"{table}.rowid DESC"  # Too broad to rank - newest first, straight off the index
+    else:
+        direction = "DESC" if descending else "ASC"
+        order_by = ", ".join(f"s.{column} {direction}" for column in STUDENT_SORT_KEYS[sort_key])
+    if cap is not None:
+        limit = max(0, min(limit, cap - offset))
+
+    rows = conn.execute(f"""
+        SELECT s.student_id, s.first_name, s.middle_name, s.last_name, s.extension,
+               s.enrollment_type, s.strand, s.registration_date
+        FROM {table} CROSS JOIN students s ON s.student_id = {table}.rowid
+        WHERE {table} MATCH ? {strand_sql}
+        ORDER BY {order_by}
+        LIMIT ? OFFSET ?
+    """, params + [limit, offset]).fetchall()
+    return rows, total
+
+def query_students(search="", strand=None, sort_key="registration_date", descending=True,
+                   offset=0, limit=STUDENT_PAGE_SIZE, fuzzy=True):
+    """
+    One page of the student list, filtered and sorted in SQL
+    search matches words in the name, reference code, LRN or address (the last word
+    as a prefix), or an ST-0000 student number; strand=None means all strands.
+    sort_key=RELEVANCE_SORT ranks search matches best first. If nothing matches and
+    fuzzy is on, up to FUZZY_MATCH_LIMIT names sharing the most trigrams with the
+    search are returned, best first.
+    Returns (rows, total) where rows are (student_id, first_name, middle_name, last_name,
+    extension, enrollment_type, strand, registration_date) and total counts every match
+    """
+    if sort_key not in STUDENT_SORT_KEYS and sort_key != RELEVANCE_SORT:
+        raise ValueError(f"Unknown sort key: {sort_key}")
+    if not ensure_schema():
+        return [], 0
+
+    conn = get_connection()
+    search = search.strip()
+    student_number = STUDENT_NUMBER_PATTERN.fullmatch(search)
+
+    if search and not student_number:
+        match = _prefix_match_query(search)
+        if match is None:
+            return [], 0
+        rows, total = _search_students(conn, "students_fts", match, strand, sort_key, descending, offset, limit)
+        if total == 0 and fuzzy:
+            fuzzy_match = _fuzzy_match_query(search)
+            if fuzzy_match:
+                rows, total = _search_students(conn, "students_trigram", fuzzy_match, strand,
+                                               RELEVANCE_SORT, False, offset, limit, cap=FUZZY_MATCH_LIMIT)
+        return rows, total
+
+    # Nothing to rank without search words - fall back to the usual newest-first order
+    if sort_key == RELEVANCE_SORT:
+        sort_key, descending = "registration_date", True
+
+    conditions = []
+    params = []
+    if student_number:
+        conditions.append("student_id >= ? AND student_id < ?")
+        params += list(_student_number_range(student_number.group(1)))
+    if strand:
+        conditions.append("strand = ?")
+        params.append(strand)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    direction = "DESC" if descending else "ASC"
+    order_by = ", ".join(f"{column} {direction}" for column in STUDENT_SORT_KEYS[sort_key])
+
+    rows = conn.execute(f"""
+        SELECT student_id, first_name, middle_name, last_name, extension,
+               enrollment_type, strand, registration_date
+        FROM students
+        {where}
+        ORDER BY {order_by}
+        LIMIT ? OFFSET ?
+    """, params + [limit, offset]).fetchall()
+
+    if student_number:
+        total = conn.execute(f"SELECT COUNT(*) FROM students {where}", params).fetchone()[0]
+    else:
+        # Unsearched totals are already kept in student_metrics
+        row = conn.execute(
+            "SELECT count FROM student_metrics WHERE metric = ? AND key = ?",
+            ("strand", strand) if strand else ("total", "")
+        ).fetchone()
+        total = row[0] if row else 0
+    return rows, total
+
+# ---------------- Student details ---------------- #
+
+# One student with their family, academic and emergency records, in one query.
+# The rowid columns mark where each table's columns start in the result (and are
+# NULL when the student has no row in that table); the first row per table wins,
+# the same one the old one-query-per-table lookup used.
+STUDENT_DETAILS_SQL = '''
+SELECT s.*,
+       f.rowid AS "family", f.*,
+       a.rowid AS "academic", a.*,
+       e.rowid AS "emergency", e.*
+FROM students s
+LEFT JOIN family_background f ON f.rowid =
+    (SELECT rowid FROM family_background WHERE student_id = s.student_id ORDER BY rowid LIMIT 1)
+LEFT JOIN academic_profile a ON a.rowid =
+    (SELECT rowid FROM academic_profile WHERE student_id = s.student_id ORDER BY rowid LIMIT 1)
+LEFT JOIN emergency_contacts e ON e.rowid =
+    (SELECT rowid FROM emergency_contacts WHERE student_id = s.student_id ORDER BY rowid LIMIT 1)
+WHERE s.reference_code = ?
+'''
+DETAIL_SECTIONS = ("family", "academic", "emergency")
+
+# Recently looked-up students, most recent last: (database file, reference code) -> details
+STUDENT_DETAILS_CACHE_SIZE = 256
+_details_cache = OrderedDict()
+_details_cache_lock = threading.Lock()
+
+def get_student_details(ref_code):
+    """
+    Everything on record for one student, looked up by reference code
+    Returns {"student": {...}, "family": {...}, "academic": {...}, "emergency": {...}}
+    (a section is None when the student has no such record), or None when no
+    student has that code. Results are cached until invalidate_student_details()
+    is called for the code, so treat the returned dicts as read-only.
+    """
+    key = (DB_FILE, ref_code)
+    with _details_cache_lock:
+        details = _details_cache.get(key)
+        if details is not None:
+            _details_cache.move_to_end(key)
+            return details
+
+    cursor = get_connection().execute(STUDENT_DETAILS_SQL, (ref_code,))
+    row = cursor.fetchone()
+    if row is None:
+        return None  # misses aren't cached, so a new registration shows up straight away
+
+    # Split the joined row back into one dict per table at the marker columns
+    columns = [description[0] for description in cursor.description]
+    markers = [i for i, column in enumerate(columns) if column in DETAIL_SECTIONS]
+    details = {"student": dict(zip(columns[:markers[0]], row[:markers[0]]))}
+    for start, end in zip(markers, markers[1:] + [len(columns)]):
+        section = columns[start]
+        details[section] = dict(zip(columns[start + 1:end], row[start + 1:end])) if row[start] is not None else None
+
+    with _details_cache_lock:
+        _details_cache[key] = details
+        _details_cache.move_to_end(key)
+        while len(_details_cache) > STUDENT_DETAILS_CACHE_SIZE:
+            _details_cache.popitem(last=False)
+    return details
+
+def invalidate_student_details(ref_code=None):
+    """Forget the cached details for one reference code, or for every student"""
+    with _details_cache_lock:
+        if ref_code is None:
+            _details_cache.clear()
+        else:
+            _details_cache.pop((DB_FILE, ref_code), None)
+
+# ---------------- Staff accounts ---------------- #
+
+# The staff list on the admin dashboard
+STAFF_LIST_SQL = '''
+SELECT staff_id, first_name, last_name, username,
+       position, department, is_admin
+FROM staff
+ORDER BY last_name, first_name
+'''
+
+def update_staff_password(staff_id, password_hash):
+    """Store a new password hash for a staff or admin account"""
+    try:
+        conn = get_connection()
+        conn.execute("UPDATE staff SET password = ? WHERE staff_id = ?", (password_hash, staff_id))
+        conn.commit()
+        print(f"Updated password hash for staff ID {staff_id}")
+        return True
+    except Exception as e:
+        print(f"Error updating password hash: {e}")
+        return False
+
+# ---------------- Reference codes ---------------- #
+
+# Set to give this kiosk a fixed node ID instead of one claimed from MySQL. It is
+# stored in reference_code_allocator like a claimed ID, so the database always
+# holds the ID codes are issued under
+NODE_ID_ENV = "OWLREG_NODE_ID"
+
+class NoNodeIdError(RuntimeError):
+    """Raised when a kiosk must issue a reference code but has no node ID to issue it under"""
+
+
+def _configured_node_id():
+    """The node ID from NODE_ID_ENV, or None if it isn't set"""
+    value = os.environ.get(NODE_ID_ENV)
+    if not value:
+        return None
+    node_id = int(value)
+    if node_id not in CLAIMED_NODE_IDS:
+        raise ValueError(f"{NODE_ID_ENV} must be between {CLAIMED_NODE_IDS.start} and {CLAIMED_NODE_IDS.stop - 1}")
+    return node_id
+
+def _store_node_id(conn, node_id):
+    """
+    Make `node_id` this kiosk's node ID (the caller owns the transaction)
+    A legacy offline ID is replaced, starting a fresh sequence; any other
+    stored ID is kept for good. Returns the stored (node_id, next_sequence)
+    """
+    row = conn.execute("SELECT node_id, next_sequence FROM reference_code_allocator").fetchone()
+    if row is None or row[0] in OFFLINE_NODE_IDS:
+        conn.execute("INSERT OR REPLACE INTO reference_code_allocator (singleton, node_id, next_sequence) "
+                     "VALUES (1, ?, 0)", (node_id,))
+        return node_id, 0
+    return row
+
+def _current_node(conn):
+    """
+    This kiosk's stored (node_id, next_sequence), storing the configured ID first
+    if there is one (the caller owns the transaction); (None, 0) if it has no ID
+    """
+    configured = _configured_node_id()
+    if configured is not None:
+        node_id, next_sequence = _store_node_id(conn, configured)
+        if node_id != configured:
+            raise RuntimeError(f"{NODE_ID_ENV} is {configured}, but this kiosk already issues "
+                               f"reference codes as node {node_id}")
+        return node_id, next_sequence
+
+    row = conn.execute("SELECT node_id, next_sequence FROM reference_code_allocator").fetchone()
+    return row if row is not None else (None, 0)
+
+def get_node_id():
+    """This kiosk's reference code node ID, or None if it hasn't been given one yet"""
+    if not ensure_schema():
+        return None
+    conn = get_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        node_id = _current_node(conn)[0]
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return node_id
+
+def set_node_id(node_id):
+    """
+    Give this kiosk its node ID, unless it already has one (a legacy offline
+    ID is replaced, any other is kept for good). Returns the kiosk's node ID,
+    or None if the database isn't available
+    """
+    global _code_allocator_for
+    if not ensure_schema():
+        return None
+    conn = get_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        node_id = _store_node_id(conn, node_id)[0]
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    # Start a fresh allocator on the stored ID
+    with _code_allocator_lock:
+        _code_allocator_for = None
+    return node_id
+
+def _reserve_code_block(count):
+    """
+    Reserve the next `count` sequence numbers for this kiosk
+    BEGIN IMMEDIATE makes the read-and-bump atomic across threads and processes.
+    Returns (node_id, first sequence number). Raises NoNodeIdError if the kiosk
+    has neither claimed nor been configured with a node ID - codes issued under
+    a made-up ID could match another kiosk's
+    """
+    if not ensure_schema():
+        raise RuntimeError("Could not prepare SQLite database")
+
+    conn = get_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        node_id, first = _current_node(conn)
+        if node_id is None or node_id in OFFLINE_NODE_IDS:
+            raise NoNodeIdError(f"This kiosk has no reference code node ID yet - connect it to MySQL "
+                                f"once to claim one, or set {NODE_ID_ENV}")
+        conn.execute("UPDATE reference_code_allocator SET next_sequence = ?", (first + count,))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return node_id, first
+
+# One allocator per database file (the benchmarks switch DB_FILE)
+_code_allocator = None
+_code_allocator_for = None
+_code_allocator_lock = threading.Lock()
+
 def generate_reference_code():
-    """Generate a unique reference code"""
-    # Format for Reference code
-    code = "REF"
-    # Add random characters
-    code += ''.join(random.choices(string.ascii_uppercase + string.digits, k=7))
-    return code
+    """A reference code unique across every kiosk, without checking the database first"""
+    global _code_allocator, _code_allocator_for
+    with _code_allocator_lock:
+        if _code_allocator_for != DB_FILE:
+            _code_allocator = ReferenceCodeAllocator(_reserve_code_block)
+            _code_allocator_for = DB_FILE
+        allocator = _code_allocator
+    return allocator.next_code()
 
 def test_connection():
     """Test SQLite connection and database accessibility"""
-    conn = None
     try:
         # Test if we can connect to the database and perform a simple query
-        conn = sqlite3.connect(DB_FILE)
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT sqlite_version();")
         version = cursor.fetchone()
@@ -152,26 +908,165 @@ def test_connection():
     except Exception as e:
         print(f"SQLite connection test failed: {e}")
         return False
-    finally:
-        if conn:
-            conn.close()
 
-def save_registration(form_data):
-    """Save registration data to SQLite database"""
-    conn = None
+# Insert statements shared by save_registration() and save_registrations()
+INSERT_STUDENT_SQL = '''
+INSERT INTO students (
+    reference_code, first_name, last_name, middle_name, extension,
+    lrn, enrollment_type, strand, preferred_session,
+    birthday, civil_status, religion, mobile_no, telephone_no,
+    ethnicity, address, registration_date
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+INSERT_FAMILY_SQL = '''
+INSERT INTO family_background (
+    student_id, father_name, father_age, father_ethnicity,
+    father_occupation, father_education, mother_name,
+    mother_age, mother_ethnicity, mother_occupation,
+    mother_education, guardian_name, guardian_age,
+    guardian_ethnicity, guardian_occupation, guardian_education,
+    guardian_contact
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+INSERT_ACADEMIC_SQL = '''
+INSERT INTO academic_profile (
+    student_id, elementary_school, elem_year_graduated,
+    elem_honors, juniorhs_school, jhs_year_graduated, jhs_honors
+) VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+INSERT_EMERGENCY_SQL = '''
+INSERT INTO emergency_contacts (
+    student_id, contact_name, relationship, address, contact_no
+) VALUES (?, ?, ?, ?, ?)
+'''
+
+# Registrations written per transaction by save_registrations()
+# (also keeps the student ID lookup under SQLite's bound-parameter limit)
+BULK_CHUNK_SIZE = 500
+
+def _registration_rows(form_data, ref_code):
+    """
+    Build the students, family_background, academic_profile and emergency_contacts
+    values for one registration. The three child rows leave out student_id,
+    which is only known once the student row is in
+    """
+    personal = form_data.get("personal", {})
+    family = form_data.get("family", {})
+    academic = form_data.get("academic", {})
+    emergency = form_data.get("emergency", {})
+
+    # Determine enrollment type (transferee status) based on grade level
+    enrollment_type = "Transferee" if personal.get("is_transferee", False) else "Freshmen"
+
+    # Set values with defaults
+    student_row = (
+        ref_code,
+        personal.get("first_name", ""),
+        personal.get("last_name", ""),
+        personal.get("middle_name", ""),
+        personal.get("extension", ""),
+        personal.get("lrn", ""),
+        enrollment_type,  # Use the determined enrollment type
+        personal.get("strand", ""),
+        personal.get("session", "Morning"),
+        personal.get("birth_date", ""),
+        personal.get("civil_status", "Single"),
+        personal.get("religion", ""),
+        personal.get("mobile", ""),
+        personal.get("telephone", ""),
+        personal.get("ethnicity", ""),
+        f"{personal.get('street_address', '')}, {personal.get('barangay', '')}, {personal.get('city', '')}, {personal.get('province', '')}",
+        datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    )
+
+    father = family.get("father", {})
+    mother = family.get("mother", {})
+    guardian = family.get("guardian", {})
+
+    # Process family names
+    father_name = ""
+    if not father.get("skipped", True):
+        father_name = f"{father.get('first_name', '')} {father.get('last_name', '')}"
+
+    mother_name = ""
+    if not mother.get("skipped", True):
+        mother_name = f"{mother.get('first_name', '')} {mother.get('last_name', '')}"
+
+    guardian_name = ""
+    if not guardian.get("skipped", True):
+        guardian_name = f"{guardian.get('first_name', '')} {guardian.get('last_name', '')}"
+
+    # Convert ages to integers when possible
     try:
-        print("Attempting to save student data to SQLite...")
+        father_age = int(father.get("age", 0)) if father.get("age", "").isdigit() else 0
+        mother_age = int(mother.get("age", 0)) if mother.get("age", "").isdigit() else 0
+        guardian_age = int(guardian.get("age", 0)) if guardian.get("age", "").isdigit() else 0
+    except:
+        father_age = 0
+        mother_age = 0
+        guardian_age = 0
+
+    family_row = (
+        father_name,
+        father_age,
+        father.get("ethnicity", ""),
+        father.get("occupation", ""),
+        father.get("education", ""),
+        mother_name,
+        mother_age,
+        mother.get("ethnicity", ""),
+        mother.get("occupation", ""),
+        mother.get("education", ""),
+        guardian_name,
+        guardian_age,
+        guardian.get("ethnicity", ""),
+        guardian.get("occupation", ""),
+        guardian.get("education", ""),
+        guardian.get("contact", "")
+    )
+
+    academic_row = (
+        academic.get("elementary_school", ""),
+        academic.get("elementary_year", ""),
+        academic.get("elementary_honors", ""),
+        academic.get("juniorhs_school", ""),
+        academic.get("juniorhs_year", ""),
+        academic.get("juniorhs_honors", "")
+    )
 
-        # Test connection before proceeding
-        if not test_connection():
-            return False, "Could not connect to SQLite database", None
+    emergency_row = (
+        emergency.get("contact_name", ""),
+        emergency.get("relationship", ""),
+        emergency.get("address", ""),
+        emergency.get("contact_no", "")
+    )
 
-        # Ensure database is ready
-        if not create_database():
-            return False, "Could not create database", None
+    return student_row, family_row, academic_row, emergency_row
 
-        # Connect to database
-        conn = sqlite3.connect(DB_FILE)
+def _replication_payload(form_data, ref_code):
+    """The form data queued for MySQL, with the reference code filled in"""
+    payload = dict(form_data)
+    payload["personal"] = dict(form_data.get("personal", {}), reference_code=ref_code)
+    return payload
+
+def save_registration(form_data, replicate=False):
+    """
+    Save registration data to SQLite database
+    With replicate=True the registration is also queued in replication_outbox,
+    in the same transaction, for the replicator to copy to MySQL
+    """
+    try:
+        print("Attempting to save student data to SQLite...")
+
+        # Ensure database is ready (only hits the database on the first save)
+        if not ensure_schema():
+            return False, "Could not prepare SQLite database", None
+
+        # Borrow the shared connection
+        conn = get_connection()
         cursor = conn.cursor()
 
         # Generate reference code
@@ -183,150 +1078,25 @@ def save_registration(form_data):
             print(f"Using provided reference code: {ref_code}")
 
         # Get data from form
-        personal = form_data.get("personal", {})
-        family = form_data.get("family", {})
-        academic = form_data.get("academic", {})
-        emergency = form_data.get("emergency", {})
+        student_row, family_row, academic_row, emergency_row = _registration_rows(form_data, ref_code)
 
         try:
             # Start transaction
             conn.execute("BEGIN TRANSACTION")
 
             # Insert into students table
-            query = '''
-            INSERT INTO students (
-                reference_code, first_name, last_name, middle_name, extension,
-                lrn, enrollment_type, strand, preferred_session,
-                birthday, civil_status, religion, mobile_no, telephone_no,
-                ethnicity, address, registration_date
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            '''
-
-            # Determine enrollment type (transferee status) based on grade level
-            enrollment_type = "Transferee" if personal.get("is_transferee", False) else "Freshmen"
-
-            # Set values with defaults
-            values = (
-                ref_code,
-                personal.get("first_name", ""),
-                personal.get("last_name", ""),
-                personal.get("middle_name", ""),
-                personal.get("extension", ""),
-                personal.get("lrn", ""),
-                enrollment_type,  # Use the determined enrollment type
-                personal.get("strand", ""),
-                personal.get("session", "Morning"),
-                personal.get("birth_date", ""),
-                personal.get("civil_status", "Single"),
-                personal.get("religion", ""),
-                personal.get("mobile", ""),
-                personal.get("telephone", ""),
-                personal.get("ethnicity", ""),
-                f"{personal.get('street_address', '')}, {personal.get('barangay', '')}, {personal.get('city', '')}, {personal.get('province', '')}",
-                datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            )
-
-            cursor.execute(query, values)
+            cursor.execute(INSERT_STUDENT_SQL, student_row)
             student_id = cursor.lastrowid
             print(f"Inserted student record in SQLite with ID: {student_id}")
 
-            # Insert into family_background table
-            father = family.get("father", {})
-            mother = family.get("mother", {})
-            guardian = family.get("guardian", {})
-
-            # Process family names
-            father_name = ""
-            if not father.get("skipped", True):
-                father_name = f"{father.get('first_name', '')} {father.get('last_name', '')}"
-
-            mother_name = ""
-            if not mother.get("skipped", True):
-                mother_name = f"{mother.get('first_name', '')} {mother.get('last_name', '')}"
-
-            guardian_name = ""
-            if not guardian.get("skipped", True):
-                guardian_name = f"{guardian.get('first_name', '')} {guardian.get('last_name', '')}"
-
-            # Convert ages to integers when possible
-            try:
-                father_age = int(father.get("age", 0)) if father.get("age", "").isdigit() else 0
-                mother_age = int(mother.get("age", 0)) if mother.get("age", "").isdigit() else 0
-                guardian_age = int(guardian.get("age", 0)) if guardian.get("age", "").isdigit() else 0
-            except:
-                father_age = 0
-                mother_age = 0
-                guardian_age = 0
-
-            query = '''
-            INSERT INTO family_background (
-                student_id, father_name, father_age, father_ethnicity, 
-                father_occupation, father_education, mother_name, 
-                mother_age, mother_ethnicity, mother_occupation, 
-                mother_education, guardian_name, guardian_age, 
-                guardian_ethnicity, guardian_occupation, guardian_education,
-                guardian_contact
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            '''
-
-            values = (
-                student_id,
-                father_name,
-                father_age,
-                father.get("ethnicity", ""),
-                father.get("occupation", ""),
-                father.get("education", ""),
-                mother_name,
-                mother_age,
-                mother.get("ethnicity", ""),
-                mother.get("occupation", ""),
-                mother.get("education", ""),
-                guardian_name,
-                guardian_age,
-                guardian.get("ethnicity", ""),
-                guardian.get("occupation", ""),
-                guardian.get("education", ""),
-                guardian.get("contact", "")
-            )
-
-            cursor.execute(query, values)
-
-            # Insert into academic_profile table
-            query = '''
-            INSERT INTO academic_profile (
-                student_id, elementary_school, elem_year_graduated,
-                elem_honors, juniorhs_school, jhs_year_graduated, jhs_honors
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            '''
-
-            values = (
-                student_id,
-                academic.get("elementary_school", ""),
-                academic.get("elementary_year", ""),
-                academic.get("elementary_honors", ""),
-                academic.get("juniorhs_school", ""),
-                academic.get("juniorhs_year", ""),
-                academic.get("juniorhs_honors", "")
-            )
-
-            cursor.execute(query, values)
-
-            # Insert into emergency_contacts table
-            query = '''
-            INSERT INTO emergency_contacts (
-                student_id, contact_name, relationship, address, contact_no
-            ) VALUES (?, ?, ?, ?, ?)
-            '''
-
-            values = (
-                student_id,
-                emergency.get("contact_name", ""),
-                emergency.get("relationship", ""),
-                emergency.get("address", ""),
-                emergency.get("contact_no", "")
-            )
-
-            cursor.execute(query, values)
+            # Insert into family_background, academic_profile and emergency_contacts tables
+            cursor.execute(INSERT_FAMILY_SQL, (student_id,) + family_row)
+            cursor.execute(INSERT_ACADEMIC_SQL, (student_id,) + academic_row)
+            cursor.execute(INSERT_EMERGENCY_SQL, (student_id,) + emergency_row)
+
+            # Queue the registration for MySQL - committed or rolled back together with it
+            if replicate:
+                _enqueue_replication(cursor, OUTBOX_REGISTER, ref_code, _replication_payload(form_data, ref_code))
 
             # Commit all changes
             conn.commit()
@@ -343,11 +1113,213 @@ def save_registration(form_data):
         print(f"Unexpected SQLite error: {e}")
         traceback.print_exc()
         return False, str(e), None
-    finally:
-        # Always close the connection
-        if conn:
-            try:
-                conn.close()
-                print("SQLite connection closed")
-            except Exception as e:
-                print(f"Error closing SQLite connection: {e}")
+
+def save_registrations(registrations, chunk_size=BULK_CHUNK_SIZE, replicate=False):
+    """
+    Bulk-import registrations, e.g. a stack of paper forms or last year's roster
+    The iterable is read lazily, chunk_size registrations at a time, and each
+    chunk is written in one transaction with executemany.
+    Returns one (success, reference code or error, student ID) tuple per
+    registration, in input order
+    """
+    if not ensure_schema():
+        return [(False, "Could not prepare SQLite database", None) for _ in registrations]
+
+    results = []
+    iterator = iter(registrations)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            break
+        results.extend(_save_registration_chunk(chunk, replicate))
+
+    print(f"Bulk import saved {sum(1 for r in results if r[0])} of {len(results)} registrations to SQLite")
+    return results
+
+def _save_registration_chunk(chunk, replicate):
+    """Write one chunk of registrations in a single transaction"""
+    results = [None] * len(chunk)
+    prepared = []  # (position in chunk, reference code, rows, form data)
+    for position, form_data in enumerate(chunk):
+        try:
+            ref_code = form_data.get("personal", {}).get("reference_code") or generate_reference_code()
+            prepared.append((position, ref_code, _registration_rows(form_data, ref_code), form_data))
+        except Exception as e:
+            results[position] = (False, str(e), None)
+
+    if not prepared:
+        return results
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        conn.execute("BEGIN TRANSACTION")
+        cursor.executemany(INSERT_STUDENT_SQL, [rows[0] for _, _, rows, _ in prepared])
+
+        # executemany doesn't report row IDs, so look them up by reference code
+        ref_codes = [ref_code for _, ref_code, _, _ in prepared]
+        placeholders = ", ".join("?" * len(ref_codes))
+        cursor.execute(f"SELECT reference_code, student_id FROM students WHERE reference_code IN ({placeholders})",
+                       ref_codes)
+        student_ids = dict(cursor.fetchall())
+
+        cursor.executemany(INSERT_FAMILY_SQL,
+                           [(student_ids[ref_code],) + rows[1] for _, ref_code, rows, _ in prepared])
+        cursor.executemany(INSERT_ACADEMIC_SQL,
+                           [(student_ids[ref_code],) + rows[2] for _, ref_code, rows, _ in prepared])
+        cursor.executemany(INSERT_EMERGENCY_SQL,
+                           [(student_ids[ref_code],) + rows[3] for _, ref_code, rows, _ in prepared])
+
+        if replicate:
+            _enqueue_replications(cursor, [
+                (OUTBOX_REGISTER, ref_code, _replication_payload(form_data, ref_code))
+                for _, ref_code, _, form_data in prepared
+            ])
+
+        conn.commit()
+    except Exception as e:
+        # One bad row (e.g. a duplicate reference code) fails the whole chunk,
+        # so fall back to saving this chunk one registration at a time
+        conn.rollback()
+        print(f"Bulk insert of {len(prepared)} registrations failed ({e}), saving them one by one")
+        for position, ref_code, _, form_data in prepared:
+            results[position] = save_registration(_replication_payload(form_data, ref_code), replicate)
+        return results
+
+    for position, ref_code, _, _ in prepared:
+        results[position] = (True, ref_code, student_ids[ref_code])
+    return results
+
+def delete_student(student_id, replicate=False):
+    """
+    Delete a student and their family, academic and emergency records
+    With replicate=True the deletion is queued for MySQL in the same transaction
+    Returns (success, reference code or error message)
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT reference_code FROM students WHERE student_id = ?", (student_id,))
+        row = cursor.fetchone()
+        if not row:
+            return False, "Student record not found"
+        ref_code = row[0]
+
+        conn.execute("BEGIN TRANSACTION")
+        # Foreign keys are not enforced in SQLite here, so remove the child rows explicitly
+        for table in ("family_background", "academic_profile", "emergency_contacts"):
+            cursor.execute(f"DELETE FROM {table} WHERE student_id = ?", (student_id,))
+        cursor.execute("DELETE FROM students WHERE student_id = ?", (student_id,))
+
+        if replicate:
+            _enqueue_replication(cursor, OUTBOX_DELETE, ref_code)
+
+        conn.commit()
+        invalidate_student_details(ref_code)
+        print(f"Deleted student {ref_code} from SQLite")
+        return True, ref_code
+    except Exception as e:
+        conn.rollback()
+        print(f"Error deleting student from SQLite: {e}")
+        traceback.print_exc()
+        return False, str(e)
+
+# ---------------- Replication outbox ---------------- #
+
+# Operations stored in replication_outbox.operation
+OUTBOX_REGISTER = "register"
+OUTBOX_DELETE = "delete"
+
+INSERT_OUTBOX_SQL = '''
+INSERT INTO replication_outbox (operation, reference_code, payload, created_at)
+VALUES (?, ?, ?, ?)
+'''
+
+def _enqueue_replication(cursor, operation, ref_code, payload=None):
+    """Add a change to the outbox (the caller owns the transaction)"""
+    _enqueue_replications(cursor, [(operation, ref_code, payload)])
+
+def _enqueue_replications(cursor, changes):
+    """Add (operation, reference code, payload) changes to the outbox in one executemany"""
+    now = time.time()
+    cursor.executemany(INSERT_OUTBOX_SQL, [
+        (operation, ref_code, json.dumps(payload, default=str) if payload is not None else None, now)
+        for operation, ref_code, payload in changes
+    ])
+
+def fetch_outbox_batch(limit):
+    """Return the oldest queued changes as dicts, in the order they were made"""
+    if not ensure_schema():
+        return []
+    cursor = get_connection().execute('''
+        SELECT outbox_id, operation, reference_code, payload, created_at, attempts
+        FROM replication_outbox
+        ORDER BY outbox_id
+        LIMIT ?
+    ''', (limit,))
+    return [
+        {
+            "outbox_id": row[0],
+            "operation": row[1],
+            "reference_code": row[2],
+            "payload": json.loads(row[3]) if row[3] else None,
+            "created_at": row[4],
+            "attempts": row[5]
+        }
+        for row in cursor.fetchall()
+    ]
+
+def complete_outbox_entries(outbox_ids):
+    """Remove changes that have reached MySQL"""
+    if not outbox_ids:
+        return
+    conn = get_connection()
+    placeholders = ", ".join("?" * len(outbox_ids))
+    conn.execute(f"DELETE FROM replication_outbox WHERE outbox_id IN ({placeholders})", list(outbox_ids))
+    conn.commit()
+
+def record_outbox_failure(outbox_id, error):
+    """Remember a failed attempt so it shows up in the replication metrics"""
+    conn = get_connection()
+    conn.execute('''
+        UPDATE replication_outbox
+        SET attempts = attempts + 1, last_attempt_at = ?, last_error = ?
+        WHERE outbox_id = ?
+    ''', (time.time(), str(error)[:500], outbox_id))
+    conn.commit()
+
+def dead_letter_outbox_entry(outbox_id, error):
+    """Move a change MySQL will never accept out of the outbox into replication_dead_letters"""
+    conn = get_connection()
+    conn.execute('''
+        INSERT INTO replication_dead_letters
+            (outbox_id, operation, reference_code, payload, created_at, attempts, last_error, dead_at)
+        SELECT outbox_id, operation, reference_code, payload, created_at, attempts + 1, ?, ?
+        FROM replication_outbox WHERE outbox_id = ?
+    ''', (str(error)[:500], time.time(), outbox_id))
+    conn.execute("DELETE FROM replication_outbox WHERE outbox_id = ?", (outbox_id,))
+    conn.commit()
+
+def get_outbox_metrics(dead_letter_limit=10):
+    """
+    Pending count, age of the oldest pending change, the head entry's last error,
+    and the dead-letter count with the most recent (reference code, error) pairs
+    """
+    if not ensure_schema():
+        return {"pending": 0, "oldest_created_at": None, "head_attempts": 0, "head_error": None,
+                "dead_lettered": 0, "dead_letters": []}
+    cursor = get_connection().cursor()
+    cursor.execute("SELECT COUNT(*), MIN(created_at) FROM replication_outbox")
+    pending, oldest = cursor.fetchone()
+    cursor.execute('''
+        SELECT attempts, last_error FROM replication_outbox ORDER BY outbox_id LIMIT 1
+    ''')
+    head = cursor.fetchone() or (0, None)
+    cursor.execute("SELECT COUNT(*) FROM replication_dead_letters")
+    dead_lettered = cursor.fetchone()[0]
+    cursor.execute('''
+        SELECT reference_code, last_error FROM replication_dead_letters ORDER BY dead_at DESC LIMIT ?
+    ''', (dead_letter_limit,))
+    dead_letters = cursor.fetchall()
+    return {"pending": pending, "oldest_created_at": oldest, "head_attempts": head[0], "head_error": head[1],
+            "dead_lettered": dead_lettered, "dead_letters": dead_letters}
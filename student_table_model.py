@@ -0,0 +1,242 @@
+"""
+Student list model for the admin and staff dashboards
+Rows are fetched from the database a page at a time as the view scrolls,
+so the list costs the same to open with 50 students or 50,000, and the
+queries can run on a worker thread so the window never waits on them
+"""
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QEvent, QRect, pyqtSignal
+from PyQt6.QtGui import QColor, QPainter
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle
+from workers import Worker
+
+# Pause in typing before the search box runs a query
+SEARCH_DEBOUNCE_MS = 250
+
+
+class StudentTableModel(QAbstractTableModel):
+    """
+    Table model over a lazily fetched, cached list of students
+    fetch_page(sort_key=, descending=, offset=, limit=) must return (rows, total):
+    up to `limit` rows of (student_id, first_name, middle_name, last_name,
+    extension, enrollment_type, strand, registration_date) and the number of
+    students matching the query, the way sqlite_db.query_students does
+    """
+    PAGE_SIZE = 200
+    HEADERS = ["Student No.", "Student Full Name", "Entry Status", "Strand", "Registration Date"]
+    ACTIONS_HEADER = "Actions"
+    CENTERED_COLUMNS = {0, 2, 3, 4, 5}
+    # query_students sort key behind each column (the actions column doesn't sort)
+    SORT_KEYS = ["student_id", "name", "enrollment_type", "strand", "registration_date", None]
+    DEFAULT_SORT_COLUMN = 4
+    RELEVANCE_SORT = "relevance"  # best search matches first
+
+    def __init__(self, fetch_page, show_actions=False, thread_pool=None, parent=None):
+        super().__init__(parent)
+        self.fetch_page = fetch_page
+        self.show_actions = show_actions
+        self.headers = self.HEADERS + ([self.ACTIONS_HEADER] if show_actions else [])
+        # With a thread pool, pages load on a worker and arrive through _page_loaded;
+        # without one they load on the calling thread
+        self.thread_pool = thread_pool
+
+        self.sort_key = self.SORT_KEYS[self.DEFAULT_SORT_COLUMN]
+        self.descending = True   # Newest registrations first
+        self._column_sort = (self.sort_key, self.descending)  # restored when a search ends
+        self.total_count = 0     # students matching the current query
+
+        self._student_ids = []   # student_id per loaded row
+        self._display = []       # formatted cell text per loaded row
+        self._has_more = True
+        self._generation = 0     # bumped by every new query; older pages are discarded
+        self._loading = None     # (generation, offset) of the page being fetched, if any
+        self._workers = {}       # (generation, offset) -> Worker, kept alive until it reports back
+
+    # ---------------- Loading ---------------- #
+
+    def refresh(self, fetch_page=None):
+        """
+        Start the current query over (optionally switching to a new one)
+        The rows on screen stay until the first page of the new results arrives
+        """
+        if fetch_page is not None:
+            self.fetch_page = fetch_page
+        self._generation += 1
+        self._cancel_loading()
+        self._load_page(0)
+
+    def set_query(self, fetch_page, ranked=False):
+        """
+        Switch to a new query. ranked=True lists the best search matches first
+        (until a header is clicked); the column sort comes back once ranked is False
+        """
+        if ranked:
+            if self.sort_key != self.RELEVANCE_SORT:
+                self._column_sort = (self.sort_key, self.descending)
+            self.sort_key, self.descending = self.RELEVANCE_SORT, False
+        elif self.sort_key == self.RELEVANCE_SORT:
+            self.sort_key, self.descending = self._column_sort
+        self.refresh(fetch_page)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more and self._loading is None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent):
+            self._load_page(len(self._student_ids))
+
+    def _load_page(self, offset):
+        """Fetch one page of the current query, on the thread pool if there is one"""
+        args = (self._generation, self.fetch_page, self.sort_key, self.descending, offset, self.PAGE_SIZE)
+        if self.thread_pool is None:
+            self._page_loaded(self._fetch(*args))
+            return
+
+        worker = Worker(self._fetch, *args)
+        worker.setAutoDelete(False)  # kept so a stale page can be taken back off the queue
+        worker.signals.finished.connect(self._page_loaded)
+        self._loading = (self._generation, offset)
+        self._workers[self._loading] = worker
+        self.thread_pool.start(worker)
+
+    def _cancel_loading(self):
+        """Forget the page being fetched, and drop it from the queue if it hasn't started"""
+        if self._loading is not None:
+            if self.thread_pool.tryTake(self._workers[self._loading]):
+                del self._workers[self._loading]
+            self._loading = None
+
+    @classmethod
+    def _fetch(cls, generation, fetch_page, sort_key, descending, offset, limit):
+        """Query and format one page (runs on the worker thread when there is a pool)"""
+        try:
+            rows, total = fetch_page(sort_key=sort_key, descending=descending, offset=offset, limit=limit)
+        except Exception as e:
+            print(f"Error loading student page: {e}")
+            rows, total = [], 0
+        return generation, offset, [row[0] for row in rows], [cls.format_student(row) for row in rows], total
+
+    def _page_loaded(self, page):
+        """Add a fetched page to the table, unless a newer query has replaced it"""
+        generation, offset, student_ids, display, total = page
+        self._workers.pop((generation, offset), None)
+        if generation != self._generation:
+            return
+        self._loading = None
+
+        if offset == 0:
+            # First page of a new query - swap the results in one go
+            self.beginResetModel()
+            self._student_ids = student_ids
+            self._display = display
+            self.endResetModel()
+        elif student_ids and offset == len(self._student_ids):
+            self.beginInsertRows(QModelIndex(), offset, offset + len(student_ids) - 1)
+            self._student_ids.extend(student_ids)
+            self._display.extend(display)
+            self.endInsertRows()
+
+        self.total_count = total
+        self._has_more = bool(student_ids) and len(self._student_ids) < total
+
+    @staticmethod
+    def format_student(student):
+        """Cell text for one student row, formatted the way the old table showed it"""
+        middle_initial = f" {student[2][0]}." if student[2] else ""
+        extension = f" {student[4]}" if student[4] else ""
+        return (
+            f"ST-{student[0]:04d}",
+            f"{student[1]}{middle_initial} {student[3]}{extension}",
+            student[5] or "Freshmen",  # Default to Freshmen
+            student[6] or "N/A",
+            student[7][:10] if student[7] else "N/A",
+        )
+
+    def student_id(self, row):
+        """Database ID of the student shown in `row`"""
+        return self._student_ids[row]
+
+    # ---------------- QAbstractTableModel ---------------- #
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._student_ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column < len(self.HEADERS):
+                return self._display[row][column]
+            return "Delete"
+        if role == Qt.ItemDataRole.UserRole:
+            return self._student_ids[row]
+        if role == Qt.ItemDataRole.TextAlignmentRole and column in self.CENTERED_COLUMNS:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Re-query in the order of the clicked column; the database does the sorting"""
+        if not 0 <= column < len(self.headers) or self.SORT_KEYS[column] is None:
+            return
+        self.sort_key = self.SORT_KEYS[column]
+        self.descending = order == Qt.SortOrder.DescendingOrder
+        self.refresh()
+
+    def flags(self, index):
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+
+class DeleteButtonDelegate(QStyledItemDelegate):
+    """
+    Paints a red "Delete" button in the actions column and reports clicks,
+    instead of creating a real QPushButton for every row
+    """
+    delete_clicked = pyqtSignal(int)  # student_id
+
+    BUTTON_COLOR = QColor("#ff6b6b")
+    HOVER_COLOR = QColor("#e53e3e")
+    BUTTON_WIDTH = 70
+    MARGIN = 4
+
+    def button_rect(self, cell_rect):
+        """Where the button sits inside its cell"""
+        width = min(self.BUTTON_WIDTH, cell_rect.width() - 2 * self.MARGIN)
+        height = cell_rect.height() - 2 * self.MARGIN
+        return QRect(cell_rect.center().x() - width // 2, cell_rect.top() + self.MARGIN, width, height)
+
+    def paint(self, painter, option, index):
+        # Keep the row's selection/alternating background
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+
+        rect = self.button_rect(option.rect)
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self.HOVER_COLOR if hovered else self.BUTTON_COLOR)
+        painter.drawRoundedRect(rect, 3, 3)
+        painter.setPen(QColor("white"))
+        font = painter.font()
+        font.setPixelSize(12)
+        painter.setFont(font)
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, "Delete")
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton
+                and self.button_rect(option.rect).contains(event.position().toPoint())):
+            self.delete_clicked.emit(index.data(Qt.ItemDataRole.UserRole))
+            return True
+        return super().editorEvent(event, model, option, index)
@@ -8,13 +8,14 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
+from theme import set_role
 
 class SuccessScreen(QWidget):
     close_clicked = pyqtSignal()
 
     def __init__(self):
         super().__init__()
-        self.setStyleSheet("background-color: white;")
+        set_role(self, "success-page")
 
         # Main layout
         layout = QVBoxLayout(self)
@@ -25,33 +26,28 @@ class SuccessScreen(QWidget):
         # Header
         header = QLabel("Registration Successful!")
         header.setFont(QFont("Arial", 24, QFont.Weight.Bold))
-        header.setStyleSheet("color: #4bb3fd; margin-bottom: 20px;")
+        set_role(header, "success-header")
         header.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(header)
 
         # Reference code frame
         ref_frame = QFrame()
         ref_frame.setFrameShape(QFrame.Shape.Box)
-        ref_frame.setStyleSheet("""
-            border: 2px solid #4bb3fd;
-            border-radius: 10px;
-            background-color: #f0f5ff;
-            padding: 20px;
-        """)
+        set_role(ref_frame, "success-code-frame")
 
         ref_layout = QVBoxLayout(ref_frame)
 
         # Reference code title
         ref_title = QLabel("Your Reference Code:")
         ref_title.setFont(QFont("Arial", 16))
-        ref_title.setStyleSheet("color: #333;")
+        set_role(ref_title, "success-subtitle")
         ref_title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         ref_layout.addWidget(ref_title)
 
         # The actual reference code
         self.code_label = QLabel("ST-101")
         self.code_label.setFont(QFont("Arial", 36, QFont.Weight.Bold))
-        self.code_label.setStyleSheet("color: #2356c5; margin: 20px 0;")
+        set_role(self.code_label, "success-code")
         self.code_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         ref_layout.addWidget(self.code_label)
 
@@ -68,33 +64,21 @@ class SuccessScreen(QWidget):
             "Please keep this reference code. You will need to present it when you enroll physically."
         )
         instructions.setWordWrap(True)
-        instructions.setStyleSheet("color: #555; margin: 20px 0;")
+        set_role(instructions, "success-instructions")
         instructions.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(instructions)
 
         # Thank you message
         thank_you = QLabel("THANK YOU FOR CHOOSING US!")
         thank_you.setFont(QFont("Arial", 16, QFont.Weight.Bold))
-        thank_you.setStyleSheet("color: #4bb3fd;")
+        set_role(thank_you, "success-thanks")
         thank_you.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(thank_you)
 
         # Close button
         close_button = QPushButton("Close")
         close_button.setFixedSize(180, 50)
-        close_button.setStyleSheet("""
-            QPushButton {
-                background-color: #4bb3fd;
-                color: white;
-                font-size: 16px;
-                font-weight: bold;
-                border: none;
-                border-radius: 8px;
-            }
-            QPushButton:hover {
-                background-color: #379be6;
-            }
-        """)
+        set_role(close_button, "success-close")
         close_button.clicked.connect(self.close_clicked.emit)
         layout.addWidget(close_button, alignment=Qt.AlignmentFlag.AlignCenter)
 
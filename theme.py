@@ -0,0 +1,641 @@
+"""
+Application theme for OwlReg
+The whole app is styled by one stylesheet, installed on the QApplication by
+apply_theme(). Widgets pick their look with a "role" dynamic property
+(set_role(label, "section-title")) instead of each parsing its own
+setStyleSheet block, so the styles are parsed once at startup rather than
+every time a page is built. A look that changes at runtime is a property
+change too (set_style_property), which restyles only that widget.
+"""
+from PyQt6.QtCore import Qt, QEvent
+from PyQt6.QtWidgets import QApplication, QGroupBox
+
+ROLE = "role"
+
+# Rules for a container role match the container and everything inside it, the
+# way a selector-less setStyleSheet on the container did. Containers are listed
+# outermost first: for equally specific rules the later one wins, so the closer
+# container's style takes precedence, as it did with per-widget style sheets.
+STYLESHEET = """
+/* ---------------- Pages and windows ---------------- */
+*[role="brand-page"], *[role="brand-page"] * {
+    background-color: #2356c5;
+}
+*[role="form-page"], *[role="form-page"] * {
+    background-color: #f7f7f7;
+}
+*[role="dashboard-window"], *[role="dashboard-window"] * {
+    background-color: white;
+    font-family: Arial;
+}
+*[role="success-page"], *[role="success-page"] * {
+    background-color: white;
+}
+
+/* ---------------- Containers ---------------- */
+*[role="sidebar"], *[role="sidebar"] * {
+    background-color: #f3f3f3;
+    border-radius: 12px;
+}
+*[role="flat-group"], *[role="flat-group"] * {
+    border: none;
+}
+*[role="metric-card"], *[role="metric-card"] * {
+    background-color: #f9f9f9;
+    border-radius: 10px;
+}
+*[role="search-results"], *[role="search-results"] * {
+    background-color: #f9f9f9;
+    border-radius: 8px;
+    padding: 10px;
+}
+*[role="success-code-frame"], *[role="success-code-frame"] * {
+    border: 2px solid #4bb3fd;
+    border-radius: 10px;
+    background-color: #f0f5ff;
+    padding: 20px;
+}
+QFrame[role="code-card"], QFrame[role="code-card"] QFrame {
+    background-color: #f0f5ff;
+    border: 2px solid #4bb3fd;
+    border-radius: 15px;
+    padding: 20px;
+}
+QGroupBox[role="parent-group"] {
+    border: none;
+}
+QGroupBox[role="school-group"] {
+    background-color: white;
+    border-radius: 8px;
+    margin-top: 15px;
+    padding: 15px;
+}
+QGroupBox[role="detail-group"] {
+    border: 2px solid #4bb3fd;
+    border-radius: 8px;
+    margin-top: 15px;
+    font-weight: bold;
+    padding: 10px;
+}
+QGroupBox[role="detail-group"]::title {
+    subcontrol-origin: margin;
+    left: 10px;
+    padding: 0 5px 0 5px;
+    color: #2356c5;
+}
+QGroupBox[role="summary-section"] {
+    background-color: #f5f5f5;
+    border: 2px solid #4bb3fd;
+    border-radius: 8px;
+    margin-top: 15px;
+    font-weight: bold;
+    padding: 10px;
+    color: #2356c5;
+}
+QGroupBox[role="agreement-box"] {
+    background-color: #fff8f0;
+    border: 2px solid #ffa940;
+    border-radius: 8px;
+    margin-top: 15px;
+    font-weight: bold;
+    padding: 10px;
+    color: #d46b08;
+}
+QGroupBox[role="summary-section"]::title, QGroupBox[role="agreement-box"]::title {
+    subcontrol-origin: margin;
+    left: 10px;
+    padding: 0 5px 0 5px;
+}
+QScrollArea[role="summary-scroll"] {
+    border: none;
+    background-color: transparent;
+}
+
+/* ---------------- Text ---------------- */
+QLabel[role="brand-text"] {
+    color: #2356c5;
+}
+QLabel[role="white-text"] {
+    color: white;
+}
+QLabel[role="sidebar-logo"] {
+    color: #2356c5;
+    margin-top: 32px;
+}
+QLabel[role="page-header"] {
+    background-color: #4bb3fd;
+    color: white;
+    border-radius: 8px;
+    padding: 18px;
+}
+QLabel[role="section-title"] {
+    background-color: #4bb3fd;
+    color: white;
+    border-radius: 4px;
+    padding: 6px 12px;
+}
+QLabel[role="subsection-title"] {
+    background-color: #dbeafe;
+    color: #111;
+    border-radius: 4px;
+    padding: 6px 10px;
+}
+QLabel[role="summary-title"] {
+    color: #2356c5;
+    padding: 10px;
+    background-color: #f0f5ff;
+    border-radius: 8px;
+}
+QLabel#status_label {
+    font-size: 14px;
+    font-weight: bold;
+    color: #4bb3fd;
+    padding: 5px;
+    border-radius: 4px;
+}
+QLabel#status_label[status="transferee"] {
+    color: #d32f2f;
+    background-color: #ffebee;
+}
+QLabel#status_label[status="unselected"] {
+    color: #757575;
+}
+QLabel[role="pwd-note"] {
+    color: #2356c5;
+    font-style: italic;
+    margin-left: 10px;
+}
+QLabel[role="skip-note"] {
+    color: #ff7043;
+    font-style: italic;
+    margin-left: 10px;
+}
+QLabel[role="warning-banner"] {
+    color: black;
+    font-weight: bold;
+    font-size: 14px;
+    border-top: 2px solid #ccc;
+    border-bottom: 2px solid #ccc;
+    padding: 12px;
+    background-color: #fff;
+}
+QLabel[role="notice-title"] {
+    color: #2356c5;
+    margin-top: 15px;
+}
+QLabel[role="notice-text"] {
+    font-size: 13px;
+    color: #333;
+    padding: 5px;
+}
+QLabel[role="notice-column"] {
+    font-size: 13px;
+    color: #333;
+    margin: 10px;
+}
+QLabel[role="agreement-text"] {
+    color: #333;
+    margin-top: 5px;
+    padding: 5px;
+}
+QLabel[role="summary-row"] {
+    color: #333;
+    padding: 3px;
+}
+QLabel[role="no-data"] {
+    color: gray;
+    font-style: italic;
+}
+QLabel[role="error-text"] {
+    color: red;
+}
+QLabel[role="admin-title"] {
+    color: #b91c1c;
+}
+QLabel[role="sidebar-badge"] {
+    background-color: #F5F5F5;
+    border-radius: 40px;
+}
+QLabel[role="sidebar-title"] {
+    background-color: #F5F5F5;
+    color: black;
+    padding: 5px;
+    border-radius: 5px;
+}
+QLabel[role="staff-welcome"] {
+    color: #2356c5;
+    font-weight: bold;
+}
+QLabel[role="staff-position"] {
+    color: #555;
+    font-size: 12px;
+}
+QLabel[role="metric-change"] {
+    color: gray;
+    font-size: 12px;
+}
+QLabel[role="email-icon"] {
+    color: #2356c5;
+    background: white;
+    border-top-left-radius: 4px;
+    border-bottom-left-radius: 4px;
+    padding: 8px;
+}
+QLabel[role="confirmation-message"] {
+    font-size: 14px;
+    color: #444;
+}
+QLabel[role="date-text"] {
+    font-size: 12px;
+    color: #666;
+}
+QLabel[role="code-instructions"] {
+    color: #e63946;
+    font-weight: bold;
+    font-size: 14px;
+    margin-top: 10px;
+}
+QLabel[role="student-name"] {
+    font-size: 18px;
+    color: #333;
+}
+QLabel[role="db-note"] {
+    font-size: 12px;
+    color: #e67e22;
+    font-style: italic;
+}
+QLabel[role="info-text"] {
+    font-size: 13px;
+    color: #444;
+    margin-top: 15px;
+}
+QLabel[role="success-header"] {
+    color: #4bb3fd;
+    margin-bottom: 20px;
+}
+QLabel[role="success-subtitle"] {
+    color: #333;
+}
+QLabel[role="success-code"] {
+    color: #2356c5;
+    margin: 20px 0;
+}
+QLabel[role="success-instructions"] {
+    color: #555;
+    margin: 20px 0;
+}
+QLabel[role="success-thanks"] {
+    color: #4bb3fd;
+}
+
+/* ---------------- Inputs ---------------- */
+QLineEdit[role="textbox"] {
+    border: 1px solid #ccc;
+    border-radius: 4px;
+    padding: 6px;
+    background-color: white;
+}
+QLineEdit[role="textbox"]:focus {
+    border: 1px solid #4bb3fd;
+}
+QComboBox[role="combo"] {
+    border: 1px solid #4bb3fd;
+    border-radius: 4px;
+    padding: 4px 10px;
+    background-color: white;
+    min-width: 100px;
+}
+QComboBox[role="combo"]:hover {
+    border: 2px solid #2356c5;
+}
+QComboBox[role="combo"]::drop-down {
+    subcontrol-origin: padding;
+    subcontrol-position: center right;
+    width: 20px;
+    border-left: 1px solid #4bb3fd;
+    background-color: #e1ecff;
+}
+QComboBox[role="combo"] QAbstractItemView {
+    background-color: white;
+    border: 1px solid #4bb3fd;
+    selection-background-color: #e1ecff;
+}
+*[role="skipped-field"], *[role="skipped-field"] * {
+    background-color: #f3f3f3;
+    color: #999;
+    border: 1px solid #ddd;
+}
+QLineEdit[role="email-field"] {
+    background-color: white;
+    border-radius: 4px;
+    padding: 8px;
+    border: 1px solid #bfcbe6;
+    font-size: 16px;
+    color: #2356c5;
+}
+QDateEdit[role="date"] {
+    border: 1px solid #ccc;
+    border-radius: 4px;
+    padding: 5px;
+    background-color: white;
+    min-width: 160px;
+}
+QDateEdit[role="date"]:focus {
+    border: 1px solid #4bb3fd;
+}
+QDateEdit[role="date"]::drop-down {
+    subcontrol-origin: padding;
+    subcontrol-position: center right;
+    width: 20px;
+    border-left: 1px solid #ccc;
+}
+/* Make sure calendar widget shows month and year clearly */
+QDateEdit[role="date"] QCalendarWidget QToolButton {
+    color: #333;
+    font-size: 14px;
+    font-weight: bold;
+    background-color: #f0f5ff;
+    padding: 6px;
+}
+QDateEdit[role="date"] QCalendarWidget QMenu {
+    font-size: 12px;
+    background-color: white;
+    selection-background-color: #4bb3fd;
+    selection-color: white;
+}
+QDateEdit[role="date"] QCalendarWidget QSpinBox {
+    font-size: 14px;
+    color: #333;
+    background-color: white;
+    selection-background-color: #4bb3fd;
+    selection-color: white;
+}
+QDateEdit[role="date"] QCalendarWidget QAbstractItemView:enabled {
+    font-size: 12px;
+    color: #333;
+    background-color: white;
+    selection-background-color: #4bb3fd;
+    selection-color: white;
+}
+QDateEdit[role="date"] QCalendarWidget QWidget#qt_calendar_navigationbar {
+    background-color: #e1ecff;
+    padding: 2px;
+}
+QCheckBox[role="pwd-check"] {
+    font-size: 14px;
+}
+QCheckBox[role="skip-check"] {
+    font-size: 14px;
+    color: #555;
+    font-weight: bold;
+}
+QCheckBox[role="agreement-check"] {
+    font-size: 13px;
+    margin: 10px;
+}
+QCheckBox[role="agreement-check"]:checked {
+    color: #2356c5;
+    font-weight: bold;
+}
+QCheckBox[role="pwd-check"]::indicator {
+    width: 18px;
+    height: 18px;
+}
+QCheckBox[role="skip-check"]::indicator, QCheckBox[role="agreement-check"]::indicator {
+    width: 20px;
+    height: 20px;
+}
+QCheckBox[role="pwd-check"]::indicator:unchecked {
+    border: 2px solid #ccc;
+    background-color: white;
+    border-radius: 3px;
+}
+QCheckBox[role="pwd-check"]::indicator:checked {
+    border: 2px solid #4bb3fd;
+    background-color: #4bb3fd;
+    border-radius: 3px;
+}
+QCheckBox[role="skip-check"]::indicator:unchecked, QCheckBox[role="agreement-check"]::indicator:unchecked {
+    border: 2px solid #ccc;
+    background-color: white;
+    border-radius: 4px;
+}
+QCheckBox[role="skip-check"]::indicator:checked {
+    border: 2px solid #ff7043;
+    background-color: #ff7043;
+    border-radius: 4px;
+}
+QCheckBox[role="agreement-check"]::indicator:checked {
+    border: 2px solid #4bb3fd;
+    background-color: #4bb3fd;
+    border-radius: 4px;
+}
+
+/* ---------------- Buttons ---------------- */
+QPushButton[role="kiosk-button"] {
+    background-color: white;
+    color: #2356c5;
+    border: none;
+    padding: 12px;
+    border-radius: 6px;
+    font-weight: bold;
+    font-size: 14px;
+    min-width: 300px;
+}
+QPushButton[role="kiosk-button"]:hover {
+    background-color: #f0f0f0;
+}
+QPushButton[role="email-next"] {
+    background-color: white;
+    color: #2356c5;
+    border: none;
+    padding: 8px;
+    border-radius: 4px;
+    font-weight: bold;
+}
+QPushButton[role="email-next"]:hover {
+    background-color: #f0f0f0;
+}
+QPushButton[role="sidebar-link"] {
+    color: #222;
+    background: transparent;
+    border: none;
+    text-align: left;
+    padding: 6px 12px;
+}
+QPushButton[role="sidebar-link"][collapsed="true"] {
+    padding: 6px;
+    text-align: center;
+}
+QPushButton[role="sidebar-link"]:hover {
+    background-color: #e6e6e6;
+    border-radius: 6px;
+}
+QPushButton[role="sidebar-toggle"] {
+    background-color: #2356c5;
+    color: white;
+    border-radius: 20px;
+    border: none;
+}
+QPushButton[role="sidebar-toggle"]:hover {
+    background-color: #1a408f;
+}
+QPushButton[role="nav-button"] {
+    background-color: #4bb3fd;
+    color: white;
+    font-weight: bold;
+    border-radius: 6px;
+}
+QPushButton[role="nav-button-large"] {
+    background-color: #4bb3fd;
+    color: white;
+    font-size: 16px;
+    border-radius: 6px;
+    padding: 10px 20px;
+    font-weight: bold;
+}
+QPushButton[role="back-button"] {
+    background-color: #4bb3fd;
+    color: white;
+    font-weight: bold;
+    font-size: 14px;
+    border-radius: 6px;
+}
+QPushButton[role="copy-button"] {
+    background-color: #4bb3fd;
+    color: white;
+    font-weight: bold;
+    border-radius: 6px;
+    padding: 8px 15px;
+}
+QPushButton[role="success-close"] {
+    background-color: #4bb3fd;
+    color: white;
+    font-size: 16px;
+    font-weight: bold;
+    border: none;
+    border-radius: 8px;
+}
+QPushButton[role="nav-button"]:hover, QPushButton[role="nav-button-large"]:hover,
+QPushButton[role="back-button"]:hover, QPushButton[role="copy-button"]:hover,
+QPushButton[role="success-close"]:hover {
+    background-color: #379be6;
+}
+QPushButton[role="nav-button-large"]:disabled {
+    background-color: #ccc;
+    color: #666;
+}
+QPushButton[role="primary-button"] {
+    background-color: #2356c5;
+    color: white;
+    font-weight: bold;
+    font-size: 14px;
+    border-radius: 6px;
+}
+QPushButton[role="primary-button"]:hover {
+    background-color: #1a408f;
+}
+QPushButton[role="login-button"], QPushButton[role="admin-login-button"] {
+    background-color: #2356c5;
+    color: white;
+    padding: 10px;
+    border-radius: 5px;
+    font-weight: bold;
+    min-height: 36px;
+}
+QPushButton[role="login-button"]:hover {
+    background-color: #1a3f8e;
+}
+QPushButton[role="admin-login-button"] {
+    background-color: #b91c1c;
+}
+QPushButton[role="admin-login-button"]:hover {
+    background-color: #991b1b;
+}
+QPushButton[role="dialog-button"] {
+    padding: 10px;
+    border-radius: 5px;
+    min-height: 36px;
+}
+QPushButton[role="dashboard-link"] {
+    background-color: transparent;
+    border: none;
+    text-align: left;
+    padding: 10px;
+    font-size: 14px;
+}
+QPushButton[role="dashboard-link"]:hover {
+    color: #2356c5;
+    font-weight: bold;
+}
+QPushButton[role="logout-button"] {
+    background-color: #f0f0f0;
+    border-radius: 5px;
+    padding: 8px;
+    color: #555;
+}
+QPushButton[role="logout-button"]:hover {
+    background-color: #e0e0e0;
+}
+QPushButton[role="action-button"] {
+    background-color: #4bb3fd;
+    color: white;
+    border-radius: 5px;
+    padding: 8px 15px;
+}
+QPushButton[role="action-button"]:hover {
+    background-color: #2356c5;
+}
+QPushButton[role="search-button"] {
+    background-color: #2356c5;
+    color: white;
+    border-radius: 5px;
+    padding: 8px 15px;
+    min-height: 36px;
+    font-weight: bold;
+}
+QPushButton[role="search-button"]:hover {
+    background-color: #1a3f8e;
+}
+QPushButton[role="table-edit"] {
+    background-color: #4bb3fd;
+    color: white;
+}
+QPushButton[role="table-delete"] {
+    background-color: #ff6b6b;
+    color: white;
+}
+"""
+
+
+def apply_theme(app):
+    """Install the OwlReg stylesheet on the QApplication (once, before building windows)"""
+    app.setStyleSheet(STYLESHEET)
+
+
+def set_style_property(widget, name, value):
+    """
+    Set a dynamic property the stylesheet selects on and restyle the widget
+    A widget that hasn't been polished yet picks the property up when it is
+    first shown, so setting it is enough - except for a QGroupBox, which
+    measures its frame when it is built and only measures again on a
+    StyleChange. A polished widget drops the rules Qt cached for it and is
+    polished again, as setStyleSheet() did
+    """
+    widget.setProperty(name, value)
+    polished = widget.testAttribute(Qt.WidgetAttribute.WA_WState_Polished)
+    if not polished and not isinstance(widget, QGroupBox):
+        return widget
+
+    style = widget.style()
+    style.unpolish(widget)
+    if polished:
+        style.polish(widget)
+    QApplication.sendEvent(widget, QEvent(QEvent.Type.StyleChange))
+    widget.update()
+    return widget
+
+
+def set_role(widget, role):
+    """Give a widget one of the stylesheet's looks; returns the widget"""
+    return set_style_property(widget, ROLE, role)
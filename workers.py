@@ -0,0 +1,45 @@
+"""
+Background workers for OwlReg
+Runs slow work (database saves, connection checks) on the Qt thread pool
+so the window keeps repainting and responding while it waits
+"""
+import traceback
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal, pyqtSlot
+
+
+class WorkerSignals(QObject):
+    """Signals a Worker sends back to the GUI thread"""
+    started = pyqtSignal()
+    progress = pyqtSignal(str)      # Status message for the user
+    finished = pyqtSignal(object)   # Whatever the task returned
+    error = pyqtSignal(str)         # Message of the exception the task raised
+
+
+class Worker(QRunnable):
+    """
+    Run a function on a QThreadPool thread
+    With report_progress=True the function also gets a `progress` keyword
+    argument it can call with a message to emit the progress signal
+    """
+    def __init__(self, func, *args, report_progress=False, **kwargs):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.report_progress = report_progress
+        self.signals = WorkerSignals()
+
+    @pyqtSlot()
+    def run(self):
+        """Run the task and report the outcome through the signals"""
+        self.signals.started.emit()
+        try:
+            if self.report_progress:
+                self.kwargs["progress"] = self.signals.progress.emit
+            result = self.func(*self.args, **self.kwargs)
+        except Exception as e:
+            print(f"Background task error: {e}")
+            traceback.print_exc()
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(result)